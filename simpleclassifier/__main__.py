@@ -1,52 +1,95 @@
 import argparse
+import csv
+import sys
 import yaml
 
-from dataclasses import dataclass
+from contextlib import nullcontext
+
+from simpleclassifier.config import (Config, build_classifiers, build_dataset,
+                                     report_memory)
 from simpleclassifier.display import Display
-from simpleclassifier.factory import ClassifierFactory
-from simpleclassifier.factory import SplitterDatasetFactory
-from simpleclassifier.factory import SplitterFactory
+from simpleclassifier.persistence import ModelStore, load_features
 from simpleclassifier.profiler import Profiler
+from simpleclassifier.scheduler import CostModel
 from simpleclassifier.classifier_profiler import ClassifierProfiler
 
-from simpleclassifier.classifiers import *  # noqa
-from simpleclassifier.splitter_datasets import *  # noqa
-from simpleclassifier.splitters import *  # noqa
 
+def main():
+    if sys.argv[1:2] == ["serve"]:
+        from simpleclassifier.server import main as serve
+        sys.exit(serve(sys.argv[2:]))
+    configs = parse_args()
+    if len(configs) > 1:
+        from simpleclassifier.sweep import run_sweep
+        run_sweep(configs)
+        return
+    config = configs[0]
+    if config.predict is not None:
+        predict_saved(config)
+        return
 
-@dataclass
-class Config:
-    classifier_names: list[str]
-    dataset_name: str
-    splitting_strategy: str
-    test_size: float
-    profile_metrics: list[str]
-    display_format: str
+    dataset = build_dataset(config)
+    report_memory(config, dataset)
+    if config.load_models is not None:
+        # the saved models are profiled as they are, without retraining
+        classifiers = ModelStore(config.load_models).load(
+            dataset, names=config.classifier_names)
+    else:
+        classifiers = build_classifiers(config, dataset)
+    profiler = Profiler(config.profile_metrics, **config.predict_options)
+    display = Display()
+    classifier_profiler = ClassifierProfiler(classifiers,
+                                             profiler,
+                                             display,
+                                             n_workers=config.n_workers,
+                                             cost_model=CostModel(
+                                                 config.cost_history))
 
+    if config.load_models is None:
+        classifier_profiler.train()
+    if config.save_models is not None:
+        ModelStore(config.save_models).save(classifier_profiler.classifiers,
+                                            dataset)
+        print(f"Models saved to {config.save_models}")
+    classifier_profiler.profile_classifiers()
+    classifier_profiler.display_results(config.display_format)
 
-def main():
-    config = parse_args()
 
-    splitter = SplitterFactory.create_instance(config.splitting_strategy,
-                                               test_size=config.test_size)
+def predict_saved(config: Config):
+    """
+    Predict the rows of a feature file with saved models and write the
+    labels as CSV, one column per classifier, without loading the dataset.
 
-    dataset = SplitterDatasetFactory.create_instance(config.dataset_name,
-                                                     splitter=splitter)
+    :param config: The configuration, with ``load_models`` and ``predict``.
+    :type config: Config
+    """
+    store = ModelStore(config.load_models)
+    X = load_features(config.predict, config.dtype)
+    predictions = store.predict(
+        X,
+        names=config.classifier_names,
+        batch_size=config.predict_options.get("batch_size"))
+    names = list(predictions)
+    rows = zip(*predictions.values())
+    with (open(config.output, "w", newline="")
+          if config.output else nullcontext(sys.stdout)) as file:
+        writer = csv.writer(file)
+        writer.writerow(names)
+        writer.writerows(rows)
+    if config.output:
+        print(f"Predictions of {X.shape[0]} rows written to {config.output}")
 
-    classifiers = [
-        ClassifierFactory.create_instance(classifier_name, dataset=dataset)
-        for classifier_name in config.classifier_names
-    ]
-    profiler = Profiler(config.profile_metrics)
-    display = Display()
-    classifier_profiler = ClassifierProfiler(classifiers, profiler, display)
 
-    classifier_profiler.train()
-    classifier_profiler.profile_classifiers()
-    classifier_profiler.display_results(config.display_format)
+def parse_args() -> list[Config]:
+    """
+    Parse the command line and the configuration files.
 
+    :return: The configuration of every run, several when more than one
+        file is given or a file declares a ``matrix``.
+    :rtype: list[Config]
+    """
+    from simpleclassifier.sweep import expand_matrix
 
-def parse_args() -> Config:
     parser = argparse.ArgumentParser(
         "simple classifier profiler",
         description="""
@@ -55,27 +98,86 @@ classifiers on multiple datasets""",
     )
     parser.add_argument("-y",
                         "--yml",
-                        help="path to YAML configuration file",
-                        required=True)
+                        nargs="+",
+                        help="path to YAML configuration file, optional "
+                        "with --predict; several files run a sweep")
+    parser.add_argument("--save-models",
+                        metavar="DIR",
+                        help="directory the trained models are saved to")
+    parser.add_argument("--load-models",
+                        metavar="DIR",
+                        help="directory of saved models to profile or "
+                        "predict with instead of training")
+    parser.add_argument("--predict",
+                        metavar="FILE",
+                        help="predict the rows of a .npy or CSV feature file "
+                        "with the models of --load-models")
+    parser.add_argument("-o",
+                        "--output",
+                        help="CSV file the predictions are written to, the "
+                        "standard output by default")
     args = parser.parse_args()
+    if args.predict is not None and args.load_models is None:
+        parser.error("--predict requires --load-models")
+    if args.yml is None and args.predict is None:
+        parser.error("the following arguments are required: -y/--yml")
+
+    configs = []
+    for path in args.yml or [None]:
+        data = {}
+        if path is not None:
+            try:
+                with open(path, "r") as file:
+                    data = yaml.load(file, Loader=yaml.FullLoader)
+            except FileNotFoundError:
+                print(f"configuration file '{path}' was not found")
+                parser.print_usage()
+                parser.exit()
+        for run in expand_matrix(data or {}):
+            configs.append(make_config(run, args))
+    if len(configs) > 1 and (args.save_models or args.load_models):
+        parser.error("--save-models and --load-models take a single "
+                     "configuration, not a sweep")
+    return configs
 
-    try:
-        with open(args.yml, "r") as file:
-            data = yaml.load(file, Loader=yaml.FullLoader)
-        if data is None:
-            data = {}
-        return Config(
-            data.get("classifier_names", []),
-            data.get("dataset_name", "breast_cancer"),
-            data.get("splitting_strategy") or "percentage",
-            data.get("test_size") or 0.2,
-            data.get("profile_metrics", "accuracy"),
-            data.get("display_format", "dump"),
-        )
-    except FileNotFoundError:
-        print(f"configuration file '{args.yml}' was not found")
-        parser.print_usage()
-        parser.exit()
+
+def make_config(data: dict, args: argparse.Namespace) -> Config:
+    """
+    Build the configuration of a run from the keys of a YAML file and the
+    command line arguments.
+
+    :param data: The keys of the YAML file.
+    :type data: dict
+    :param args: The parsed command line arguments.
+    :type args: argparse.Namespace
+    :return: The configuration.
+    :rtype: Config
+    """
+    return Config(
+        data.get("classifier_names", []),
+        data.get("dataset_name", "breast_cancer"),
+        data.get("splitting_strategy") or "percentage",
+        data.get("test_size") or 0.2,
+        data.get("profile_metrics", "accuracy"),
+        data.get("display_format", "dump"),
+        data.get("n_workers") or 1,
+        data.get("tuner_options") or {},
+        data.get("classifier_options") or {},
+        data.get("tuning_strategy") or "grid",
+        data.get("tuning_cache"),
+        data.get("dataset_cache"),
+        data.get("dataset_options") or {},
+        data.get("predict_options") or {},
+        data.get("splitter_options") or {},
+        data.get("preprocessing"),
+        data.get("dtype"),
+        data.get("cost_history"),
+        data.get("time_budget"),
+        args.save_models,
+        args.load_models,
+        args.predict,
+        args.output,
+    )
 
 
 if __name__ == "__main__":
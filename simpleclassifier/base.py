@@ -1,7 +1,13 @@
 import abc
+import copy
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from joblib import effective_n_jobs
+from scipy import sparse
+from sklearn.preprocessing import MaxAbsScaler, StandardScaler
+from typing import Optional, Tuple
+
+from simpleclassifier.cache import DatasetCache
 
 
 class Splitter(abc.ABC):
@@ -26,12 +32,14 @@ class Splitter(abc.ABC):
         self.test_size = test_size
         self.random_state = random_state
 
-    @abc.abstractmethod
     def split_data(self, X,
                    y) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Split the dataset into training and testing data.
 
+        The rows are selected with :py:meth:`split_indices`, so contiguous
+        splits are views of ``X`` and ``y``.
+
         :param X: Two-dimensional feature matrix of shape (n_samples, n_features).
         :type X: np.ndarray
         :param y: One-dimensional array for target variables of shape (n_samples).
@@ -39,7 +47,129 @@ class Splitter(abc.ABC):
         :return: A tuple of four arrays: X_train, X_test, y_train, y_test.
         :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
         """
-        pass
+        train, test = self.split_indices(len(y), y)
+        return (take_rows(X, train), take_rows(X, test), take_rows(y, train),
+                take_rows(y, test))
+
+    def split_indices(self, n_samples: int, y) -> tuple:
+        """
+        Select the training and testing rows without touching the features.
+
+        :param n_samples: The number of rows of the dataset.
+        :type n_samples: int
+        :param y: The target variable, used by stratified splitters.
+        :type y: np.ndarray
+        :return: The training and testing rows, each either a slice for
+            contiguous rows or an array of row indices.
+        :rtype: tuple
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the split_indices method")
+
+    def split_sizes(self, n_samples: int) -> Tuple[int, int]:
+        """
+        Compute the number of training and testing rows, rounding the
+        testing rows up like
+        :py:func:`sklearn.model_selection.train_test_split`.
+
+        :param n_samples: The number of rows of the dataset.
+        :type n_samples: int
+        :return: The number of training and testing rows.
+        :rtype: tuple[int, int]
+        :raises ValueError: If the training split would be empty.
+        """
+        n_test = int(np.ceil(self.test_size * n_samples))
+        n_train = n_samples - n_test
+        if n_train <= 0:
+            raise ValueError(f"With n_samples={n_samples} and test_size="
+                             f"{self.test_size}, the training split is empty")
+        return n_train, n_test
+
+    def make_folds(self, y) -> Optional[list]:
+        """
+        Compute the cross-validation folds of the training data.
+
+        Splitters that only hold out a test split have no folds, and the
+        tuner then derives its own.
+
+        :param y: The target variable of the training data.
+        :type y: np.ndarray
+        :return: The train and validation row indices of each fold, or None.
+        :rtype: list[tuple[np.ndarray, np.ndarray]] or None
+        """
+        return None
+
+
+def array_nbytes(array) -> int:
+    """
+    Return the memory held by a dense array or a sparse matrix in bytes.
+
+    :param array: The array or the sparse matrix.
+    :return: The size of the values, and of the indices of a sparse matrix.
+    :rtype: int
+    """
+    if sparse.issparse(array):
+        return int(
+            sum(
+                getattr(array, name).nbytes
+                for name in ("data", "indices", "indptr")
+                if hasattr(array, name)))
+    return int(np.asarray(array).nbytes)
+
+
+def take_rows(array,
+              rows,
+              dtype=None,
+              copy: bool = False,
+              chunk_size: int = 65536):
+    """
+    Select rows of an array or of a sparse matrix.
+
+    A slice of a dense array is a view, unless a copy or another dtype is
+    requested. Index arrays are gathered chunk by chunk straight into an
+    array of the requested dtype, so the rows are never copied twice.
+
+    :param array: The array or the sparse matrix.
+    :param rows: The rows, a slice or an array of indices.
+    :type rows: slice or np.ndarray
+    :param dtype: The dtype of the result, the dtype of the array if None.
+    :type dtype: np.dtype, optional
+    :param copy: Whether a slice is copied even without a dtype conversion.
+    :type copy: bool, optional
+    :param chunk_size: The number of rows gathered at once.
+    :type chunk_size: int, optional
+    :return: The selected rows.
+    """
+    if sparse.issparse(array):
+        # indexing a sparse matrix always copies its rows
+        selected = array[rows]
+        return selected if dtype is None else selected.astype(dtype,
+                                                              copy=False)
+    dtype = array.dtype if dtype is None else np.dtype(dtype)
+    if isinstance(rows, slice):
+        view = array[rows]
+        if view.dtype != dtype:
+            return view.astype(dtype)
+        return view.copy() if copy else view
+    out = np.empty((len(rows), ) + array.shape[1:], dtype=dtype)
+    for start in range(0, len(rows), chunk_size):
+        out[start:start + chunk_size] = array[rows[start:start + chunk_size]]
+    return out
+
+
+def encode_labels(y) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode labels as the indices of the sorted classes, stored in the
+    smallest unsigned integer type that holds them, e.g. uint8 for up to 256
+    classes.
+
+    :param y: The labels.
+    :type y: np.ndarray
+    :return: The sorted classes and the encoded labels.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    classes, codes = np.unique(np.asarray(y), return_inverse=True)
+    return classes, codes.astype(np.min_scalar_type(max(len(classes) - 1, 0)))
 
 
 class SplitterDataset(abc.ABC):
@@ -47,46 +177,349 @@ class SplitterDataset(abc.ABC):
     An abstract base class for dataset splitters.
     """
 
-    def __init__(self, splitter: Splitter):
+    ARRAY_NAMES = ("X_train", "X_test", "y_train", "y_test")
+    SCALINGS = ("auto", "standard", "variance", "maxabs")
+
+    def __init__(self,
+                 splitter: Splitter,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
         """
         Initialize the SplitterDataset.
 
         :param splitter: The splitter object used for splitting the dataset.
         :type splitter: Splitter
+        :param cache: A cache of split and scaled datasets. When the same
+            dataset was split the same way before, the stored arrays are
+            memory-mapped instead of loading, splitting and scaling the data
+            again.
+        :type cache: DatasetCache, optional
+        :param dtype: The floating point type the feature matrices are
+            loaded, split and scaled in, e.g. "float32". It also encodes the
+            target variable with the smallest unsigned integer type that
+            holds the number of classes, the original labels being kept in
+            ``classes_``. By default the features are float64 and the labels
+            are kept as they are.
+        :type dtype: str or np.dtype, optional
+        :param scaling: How the features are scaled. "standard" centers and
+            scales them to unit variance, "variance" only scales them to unit
+            variance and "maxabs" scales them to [-1, 1]. The last two keep
+            sparse matrices sparse. "auto" uses "standard" for dense and
+            "variance" for sparse features.
+        :type scaling: str, optional
+        :raises ValueError: If the dtype is not a floating point type or the
+            scaling is unknown or would densify sparse features.
         """
         assert splitter is not None
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if self.dtype.kind != "f":
+            raise ValueError(f"Invalid dtype: {self.dtype}. Please provide a "
+                             "floating point type, e.g. 'float32'.")
+        if scaling not in self.SCALINGS:
+            raise ValueError(f"Invalid scaling: {scaling}. Please provide one "
+                             f"of the following: {', '.join(self.SCALINGS)}.")
+        self.scaling = scaling
+        self.compact_labels = dtype is not None
+        self.classes_ = None
+        self._mmap_paths = {}
+        self.preprocessing = None
+        key = None
+        if cache is not None:
+            key = cache.make_key(*self.cache_key_parts(),
+                                 type(splitter).__qualname__,
+                                 splitter.test_size, splitter.random_state,
+                                 self.dtype.str, self.compact_labels,
+                                 self.scaling)
+            arrays = cache.get(key)
+            if arrays is not None:
+                self._restore(arrays)
+                self.cv_folds = splitter.make_folds(self.y_train)
+                return
+
         X, y = self.load_data()
-        self.X_train, self.X_test, self.y_train, self.y_test = splitter.split_data(
-            X, y)
-        scaler = StandardScaler()
-        self.X_train = scaler.fit_transform(self.X_train)
-        self.X_test = scaler.transform(self.X_test)
+        if self.compact_labels:
+            self.classes_, y = encode_labels(y)
+        try:
+            train, test = splitter.split_indices(len(y), y)
+        except NotImplementedError:
+            # splitters that only implement split_data copy the rows
+            train, test = None, None
+            self.X_train, self.X_test, self.y_train, self.y_test = (
+                splitter.split_data(X, y))
+            X = None
+        if train is not None:
+            # Contiguous splits of an in-memory matrix stay views and are
+            # scaled in place. Other rows are only gathered here, straight
+            # into the dtype, and the source matrix is left untouched.
+            in_place = (isinstance(X, np.ndarray)
+                        and not isinstance(X, np.memmap) and X.flags.writeable)
+            self.X_train = take_rows(X, train, self.dtype, copy=not in_place)
+            self.X_test = take_rows(X, test, self.dtype, copy=not in_place)
+            self.y_train, self.y_test = take_rows(y, train), take_rows(y, test)
+        else:
+            self.X_train = self.X_train.astype(self.dtype, copy=False)
+            self.X_test = self.X_test.astype(self.dtype, copy=False)
+        del X
+        # The splits are owned by the dataset, so they are scaled in place
+        self.scaler = self.make_scaler(sparse.issparse(self.X_train))
+        self.X_train = self.scaler.fit_transform(self.X_train)
+        self.X_test = self.scaler.transform(self.X_test)
+        self.scaler.set_params(copy=True)
+
+        if key is not None:
+            arrays = {}
+            for name in self.ARRAY_NAMES:
+                array = getattr(self, name)
+                if sparse.issparse(array):
+                    # a CSR matrix is stored as its component arrays
+                    arrays.update({
+                        f"{name}_data": array.data,
+                        f"{name}_indices": array.indices,
+                        f"{name}_indptr": array.indptr,
+                        f"{name}_shape": np.asarray(array.shape),
+                    })
+                else:
+                    arrays[name] = array
+            for name, value in vars(self.scaler).items():
+                if name.endswith("_") and value is not None:
+                    arrays[f"scaler_{name}"] = np.asarray(value)
+            if self.classes_ is not None:
+                arrays["classes"] = self.classes_
+            cache.put(key, arrays)
+        # The folds are computed once and shared by every classifier
+        self.cv_folds = splitter.make_folds(self.y_train)
+
+    def cache_key_parts(self) -> tuple:
+        """
+        Identify the source of the data in a dataset cache key.
+
+        Datasets that read their data from a changing source should extend
+        the key, e.g. with the path and modification time of a file.
+
+        :return: The values identifying the dataset.
+        :rtype: tuple
+        """
+        return (type(self).__module__, type(self).__qualname__)
+
+    def make_scaler(self, is_sparse: bool = False):
+        """
+        Create the scaler of the ``scaling`` mode, which scales in place.
+
+        :param is_sparse: Whether the features are a sparse matrix.
+        :type is_sparse: bool, optional
+        :return: The unfitted scaler.
+        :rtype: StandardScaler or MaxAbsScaler
+        :raises ValueError: If the scaling would center sparse features.
+        """
+        scaling = self.scaling
+        if scaling == "auto":
+            scaling = "variance" if is_sparse else "standard"
+        if scaling == "standard" and is_sparse:
+            raise ValueError("The 'standard' scaling centers the features, "
+                             "which densifies sparse features. Please use "
+                             "the 'variance' or 'maxabs' scaling.")
+        if scaling == "maxabs":
+            return MaxAbsScaler(copy=False)
+        return StandardScaler(with_mean=scaling == "standard", copy=False)
+
+    def _restore(self, arrays: dict):
+        """
+        Restore the split arrays and the fitted scaler from cached arrays.
+        """
+        for name in self.ARRAY_NAMES:
+            if name in arrays:
+                setattr(self, name, arrays[name])
+                self._mmap_paths[name] = arrays[name].filename
+                continue
+            # the components of a sparse matrix stay memory-mapped
+            matrix = sparse.csr_matrix(
+                (arrays[f"{name}_data"], arrays[f"{name}_indices"],
+                 arrays[f"{name}_indptr"]),
+                shape=tuple(arrays[f"{name}_shape"]))
+            setattr(self, name, matrix)
+        self.scaler = self.make_scaler(sparse.issparse(self.X_train))
+        self.scaler.set_params(copy=True)
+        for name, value in arrays.items():
+            if name.startswith("scaler_"):
+                setattr(self.scaler, name[len("scaler_"):],
+                        value.item() if value.ndim == 0 else np.array(value))
+        if "classes" in arrays:
+            self.classes_ = np.array(arrays["classes"])
+
+    def __getstate__(self):
+        # Memory-mapped arrays are reopened from their file instead of being
+        # copied, so that processes share the pages of the cached dataset.
+        state = self.__dict__.copy()
+        for name, path in self._mmap_paths.items():
+            if getattr(state.get(name), "filename", None) == path:
+                state[name] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name, path in self._mmap_paths.items():
+            if getattr(self, name) is None:
+                setattr(self, name, np.load(path, mmap_mode="r"))
+
+    def decode_labels(self, y: np.ndarray) -> np.ndarray:
+        """
+        Map encoded labels, e.g. predictions, back to the original labels.
+
+        :param y: The labels, encoded when the dataset has a ``dtype``.
+        :type y: np.ndarray
+        :return: The original labels.
+        :rtype: np.ndarray
+        """
+        if self.classes_ is None:
+            return y
+        return self.classes_[y]
+
+    def memory_report(self) -> dict:
+        """
+        Report the memory held by the train and test arrays.
+
+        The baseline is the size of the same arrays as dense float64
+        features and int64 labels, so ``saved_bytes`` is the memory saved by
+        the ``dtype`` and by sparse features.
+
+        :return: The ``dtype``, ``sparse``, ``nbytes`` and
+            ``baseline_nbytes`` of each array, and the totals with the
+            ``saved_bytes`` under "total".
+        :rtype: dict
+        """
+        report = {}
+        for name in self.ARRAY_NAMES:
+            array = getattr(self, name)
+            report[name] = {
+                "dtype": str(array.dtype),
+                "sparse": sparse.issparse(array),
+                "nbytes": array_nbytes(array),
+                "baseline_nbytes": int(np.prod(array.shape)) * 8,
+            }
+        nbytes = sum(entry["nbytes"] for entry in report.values())
+        baseline = sum(entry["baseline_nbytes"] for entry in report.values())
+        report["total"] = {
+            "nbytes": nbytes,
+            "baseline_nbytes": baseline,
+            "saved_bytes": baseline - nbytes,
+        }
+        return report
 
     def load_data(self) -> Tuple[np.ndarray, np.ndarray]:
         """
         Load the data for the specific dataset.
 
+        The returned arrays belong to the dataset: a writable in-memory
+        feature matrix may be split into views that are scaled in place.
+
         :return: A tuple containing the feature data (X) and the target data (y).
         :rtype: tuple[np.ndarray, np.ndarray]
         """
         raise NotImplementedError(
             "Subclasses must implement the load_data method")
 
+    def attach_preprocessing(self,
+                             preprocessor,
+                             max_bytes: Optional[int] = 512 * 2**20):
+        """
+        Attach a preprocessing stage, which the tuner fits once per
+        cross-validation fold and shares between all the candidates of all
+        the classifiers.
+
+        :param preprocessor: The unfitted transformer or pipeline.
+        :param max_bytes: The maximum total size of the memoized transformed
+            matrices in bytes, unbounded if None.
+        :type max_bytes: int, optional
+        :return: The preprocessing stage.
+        :rtype: PreprocessingStage
+        """
+        from simpleclassifier.preprocessing import PreprocessingStage
+
+        self.preprocessing = PreprocessingStage(self, preprocessor, max_bytes)
+        return self.preprocessing
+
+    def iter_batch_slices(self,
+                          batch_size: int,
+                          stop: Optional[int] = None,
+                          rng: Optional[np.random.Generator] = None):
+        """
+        Iterate over contiguous chunks of the training rows.
+
+        :param batch_size: The number of rows in each chunk.
+        :type batch_size: int
+        :param stop: Only iterate over the first ``stop`` rows.
+        :type stop: int, optional
+        :param rng: A random generator used to shuffle the order of the
+            chunks, the chunks are yielded in order without it.
+        :type rng: np.random.Generator, optional
+        :return: A generator of slices.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if stop is None:
+            stop = self.X_train.shape[0]
+        starts = np.arange(0, stop, batch_size)
+        if rng is not None:
+            rng.shuffle(starts)
+        for start in starts:
+            yield slice(start, min(start + batch_size, stop))
+
+    def iter_train_batches(self,
+                           batch_size: int,
+                           stop: Optional[int] = None,
+                           rng: Optional[np.random.Generator] = None):
+        """
+        Iterate over the training data in contiguous chunks.
+
+        The chunks are views of ``X_train`` and ``y_train``, so iterating
+        does not copy the training data.
+
+        :param batch_size: The number of rows in each chunk.
+        :type batch_size: int
+        :param stop: Only iterate over the first ``stop`` rows.
+        :type stop: int, optional
+        :param rng: A random generator used to shuffle the order of the
+            chunks, the chunks are yielded in order without it.
+        :type rng: np.random.Generator, optional
+        :return: A generator of (X, y) chunks.
+        """
+        for batch in self.iter_batch_slices(batch_size, stop, rng):
+            yield self.X_train[batch], self.y_train[batch]
+
 
 class Classifier(abc.ABC):
     """
     An abstract base class for classifiers.
     """
 
-    def __init__(self, dataset: SplitterDataset):
+    #: Whether the model trains on sparse matrices without densifying them
+    accepts_sparse = False
+    #: The hyperparameters the tuner searches, a parameter grid or a
+    #: SearchSpace, None if the model is not tuned
+    param_grid = None
+
+    def __init__(self,
+                 dataset: SplitterDataset,
+                 tuner_options: Optional[dict] = None):
         """
         Initialize the Classifier.
 
         :param dataset: The dataset object
         used for training and testing the classifier.
         :type dataset: SplitterDataset
+        :param tuner_options: Keyword arguments passed to the hyperparameter
+            tuner, e.g. ``n_jobs``, ``backend``, ``pre_dispatch`` and ``cv``.
+        :type tuner_options: dict, optional
+        :raises ValueError: If the dataset is sparse and the classifier does
+            not accept sparse matrices.
         """
+        if sparse.issparse(dataset.X_train) and not self.accepts_sparse:
+            raise ValueError(f"{type(self).__name__} does not accept sparse "
+                             "datasets")
         self.dataset = dataset
+        self.tuner_options = dict(tuner_options or {})
+        self.model = None
 
     @abc.abstractmethod
     def fit(self):
@@ -95,13 +528,272 @@ class Classifier(abc.ABC):
         """
         raise NotImplementedError("Subclasses must implement the fit method")
 
-    @abc.abstractmethod
-    def predict(self) -> np.ndarray:
+    def predict_batch(self, X) -> np.ndarray:
+        """
+        Predict the labels of one batch with the trained model.
+
+        :param X: The feature matrix of the batch.
+        :type X: np.ndarray
+        :return: The predicted labels.
+        :rtype: np.ndarray
+        """
+        return self.model.predict(X)
+
+    def predict(self,
+                X=None,
+                batch_size: Optional[int] = None,
+                n_jobs: Optional[int] = None) -> np.ndarray:
         """
         Make predictions using the trained classifier.
 
+        With a ``batch_size`` the rows are predicted in chunks written into a
+        pre-allocated output, so the peak memory of the model, e.g. the
+        distance matrix of k-nearest neighbors, is bounded by the batch size.
+
+        :param X: The feature matrix to predict, the test data by default.
+        :type X: np.ndarray, optional
+        :param batch_size: The number of rows predicted at once, all rows by
+            default.
+        :type batch_size: int, optional
+        :param n_jobs: The number of threads predicting batches concurrently,
+            -1 for one per CPU.
+        :type n_jobs: int, optional
         :return: The predicted labels.
         :rtype: np.ndarray
         """
+        if X is None:
+            X = self.dataset.X_test
+        n_rows = X.shape[0]
+        if batch_size is None or batch_size >= n_rows:
+            return self.predict_batch(X)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        batches = [
+            slice(start, min(start + batch_size, n_rows))
+            for start in range(0, n_rows, batch_size)
+        ]
+        first = self.predict_batch(X[batches[0]])
+        # Use the dtype of the classes so that longer string labels of
+        # later batches are not truncated.
+        classes = getattr(self.model, "classes_", None)
+        dtype = first.dtype if classes is None else np.asarray(classes).dtype
+        y_pred = np.empty(n_rows, dtype=dtype)
+        y_pred[batches[0]] = first
+
+        def predict_into(batch):
+            y_pred[batch] = self.predict_batch(X[batch])
+
+        # resolve None and negative values such as -1 for all the CPUs
+        n_jobs = effective_n_jobs(n_jobs)
+        if n_jobs == 1:
+            for batch in batches[1:]:
+                predict_into(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                list(executor.map(predict_into, batches[1:]))
+        return y_pred
+
+    def predict_iter(self, X=None, batch_size: int = 1000):
+        """
+        Lazily predict the labels batch by batch.
+
+        :param X: The feature matrix to predict, the test data by default.
+        :type X: np.ndarray, optional
+        :param batch_size: The number of rows predicted at once.
+        :type batch_size: int, optional
+        :return: A generator of the predicted labels of each batch.
+        """
+        if X is None:
+            X = self.dataset.X_test
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        for start in range(0, X.shape[0], batch_size):
+            yield self.predict_batch(X[start:start + batch_size])
+
+
+class SearchStrategy(abc.ABC):
+    """
+    An abstract base class for hyperparameter search strategies.
+    """
+
+    def __init__(self, random_state: int = 0):
+        """
+        Initialize the SearchStrategy.
+
+        :param random_state: A controller for the randomness of the search.
+        :type random_state: int, optional
+        """
+        self.random_state = random_state
+
+    @abc.abstractmethod
+    def create_search(self, model, param_grid, cv, n_jobs, pre_dispatch):
+        """
+        Create the search object for the given model and parameter grid.
+
+        The returned object follows the scikit-learn search API, i.e. it
+        has a ``fit`` method and exposes ``best_estimator_``,
+        ``best_params_`` and ``cv_results_`` once fitted.
+
+        :param model: The model to tune.
+        :param param_grid: Dictionary specifying the hyperparameters to search.
+        :type param_grid: dict
+        :param cv: The number of cross-validation folds.
+        :type cv: int
+        :param n_jobs: The number of jobs used to evaluate the candidates.
+        :type n_jobs: int or None
+        :param pre_dispatch: The number of jobs dispatched ahead of time.
+        :type pre_dispatch: str or int
+        :return: The unfitted search object.
+        """
         raise NotImplementedError(
-            "Subclasses must implement the predict method")
+            "Subclasses must implement the create_search method")
+
+
+class IncrementalClassifier(Classifier):
+    """
+    An abstract base class for classifiers trained incrementally.
+
+    Instead of fitting the whole training data at once, the model is fed
+    fixed-size chunks through ``partial_fit`` for a number of epochs, so
+    memory use does not grow with the size of the dataset. Optionally, a
+    chunk of randomly drawn training rows is held out and training stops
+    once the score on it no longer improves.
+    """
+
+    def __init__(self,
+                 dataset: SplitterDataset,
+                 batch_size: int = 1000,
+                 n_epochs: int = 5,
+                 early_stopping: bool = False,
+                 patience: int = 2,
+                 tol: float = 1e-4,
+                 random_state: int = 0,
+                 tuner_options: Optional[dict] = None):
+        """
+        Initialize the IncrementalClassifier.
+
+        :param dataset: The dataset object
+        used for training and testing the classifier.
+        :type dataset: SplitterDataset
+        :param batch_size: The number of rows in each chunk.
+        :type batch_size: int, optional
+        :param n_epochs: The maximum number of passes over the training data.
+        :type n_epochs: int, optional
+        :param early_stopping: Whether to hold out a chunk of random
+            training rows, at most a fifth of them and covering every class
+            when possible, and stop when its score no longer improves.
+        :type early_stopping: bool, optional
+        :param patience: The number of epochs without improvement before
+            stopping.
+        :type patience: int, optional
+        :param tol: The minimum improvement of the holdout score.
+        :type tol: float, optional
+        :param random_state: A controller for the order of the chunks, the
+            held out rows and the initialization of the model.
+        :type random_state: int, optional
+        :param tuner_options: Unused, incremental classifiers are not tuned.
+        :type tuner_options: dict, optional
+        :raises ValueError: If batch_size or n_epochs is smaller than 1.
+        """
+        super().__init__(dataset, tuner_options)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if n_epochs < 1:
+            raise ValueError("n_epochs must be at least 1")
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.early_stopping = early_stopping
+        self.patience = patience
+        self.tol = tol
+        self.random_state = random_state
+        self.model = None
+        self.holdout_rows_ = None
+        self.holdout_scores_ = []
+
+    @abc.abstractmethod
+    def create_model(self):
+        """
+        Create the untrained model, which must implement ``partial_fit``.
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the create_model method")
+
+    def fit(self):
+        """
+        Train the model on chunks of the training data.
+        """
+        rng = np.random.default_rng(self.random_state)
+        X_train, y_train = self.dataset.X_train, self.dataset.y_train
+        preprocessing = self.dataset.preprocessing
+        # the preprocessing is fitted once and transforms one chunk at a time
+        transform = None
+        if preprocessing is not None:
+            transform = preprocessing.fit().transform
+        classes = np.unique(y_train)
+        n_rows = X_train.shape[0]
+        # the training rows, all of them as contiguous chunks if None
+        train_rows = None
+        holdout_rows = np.arange(0)
+        if self.early_stopping:
+            train_rows, holdout_rows = self._split_holdout(y_train, rng)
+        self.holdout_rows_ = holdout_rows
+        X_holdout = X_train[holdout_rows]
+        if transform is not None and len(holdout_rows):
+            X_holdout = transform(X_holdout)
+        y_holdout = y_train[holdout_rows]
+        stop = n_rows if train_rows is None else len(train_rows)
+
+        model = self.create_model()
+        self.model = model
+        self.holdout_scores_ = []
+        best_score, bad_epochs = -np.inf, 0
+        for _ in range(self.n_epochs):
+            for batch in self.dataset.iter_batch_slices(
+                    self.batch_size, stop, rng):
+                rows = batch if train_rows is None else train_rows[batch]
+                X = X_train[rows]
+                if transform is not None:
+                    X = transform(X)
+                model.partial_fit(X, y_train[rows], classes=classes)
+            if not self.early_stopping or len(y_holdout) == 0:
+                continue
+
+            score = model.score(X_holdout, y_holdout)
+            self.holdout_scores_.append(score)
+            if score > best_score + self.tol:
+                best_score, bad_epochs = score, 0
+                self.model = copy.deepcopy(model)
+            else:
+                bad_epochs += 1
+                if bad_epochs >= self.patience:
+                    break
+
+        if preprocessing is not None:
+            self.model = preprocessing.make_pipeline(self.model)
+
+    def _split_holdout(self, y: np.ndarray, rng: np.random.Generator) -> tuple:
+        """
+        Draw the held out rows at random, starting with a row of every class
+        that has another one to train on, so that neither the holdout nor
+        the training rows miss a class of sorted data.
+
+        :param y: The training target variable.
+        :type y: np.ndarray
+        :param rng: The random generator drawing the rows.
+        :type rng: np.random.Generator
+        :return: The sorted training rows and the held out rows.
+        :rtype: tuple
+        """
+        n_rows = len(y)
+        # hold out one chunk, but never more than a fifth of the data
+        n_holdout = min(self.batch_size, n_rows // 5)
+        rows = rng.permutation(n_rows)
+        _, first, counts = np.unique(np.asarray(y)[rows],
+                                     return_index=True,
+                                     return_counts=True)
+        picked = first[counts >= 2][:n_holdout]
+        rest = np.delete(rows, picked)
+        n_rest = n_holdout - len(picked)
+        holdout_rows = np.concatenate([rows[picked], rest[:n_rest]])
+        return np.sort(rest[n_rest:]), holdout_rows
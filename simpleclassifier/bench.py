@@ -0,0 +1,369 @@
+"""
+Benchmark the training and prediction speed of the classifiers.
+
+Run a sweep of classifiers, datasets, dataset sizes and splitting strategies,
+store the timings and the peak memory as JSON and compare them against a
+baseline::
+
+    python -m simpleclassifier.bench --baseline benchmarks/baseline.json
+
+The command exits with status 1 when a case got slower than the baseline by
+more than the threshold.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import yaml
+
+from simpleclassifier.classifier_profiler import _fit_classifier
+from simpleclassifier.config import Config
+from simpleclassifier.factory import (ClassifierFactory,
+                                      SplitterDatasetFactory, SplitterFactory)
+from simpleclassifier.profiler import measure_peak_memory
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+DEFAULT_SUITE = {
+    "classifier_names": ["knn", "lr", "nb"],
+    "dataset_names": ["iris", "breast_cancer"],
+    "dataset_sizes": [None, 2000],
+    "splitting_strategies": ["percentage"],
+    "test_size": 0.2,
+    "repeats": 3,
+}
+TIME_METRICS = ("dataset_time", "fit_time", "tune_time", "predict_time")
+MEMORY_METRICS = ("fit_peak_memory", "predict_peak_memory")
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    A single combination of the benchmark sweep.
+    """
+    classifier_name: str
+    dataset_name: str
+    n_samples: Optional[int]
+    splitting_strategy: str
+
+    @property
+    def key(self) -> str:
+        """
+        The name of the case in the result files.
+
+        :rtype: str
+        """
+        size = "full" if self.n_samples is None else self.n_samples
+        return (f"{self.classifier_name}/{self.dataset_name}/{size}/"
+                f"{self.splitting_strategy}")
+
+
+def load_suite(path: Optional[str] = None) -> dict:
+    """
+    Load the benchmark suite from a YAML file.
+
+    The file may set any key of :py:data:`DEFAULT_SUITE`, as well as the
+    ``tuning_strategy``, ``tuner_options``, ``classifier_options`` and
+    ``dataset_options`` of the CLI configuration.
+
+    :param path: The path of the YAML file, the default suite if None.
+    :type path: str, optional
+    :return: The benchmark suite.
+    :rtype: dict
+    """
+    suite = dict(DEFAULT_SUITE)
+    if path is not None:
+        with open(path, "r") as file:
+            suite.update(yaml.load(file, Loader=yaml.FullLoader) or {})
+    return suite
+
+
+def expand_cases(suite: dict) -> list[BenchmarkCase]:
+    """
+    Expand the sweep of a suite into its cases.
+
+    :param suite: The benchmark suite.
+    :type suite: dict
+    :return: The cases in sweep order.
+    :rtype: list[BenchmarkCase]
+    """
+    return [
+        BenchmarkCase(*values) for values in itertools.product(
+            suite["classifier_names"], suite["dataset_names"],
+            suite["dataset_sizes"], suite["splitting_strategies"])
+    ]
+
+
+def resized_dataset_class(dataset_class,
+                          n_samples: int,
+                          random_state: int = 0):
+    """
+    Derive a dataset class that draws ``n_samples`` rows of the original.
+
+    Rows are drawn without replacement when the dataset is large enough and
+    with replacement otherwise, so small datasets can be scaled up.
+
+    :param dataset_class: The dataset class to resize.
+    :type dataset_class: type
+    :param n_samples: The number of rows.
+    :type n_samples: int
+    :param random_state: The seed of the row selection.
+    :type random_state: int, optional
+    :return: The resized dataset class.
+    :rtype: type
+    """
+
+    def load_data(self):
+        X, y = dataset_class.load_data(self)
+        rng = np.random.default_rng(random_state)
+        rows = rng.choice(len(y), n_samples, replace=n_samples > len(y))
+        return X[rows], y[rows]
+
+    return type(f"{dataset_class.__name__}[{n_samples}]", (dataset_class, ),
+                {"load_data": load_data})
+
+
+def run_case(case: BenchmarkCase, suite: dict) -> dict:
+    """
+    Measure one case of the sweep.
+
+    Each timing is the minimum over the ``repeats`` runs of the suite. The
+    peak memory is traced in one extra run, since tracing slows the code
+    down.
+
+    :param case: The case to measure.
+    :type case: BenchmarkCase
+    :param suite: The benchmark suite.
+    :type suite: dict
+    :return: The timings in seconds and the peak memory in MiB.
+    :rtype: dict
+    """
+    config = Config([case.classifier_name],
+                    case.dataset_name,
+                    case.splitting_strategy,
+                    suite["test_size"], [],
+                    "dump",
+                    tuner_options=suite.get("tuner_options") or {},
+                    classifier_options=suite.get("classifier_options") or {},
+                    tuning_strategy=suite.get("tuning_strategy") or "grid")
+    dataset_class = SplitterDatasetFactory.get_class(case.dataset_name)
+    if case.n_samples is not None:
+        dataset_class = resized_dataset_class(dataset_class, case.n_samples)
+    dataset_options = (suite.get("dataset_options") or {}).get(
+        case.dataset_name) or {}
+
+    def make_classifier():
+        splitter = SplitterFactory.create_instance(case.splitting_strategy,
+                                                   test_size=config.test_size)
+        dataset = dataset_class(splitter=splitter, **dataset_options)
+        return ClassifierFactory.create_instance(case.classifier_name,
+                                                 dataset=dataset,
+                                                 **config.classifier_kwargs(
+                                                     case.classifier_name))
+
+    timings = {metric: [] for metric in TIME_METRICS}
+    for _ in range(suite["repeats"]):
+        start = time.perf_counter()
+        classifier = make_classifier()
+        timings["dataset_time"].append(time.perf_counter() - start)
+        _fit_classifier(classifier)
+        timings["fit_time"].append(classifier.fit_time_)
+        timings["tune_time"].append(classifier.tune_time_)
+        start = time.perf_counter()
+        classifier.predict()
+        timings["predict_time"].append(time.perf_counter() - start)
+
+    result = {metric: min(values) for metric, values in timings.items()}
+    classifier = _fit_classifier(make_classifier(), trace_memory=True)
+    _, predict_peak_memory = measure_peak_memory(classifier.predict)
+    result["fit_peak_memory"] = classifier.fit_peak_memory_ / 2**20
+    result["predict_peak_memory"] = predict_peak_memory / 2**20
+    result["n_train"] = int(classifier.dataset.X_train.shape[0])
+    result["n_test"] = int(classifier.dataset.X_test.shape[0])
+    return result
+
+
+def run_suite(suite: dict, progress=print) -> dict:
+    """
+    Run every case of a suite.
+
+    :param suite: The benchmark suite.
+    :type suite: dict
+    :param progress: A function printing the progress, None to be silent.
+    :type progress: Callable, optional
+    :return: The environment in "metadata" and the measurements of each
+        case in "results".
+    :rtype: dict
+    """
+    import sklearn
+
+    results = {}
+    for case in expand_cases(suite):
+        if progress is not None:
+            progress("-", case.key, end=" ")
+        results[case.key] = run_case(case, suite)
+        if progress is not None:
+            progress("[Done]")
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "repeats": suite["repeats"],
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict,
+            baseline: dict,
+            threshold: float = 1.5,
+            min_seconds: float = 0.01,
+            min_mib: float = 1.0) -> list[dict]:
+    """
+    Find the measurements that regressed against a baseline.
+
+    A measurement regressed when it is more than ``threshold`` times its
+    baseline value and the difference is above the noise floor of
+    ``min_seconds`` or ``min_mib``. Cases missing from either run are
+    ignored.
+
+    :param current: The output of :py:func:`run_suite`.
+    :type current: dict
+    :param baseline: The stored output of a previous run.
+    :type baseline: dict
+    :param threshold: The allowed slowdown factor.
+    :type threshold: float, optional
+    :param min_seconds: The smallest slowdown in seconds that counts.
+    :type min_seconds: float, optional
+    :param min_mib: The smallest memory increase in MiB that counts.
+    :type min_mib: float, optional
+    :return: The regressions with their case, metric, baseline and current
+        value and ratio.
+    :rtype: list[dict]
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        for metrics, floor in ((TIME_METRICS, min_seconds), (MEMORY_METRICS,
+                                                             min_mib)):
+            for metric in metrics:
+                if metric not in result or metric not in reference:
+                    continue
+                value, base = result[metric], reference[metric]
+                if value - base > floor and value > threshold * base:
+                    regressions.append({
+                        "case":
+                        key,
+                        "metric":
+                        metric,
+                        "baseline":
+                        base,
+                        "current":
+                        value,
+                        "ratio":
+                        value / base if base else float("inf"),
+                    })
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the benchmark from the command line.
+
+    :param argv: The command line arguments, ``sys.argv`` by default.
+    :type argv: list[str], optional
+    :return: The exit status, 1 if a regression was found.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        "python -m simpleclassifier.bench",
+        description="Benchmark the classifiers and detect slowdowns against "
+        "a baseline")
+    parser.add_argument("-y",
+                        "--yml",
+                        help="path to a YAML benchmark suite, "
+                        "the default suite if omitted")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="path of the JSON file the results are written to")
+    parser.add_argument("-b",
+                        "--baseline",
+                        default=DEFAULT_BASELINE,
+                        help="path of the baseline JSON file")
+    parser.add_argument("-t",
+                        "--threshold",
+                        type=float,
+                        default=1.5,
+                        help="allowed slowdown factor against the baseline")
+    parser.add_argument("--min-seconds",
+                        type=float,
+                        default=0.01,
+                        help="smallest slowdown in seconds that counts")
+    parser.add_argument("--min-mib",
+                        type=float,
+                        default=1.0,
+                        help="smallest memory increase in MiB that counts")
+    parser.add_argument("--update-baseline",
+                        action="store_true",
+                        help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+    if args.threshold < 1:
+        parser.error("the threshold must be at least 1")
+
+    print("Running benchmarks...")
+    with warnings.catch_warnings():
+        # keep the report readable, warnings do not affect the timings
+        warnings.simplefilter("ignore")
+        current = run_suite(load_suite(args.yml))
+    if args.output:
+        _write_json(args.output, current)
+    if args.update_baseline:
+        _write_json(args.baseline, current)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}, "
+              "use --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, "r") as file:
+        baseline = json.load(file)
+    regressions = compare(current, baseline, args.threshold, args.min_seconds,
+                          args.min_mib)
+    print("=====================================")
+    for regression in regressions:
+        print(f"- {regression['case']} {regression['metric']}: "
+              f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+              f"({regression['ratio']:.2f}x)")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold}x "
+          f"in {len(current['results'])} case(s)")
+    print("=====================================")
+    return 1 if regressions else 0
+
+
+def _write_json(path: str, data: dict):
+    """
+    Write the results of a run to a JSON file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
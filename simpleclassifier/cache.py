@@ -0,0 +1,341 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+
+
+def fingerprint(*arrays) -> str:
+    """
+    Compute a fast content hash of one or more arrays.
+
+    The hash covers the shape, the dtype and the raw bytes of each array,
+    so two arrays with the same values but a different dtype get different
+    fingerprints. Sparse matrices are hashed through their format, shape
+    and component arrays, without densifying them.
+
+    :param arrays: The arrays to hash.
+    :type arrays: np.ndarray or scipy.sparse.spmatrix
+    :return: The hexadecimal digest.
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        if sparse.issparse(array):
+            array = array.tocsr()
+            if not array.has_canonical_format:
+                array = array.copy()
+                array.sum_duplicates()
+            digest.update(repr(("csr", array.shape)).encode())
+            digest.update(
+                fingerprint(array.data, array.indices, array.indptr).encode())
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(repr((array.shape, array.dtype.str)).encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+class DirectoryCache:
+    """
+    A base class for content-addressed caches stored in a local directory.
+
+    Every entry is a file or a directory named after its key. Entries older
+    than ``max_age`` are dropped, and the least recently used entries are
+    evicted once the directory grows beyond ``max_bytes``.
+    """
+
+    DEFAULT_DIRECTORY = ".simpleclassifier_cache"
+
+    def __init__(self,
+                 directory: str,
+                 max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        """
+        Initialize the DirectoryCache.
+
+        :param directory: The directory that holds the entries.
+        :type directory: str
+        :param max_bytes: The maximum total size of the entries in bytes.
+        :type max_bytes: int, optional
+        :param max_age: The maximum age of an entry in seconds.
+        :type max_age: float, optional
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """
+        Create a cache from its YAML declaration, e.g.
+        ``{directory: .cache/tuning, max_size_mb: 512, max_age_days: 30}``.
+        Other settings are passed to the constructor.
+
+        :param config: The cache settings.
+        :type config: dict
+        :return: The cache.
+        :rtype: DirectoryCache
+        """
+        config = dict(config)
+        max_size_mb = config.pop("max_size_mb", None)
+        max_age_days = config.pop("max_age_days", None)
+        return cls(
+            config.pop("directory", cls.DEFAULT_DIRECTORY),
+            max_bytes=None if max_size_mb is None else int(max_size_mb *
+                                                           2**20),
+            max_age=None if max_age_days is None else max_age_days * 86400,
+            **config,
+        )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Hash the given parts into a cache key.
+
+        :param parts: Values whose ``repr`` identifies the entry.
+        :return: The cache key.
+        :rtype: str
+        """
+        return hashlib.blake2b(repr(parts).encode(),
+                               digest_size=16).hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Return the path of the entry for the given key.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The path of the entry.
+        :rtype: str
+        """
+        return os.path.join(self.directory, key)
+
+    def is_expired(self, path: str) -> bool:
+        """
+        Check whether an entry is older than ``max_age``.
+
+        :param path: The path of the entry.
+        :type path: str
+        :return: True if the entry expired.
+        :rtype: bool
+        """
+        if self.max_age is None:
+            return False
+        return time.time() - os.path.getmtime(path) > self.max_age
+
+    def touch(self, path: str):
+        """
+        Mark an entry as recently used.
+
+        The age of an entry is counted from its creation, so only the
+        access time is updated.
+
+        :param path: The path of the entry.
+        :type path: str
+        """
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+
+    def evict(self):
+        """
+        Remove the expired entries, then the least recently used ones until
+        the cache fits in ``max_bytes``.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".") or not os.path.exists(path):
+                continue
+            if self.is_expired(path):
+                _remove(path)
+                continue
+            entries.append((os.path.getatime(path), _size(path), path))
+
+        if self.max_bytes is None:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+
+class TuningCache(DirectoryCache):
+    """
+    A persistent cache of hyperparameter tuning results.
+
+    An entry is keyed by a fingerprint of the training data, the estimator
+    and the search, and stores ``best_params_``, ``cv_results_`` and
+    optionally the refitted best estimator.
+    """
+
+    DEFAULT_DIRECTORY = ".simpleclassifier_cache/tuning"
+
+    def __init__(self,
+                 directory: str,
+                 max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None,
+                 store_estimator: bool = True):
+        """
+        Initialize the TuningCache.
+
+        :param directory: The directory that holds the entries.
+        :type directory: str
+        :param max_bytes: The maximum total size of the entries in bytes.
+        :type max_bytes: int, optional
+        :param max_age: The maximum age of an entry in seconds.
+        :type max_age: float, optional
+        :param store_estimator: Whether the fitted best estimator is stored,
+            so that a cache hit does not need to refit it.
+        :type store_estimator: bool, optional
+        """
+        super().__init__(directory, max_bytes, max_age)
+        self.store_estimator = store_estimator
+
+    def make_tuning_key(self, X, y, model, search: str) -> str:
+        """
+        Build the key of a tuning run.
+
+        :param X: The training feature matrix.
+        :param y: The training target variable.
+        :param model: The untuned model.
+        :param search: A description of the parameter grid and the search
+            strategy.
+        :type search: str
+        :return: The cache key.
+        :rtype: str
+        """
+        model_class = type(model)
+        return self.make_key(fingerprint(X, y), model_class.__module__,
+                             model_class.__qualname__,
+                             sorted(model.get_params().items()), search)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Load the entry for the given key.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The entry with the keys "best_params", "cv_results" and
+            "estimator", or None if there is no valid entry.
+        :rtype: dict or None
+        """
+        path = self.path(key) + ".pkl"
+        if not os.path.exists(path) or self.is_expired(path):
+            return None
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self.touch(path)
+        return entry
+
+    def put(self, key: str, best_params: dict, cv_results: dict, estimator):
+        """
+        Store the results of a tuning run and evict old entries.
+
+        :param key: The cache key.
+        :type key: str
+        :param best_params: The best hyperparameters.
+        :type best_params: dict
+        :param cv_results: The cross-validation results of the search.
+        :type cv_results: dict
+        :param estimator: The refitted best estimator.
+        """
+        entry = {
+            "best_params": best_params,
+            "cv_results": cv_results,
+            "estimator": estimator if self.store_estimator else None,
+        }
+        # Write to a temporary file first so that concurrent runs never
+        # read a partial entry.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(key) + ".pkl")
+        self.evict()
+
+
+class DatasetCache(DirectoryCache):
+    """
+    A persistent cache of loaded, split and scaled datasets.
+
+    Every entry is a directory of ``.npy`` files holding the train and test
+    arrays and the statistics of the fitted scaler. The arrays are opened
+    as read-only memory maps, so loading a cached dataset is near-instant
+    and its pages are shared by every process that opens it.
+    """
+
+    DEFAULT_DIRECTORY = ".simpleclassifier_cache/datasets"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Open the arrays of the entry for the given key.
+
+        :param key: The cache key.
+        :type key: str
+        :return: The memory-mapped arrays keyed by name, or None if there is
+            no valid entry.
+        :rtype: dict or None
+        """
+        path = self.path(key)
+        if not os.path.isdir(path) or self.is_expired(path):
+            return None
+        try:
+            arrays = {
+                name[:-len(".npy")]:
+                np.load(os.path.join(path, name), mmap_mode="r")
+                for name in os.listdir(path) if name.endswith(".npy")
+            }
+        except (OSError, ValueError):
+            return None
+        self.touch(path)
+        return arrays
+
+    def put(self, key: str, arrays: dict):
+        """
+        Store the arrays of a dataset and evict old entries.
+
+        :param key: The cache key.
+        :type key: str
+        :param arrays: The arrays keyed by name.
+        :type arrays: dict
+        """
+        tmp_path = tempfile.mkdtemp(dir=self.directory, prefix=".")
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, name + ".npy"), array)
+        try:
+            os.rename(tmp_path, self.path(key))
+        except OSError:
+            # another run stored the same entry in the meantime
+            shutil.rmtree(tmp_path)
+        self.evict()
+
+
+def _size(path: str) -> int:
+    """
+    Return the size of a file or of the files in a directory in bytes.
+    """
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def _remove(path: str):
+    """
+    Remove a file or a directory.
+    """
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
@@ -1,6 +1,11 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from simpleclassifier.base import Classifier
 from simpleclassifier.display import Display
-from simpleclassifier.profiler import Profiler
+from simpleclassifier.profiler import Profiler, measure_peak_memory
+from simpleclassifier.scheduler import CostModel, lpt_makespan, lpt_order
 
 
 class ClassifierProfiler:
@@ -9,8 +14,13 @@ class ClassifierProfiler:
     metrics and displaying results.
     """
 
-    def __init__(self, classifiers: list[Classifier], profiler: Profiler,
-                 display: Display):
+    def __init__(self,
+                 classifiers: list[Classifier],
+                 profiler: Profiler,
+                 display: Display,
+                 n_workers: int = 1,
+                 labels: Optional[list[str]] = None,
+                 cost_model: Optional[CostModel] = None):
         """
         Constructor for the ClassifierProfiler class.
 
@@ -20,33 +30,120 @@ class ClassifierProfiler:
         :type profiler: Profiler
         :param display: An instance of the Display class used for showing the results.
         :type display: Display
+        :param n_workers: The number of worker processes used to train the
+            classifiers. With a single worker the classifiers are trained
+            sequentially in the current process.
+        :type n_workers: int, optional
+        :param labels: The names of the classifiers in the progress output
+            and the results, their class names by default.
+        :type labels: list[str], optional
+        :param cost_model: The model estimating the training cost of the
+            classifiers, which are dispatched to the workers most expensive
+            first. By default the costs are estimated from priors.
+        :type cost_model: CostModel, optional
+        :raises ValueError: If n_workers is smaller than 1 or the labels do
+            not match the classifiers.
         """
+        if n_workers < 1:
+            raise ValueError("n_workers must be at least 1")
+        if labels is not None and len(labels) != len(classifiers):
+            raise ValueError("There must be one label per classifier")
+
         self.results = {}
         self.classifiers = classifiers
         self.profiler = profiler
         self.display = display
+        self.n_workers = n_workers
+        self.labels = labels
+        self.cost_model = cost_model or CostModel()
+        self.predicted_makespan_ = None
+        self.makespan_ = None
 
     def train(self):
         """
         Train all classifiers on the dataset.
         """
         print("Training all classifiers...")
-        for classifier in self.classifiers:
-            print("-", classifier.__class__.__name__, end=" ")
-            classifier.fit()
-            print("[Done]")
+        if self.n_workers == 1 or len(self.classifiers) <= 1:
+            for label, classifier in zip(self.get_labels(), self.classifiers):
+                print("-", label, end=" ")
+                _fit_classifier(classifier, self.profiler.trace_fit_memory)
+                print("[Done]")
+        else:
+            self._train_parallel()
+
+    def _train_parallel(self):
+        """
+        Train the classifiers in a pool of worker processes.
+
+        Every classifier is fitted in its own task and the fitted copy is
+        sent back to the parent process. The tasks are submitted longest
+        processing time first according to the cost model, so an expensive
+        classifier does not start last and keep one worker busy while the
+        others idle. Results are collected in the order of the classifiers,
+        so the trained classifiers and the progress output do not depend on
+        which worker finishes first. The makespan predicted by the cost model
+        and the actual one, in seconds, are kept in ``predicted_makespan_``
+        and ``makespan_``.
+        """
+        n_workers = min(self.n_workers, len(self.classifiers))
+        costs = [
+            self.cost_model.estimate_classifier(classifier)
+            for classifier in self.classifiers
+        ]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                i:
+                executor.submit(_fit_classifier, self.classifiers[i],
+                                self.profiler.trace_fit_memory)
+                for i in lpt_order(costs)
+            }
+            labels = self.get_labels()
+            for i in range(len(self.classifiers)):
+                future = futures[i]
+                classifier = self.classifiers[i]
+                print("-", labels[i], end=" ")
+                fitted = future.result()
+                # Keep sharing the parent's dataset instead of the copy
+                # that travelled through the worker.
+                fitted.dataset = classifier.dataset
+                self.classifiers[i] = fitted
+                print("[Done]")
+        self.makespan_ = time.perf_counter() - start
+        self.predicted_makespan_ = lpt_makespan(costs, n_workers)
+        print(f"Makespan: predicted {self.predicted_makespan_:.2f}s, actual "
+              f"{self.makespan_:.2f}s (longest first on {n_workers} workers)")
 
     def profile_classifiers(self):
         """
         Run all profilers on all classifiers and display the results.
+
+        The results of a classifier whose tuning ran out of time are keyed
+        by its label marked ``[budget-limited]``.
         """
         print("Profiling all classifiers...")
-        for classifier in self.classifiers:
-            print("-", classifier.__class__.__name__, end=" ")
-            self.results[classifier.__class__.__name__] = self.profiler.run(
-                classifier)
+        for label, classifier in zip(self.get_labels(), self.classifiers):
+            print("-", label, end=" ")
+            tuner = getattr(classifier, "tuner", None)
+            if getattr(tuner, "budget_exhausted_", False):
+                label = f"{label} [budget-limited]"
+            self.results[label] = self.profiler.run(classifier)
             print("[Done]")
 
+    def get_labels(self) -> list[str]:
+        """
+        Name the classifiers in the progress output and the results.
+
+        :return: The labels, or the class names of the classifiers.
+        :rtype: list[str]
+        """
+        if self.labels is not None:
+            return list(self.labels)
+        return [
+            classifier.__class__.__name__ for classifier in self.classifiers
+        ]
+
     def display_results(self, display_format: str):
         """
         Display the profiling results.
@@ -66,3 +163,33 @@ class ClassifierProfiler:
             raise ValueError(f"Invalid display format: {display_format}. "
                              "Please provide one of the following: 'dump', "
                              "'json', 'plot'.")
+
+
+def _fit_classifier(classifier: Classifier,
+                    trace_memory: bool = False) -> Classifier:
+    """
+    Fit a classifier and record the cost of the fit.
+
+    The wall time of the fit is stored in ``fit_time_`` and the wall time of
+    the hyperparameter tuning in ``tune_time_``, which is 0 for classifiers
+    without a tuner. With ``trace_memory`` the peak memory of the fit in
+    bytes is stored in ``fit_peak_memory_``; tracing slows the fit down, so
+    it is only enabled when the metric is requested. Used both in the
+    current process and inside the worker processes.
+
+    :param classifier: The classifier to fit.
+    :type classifier: Classifier
+    :param trace_memory: Whether the peak memory is traced.
+    :type trace_memory: bool, optional
+    :return: The fitted classifier.
+    :rtype: Classifier
+    """
+    start = time.perf_counter()
+    if trace_memory:
+        _, classifier.fit_peak_memory_ = measure_peak_memory(classifier.fit)
+    else:
+        classifier.fit()
+    classifier.fit_time_ = time.perf_counter() - start
+    tuner = getattr(classifier, "tuner", None)
+    classifier.tune_time_ = getattr(tuner, "tune_time_", None) or 0.0
+    return classifier
@@ -1,16 +1,16 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.svm import SVC
 import warnings
 from sklearn.exceptions import ConvergenceWarning
 
-from simpleclassifier.base import Classifier
+from simpleclassifier.base import Classifier, IncrementalClassifier
 from simpleclassifier.factory import ClassifierFactory
-from simpleclassifier.hyperparameter_tuner import SKLearnHyperparameterTuner
+from simpleclassifier.hyperparameter_tuner import (Categorical, SearchSpace,
+                                                   SKLearnHyperparameterTuner)
 
 warnings.filterwarnings("ignore", category=ConvergenceWarning)
 
+# The estimators are imported when a classifier is created, so that a run
+# only pays for the scikit-learn modules of the classifiers it uses.
+
 
 @ClassifierFactory.register("knn")
 class KNNClassifier(Classifier):
@@ -25,8 +25,18 @@ class KNNClassifier(Classifier):
 
     """
 
-    def __init__(self, dataset):
-        super().__init__(dataset)
+    accepts_sparse = True
+    # The neighbor search algorithm only changes the speed, not the
+    # neighbors found, so it is left to 'auto' instead of being tuned.
+    param_grid = {
+        'n_neighbors': [3, 5, 7],
+        'weights': ['uniform', 'distance'],
+        'p': [1, 2]
+    }
+
+    def __init__(self, dataset, tuner_options=None):
+        super().__init__(dataset, tuner_options)
+        from sklearn.neighbors import KNeighborsClassifier
         self.model = KNeighborsClassifier()
 
     def fit(self):
@@ -39,28 +49,12 @@ class KNNClassifier(Classifier):
 
         - 'weights': The weight function used in prediction.
 
-        - 'algorithm': The algorithm used to compute nearest neighbors.
-
         - 'p': The power parameter for the Minkowski metric.
 
         """
-        param_grid = {
-            'n_neighbors': [3, 5, 7],
-            'weights': ['uniform', 'distance'],
-            'algorithm': ['auto', 'ball_tree', 'kd_tree', 'brute'],
-            'p': [1, 2]
-        }
-        tuner = SKLearnHyperparameterTuner(self.dataset)
-        self.model = tuner.tune_model(self.model, param_grid)
-
-    def predict(self):
-        """
-        Make predictions using the trained k-nearest neighbors model.
-
-        :return: The predicted labels.
-        :rtype: np.ndarray
-        """
-        return self.model.predict(self.dataset.X_test)
+        self.tuner = SKLearnHyperparameterTuner(self.dataset,
+                                                **self.tuner_options)
+        self.model = self.tuner.tune_model(self.model, self.param_grid)
 
 
 @ClassifierFactory.register("lr")
@@ -75,8 +69,16 @@ class LogisticRegressionClassifier(Classifier):
 
     """
 
-    def __init__(self, dataset):
-        super().__init__(dataset)
+    accepts_sparse = True
+    param_grid = {
+        'C': [0.1, 1.0, 5.0],
+        'penalty': ['l1', 'l2'],
+        'solver': ['liblinear', 'saga']
+    }
+
+    def __init__(self, dataset, tuner_options=None):
+        super().__init__(dataset, tuner_options)
+        from sklearn.linear_model import LogisticRegression
         self.model = LogisticRegression()
 
     def fit(self):
@@ -94,23 +96,9 @@ class LogisticRegressionClassifier(Classifier):
         - 'solver': Algorithm to use in optimization.
 
         """
-        param_grid = {
-            'C': [0.1, 1.0, 5.0],
-            'penalty': ['l1', 'l2'],
-            'solver': ['liblinear', 'saga']
-        }
-        tuner = SKLearnHyperparameterTuner(self.dataset)
-        self.model = tuner.tune_model(self.model, param_grid)
-
-    def predict(self):
-        """
-        Make predictions using the trained
-        logistic regression model.
-
-        :return: The predicted labels.
-        :rtype: np.ndarray
-        """
-        return self.model.predict(self.dataset.X_test)
+        self.tuner = SKLearnHyperparameterTuner(self.dataset,
+                                                **self.tuner_options)
+        self.model = self.tuner.tune_model(self.model, self.param_grid)
 
 
 @ClassifierFactory.register("rf")
@@ -127,8 +115,15 @@ class RandomForestEnsembleClassifier(Classifier):
 
     """
 
-    def __init__(self, dataset):
-        super().__init__(dataset)
+    accepts_sparse = True
+    param_grid = {
+        'n_estimators': [50, 100, 200],
+        'criterion': ['gini', 'entropy']
+    }
+
+    def __init__(self, dataset, tuner_options=None):
+        super().__init__(dataset, tuner_options)
+        from sklearn.ensemble import RandomForestClassifier
         self.model = RandomForestClassifier()
 
     def fit(self):
@@ -144,22 +139,9 @@ class RandomForestEnsembleClassifier(Classifier):
         - 'criterion': The function to measure the quality of a split.
 
         """
-        param_grid = {
-            'n_estimators': [50, 100, 200],
-            'criterion': ['gini', 'entropy']
-        }
-        tuner = SKLearnHyperparameterTuner(self.dataset)
-        self.model = tuner.tune_model(self.model, param_grid)
-
-    def predict(self):
-        """
-        Make predictions using the trained
-        random forest model.
-
-        :return: The predicted labels.
-        :rtype: np.ndarray
-        """
-        return self.model.predict(self.dataset.X_test)
+        self.tuner = SKLearnHyperparameterTuner(self.dataset,
+                                                **self.tuner_options)
+        self.model = self.tuner.tune_model(self.model, self.param_grid)
 
 
 @ClassifierFactory.register("svm")
@@ -176,10 +158,29 @@ class SVMClassifier(Classifier):
 
     """
 
-    def __init__(self, dataset):
-        super().__init__(dataset)
+    accepts_sparse = True
+    # The degree is only used by the polynomial kernel and gamma by the
+    # non-linear kernels, 33 distinct candidates instead of 72.
+    param_grid = SearchSpace(
+        {
+            'C': Categorical([0.1, 1.0, 10.0]),
+            'kernel': Categorical(['linear', 'poly', 'rbf', 'sigmoid']),
+            'degree': Categorical([2, 3, 4]),
+            'gamma': Categorical(['scale', 'auto'])
+        },
+        conditions={
+            'degree': {
+                'kernel': ['poly']
+            },
+            'gamma': {
+                'kernel': ['poly', 'rbf', 'sigmoid']
+            }
+        })
+
+    def __init__(self, dataset, tuner_options=None):
+        super().__init__(dataset, tuner_options)
+        from sklearn.svm import SVC
         self.model = SVC()
-        self.tuner = SKLearnHyperparameterTuner(dataset)
 
     def fit(self):
         """
@@ -193,26 +194,82 @@ class SVMClassifier(Classifier):
 
         - 'kernel': Specifies the kernel type to be used in the algorithm.
 
-        - 'degree': Degree of the polynomial kernel function.
+        - 'degree': Degree of the polynomial kernel function, only tuned for
+          the 'poly' kernel.
+
+        - 'gamma': Kernel coefficient for 'rbf', 'poly', and 'sigmoid', not
+          tuned for the 'linear' kernel.
+
+        """
+        self.tuner = SKLearnHyperparameterTuner(self.dataset,
+                                                **self.tuner_options)
+        self.model = self.tuner.tune_model(self.model, self.param_grid)
+
+
+@ClassifierFactory.register("sgd")
+class SGDLinearClassifier(IncrementalClassifier):
+    """
+    A linear classifier trained incrementally with stochastic gradient
+    descent.
+
+    The model is fed the training data in chunks, so it scales to
+    datasets that do not fit in memory.
+
+    """
+
+    accepts_sparse = True
+
+    def create_model(self):
+        """
+        Create a linear support vector machine trained with SGD.
+
+        :return: The untrained model.
+        :rtype: sklearn.linear_model.SGDClassifier
+        """
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(random_state=self.random_state)
 
-        - 'gamma': Kernel coefficient for 'rbf', 'poly', and 'sigmoid'.
 
+@ClassifierFactory.register("nb")
+class NaiveBayesClassifier(IncrementalClassifier):
+    """
+    A Gaussian naive Bayes classifier trained incrementally.
+
+    Naive Bayes models every feature as an independent Gaussian per class.
+    The per-class means and variances are updated chunk by chunk, so a
+    single epoch already gives the exact model.
+
+    """
+
+    def create_model(self):
         """
-        param_grid = {
-            'C': [0.1, 1.0, 10.0],
-            'kernel': ['linear', 'poly', 'rbf', 'sigmoid'],
-            'degree': [2, 3, 4],
-            'gamma': ['scale', 'auto']
-        }
-        tuner = SKLearnHyperparameterTuner(self.dataset)
-        self.model = tuner.tune_model(self.model, param_grid)
-
-    def predict(self):
+        Create a Gaussian naive Bayes model.
+
+        :return: The untrained model.
+        :rtype: sklearn.naive_bayes.GaussianNB
+        """
+        from sklearn.naive_bayes import GaussianNB
+        return GaussianNB()
+
+
+@ClassifierFactory.register("mlp")
+class MLPNetworkClassifier(IncrementalClassifier):
+    """
+    A multi-layer perceptron trained incrementally on mini-batches.
+
+    Each chunk of the training data is one mini-batch of the stochastic
+    optimizer of the neural network.
+
+    """
+
+    accepts_sparse = True
+
+    def create_model(self):
         """
-        Make predictions using the trained support
-        vector machine (SVM) model.
+        Create a multi-layer perceptron with one hidden layer.
 
-        :return: The predicted labels.
-        :rtype: np.ndarray
+        :return: The untrained model.
+        :rtype: sklearn.neural_network.MLPClassifier
         """
-        return self.model.predict(self.dataset.X_test)
+        from sklearn.neural_network import MLPClassifier
+        return MLPClassifier(random_state=self.random_state)
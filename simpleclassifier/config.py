@@ -0,0 +1,147 @@
+"""
+The configuration of a run and the dataset and classifiers it builds,
+shared by the command line, the sweeps and the benchmarks.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from simpleclassifier.cache import DatasetCache, TuningCache
+from simpleclassifier.factory import (ClassifierFactory,
+                                      SplitterDatasetFactory, SplitterFactory)
+from simpleclassifier.preprocessing import make_preprocessor
+
+
+@dataclass
+class Config:
+    classifier_names: list[str]
+    dataset_name: str
+    splitting_strategy: str
+    test_size: float
+    profile_metrics: list[str]
+    display_format: str
+    n_workers: int = 1
+    tuner_options: dict = field(default_factory=dict)
+    classifier_options: dict = field(default_factory=dict)
+    tuning_strategy: str = "grid"
+    tuning_cache: Optional[dict] = None
+    dataset_cache: Optional[dict] = None
+    dataset_options: dict = field(default_factory=dict)
+    predict_options: dict = field(default_factory=dict)
+    splitter_options: dict = field(default_factory=dict)
+    preprocessing: Optional[dict] = None
+    dtype: Optional[str] = None
+    cost_history: Optional[str] = None
+    time_budget: Optional[float] = None
+    save_models: Optional[str] = None
+    load_models: Optional[str] = None
+    predict: Optional[str] = None
+    output: Optional[str] = None
+    # The time.time() at which the time_budget of the run runs out
+    deadline: Optional[float] = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.time_budget is not None:
+            if self.time_budget <= 0:
+                raise ValueError("time_budget must be positive")
+            self.deadline = time.time() + self.time_budget
+
+    def classifier_kwargs(self, classifier_name: str) -> dict:
+        """
+        Build the keyword arguments used to create a classifier.
+
+        The ``tuning_strategy``, the ``tuning_cache``, the ``cost_history``,
+        the deadline of the ``time_budget`` and the shared ``tuner_options``
+        are merged with the ``tuner_options`` given for the
+        classifier in ``classifier_options``, the latter taking precedence.
+
+        :param classifier_name: The codename of the classifier.
+        :type classifier_name: str
+        :return: The keyword arguments for the classifier.
+        :rtype: dict
+        """
+        kwargs = dict(self.classifier_options.get(classifier_name) or {})
+        defaults = {"strategy": self.tuning_strategy}
+        if self.tuning_cache is not None:
+            defaults["cache"] = TuningCache.from_config(self.tuning_cache)
+        if self.cost_history is not None:
+            defaults["cost_history"] = self.cost_history
+        if self.deadline is not None:
+            defaults["deadline"] = self.deadline
+        kwargs["tuner_options"] = {
+            **defaults,
+            **self.tuner_options,
+            **(kwargs.get("tuner_options") or {})
+        }
+        return kwargs
+
+
+def build_dataset(config: Config):
+    """
+    Load, split and scale the dataset of a configuration, and attach its
+    preprocessing.
+
+    :param config: The configuration.
+    :type config: Config
+    :return: The dataset.
+    :rtype: SplitterDataset
+    """
+    splitter = SplitterFactory.create_instance(config.splitting_strategy,
+                                               test_size=config.test_size,
+                                               **config.splitter_options)
+
+    dataset_cache = None
+    if config.dataset_cache is not None:
+        dataset_cache = DatasetCache.from_config(config.dataset_cache)
+    dataset = SplitterDatasetFactory.create_instance(config.dataset_name,
+                                                     splitter=splitter,
+                                                     cache=dataset_cache,
+                                                     dtype=config.dtype,
+                                                     **config.dataset_options)
+    if config.preprocessing is not None:
+        # either the list of steps or the steps and the memo size
+        options = config.preprocessing
+        if isinstance(options, list):
+            options = {"steps": options}
+        dataset.attach_preprocessing(
+            make_preprocessor(options["steps"]),
+            max_bytes=options.get("max_size_mb", 512) * 2**20)
+    return dataset
+
+
+def report_memory(config: Config, dataset):
+    """
+    Print the memory saved by the ``dtype`` or the sparse features of a
+    dataset, if any.
+
+    :param config: The configuration of the dataset.
+    :type config: Config
+    :param dataset: The dataset.
+    :type dataset: SplitterDataset
+    """
+    report = dataset.memory_report()
+    if config.dtype is not None or report["X_train"]["sparse"]:
+        total = report["total"]
+        print(f"Dataset stored in {total['nbytes'] / 2**20:.2f} MiB, "
+              f"{total['saved_bytes'] / 2**20:.2f} MiB saved against dense "
+              "float64")
+
+
+def build_classifiers(config: Config, dataset) -> list:
+    """
+    Create the untrained classifiers of a configuration.
+
+    :param config: The configuration.
+    :type config: Config
+    :param dataset: The dataset the classifiers are trained on.
+    :type dataset: SplitterDataset
+    :return: The classifiers, in the order of ``classifier_names``.
+    :rtype: list[Classifier]
+    """
+    return [
+        ClassifierFactory.create_instance(
+            classifier_name,
+            dataset=dataset,
+            **config.classifier_kwargs(classifier_name))
+        for classifier_name in config.classifier_names
+    ]
@@ -1,8 +1,7 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import json
 
-from matplotlib.colors import ListedColormap
+from simpleclassifier.profiler import PERFORMANCE_METRICS
 
 
 class Display:
@@ -20,6 +19,7 @@ class Display:
         Dump the profiling results to the console.
 
         This method groups the results by metric and displays them in a tabular format.
+        The performance metrics are labelled with their units.
 
         :param results: The profiling results for each classifier and metric.
         :type results: dict
@@ -39,7 +39,8 @@ class Display:
         print("=====================================")
         for metric, scores in metrics.items():
             print("-------------------------------------")
-            print(metric)
+            unit = PERFORMANCE_METRICS.get(metric)
+            print(metric if unit is None else f"{metric} [{unit}]")
             for classifier, score in scores:
                 print(f"- {classifier}: {score}")
         print("=====================================")
@@ -61,13 +62,17 @@ class Display:
         Plot the profiling results for each classifier and metric.
 
         This method creates a bar plot showing the scores for
-        each classifier and metric.
+        each classifier and metric. The quality scores share one axis and
+        each performance metric is plotted on its own axis with its unit.
 
         :param results: The profiling results for each classifier and metric.
         :type results: dict
 
         :return: None
         """
+        # matplotlib is slow to import, so only load it when plotting
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
 
         # Calculate the number of classifiers and create a colormap
         num_classifiers = len(results)
@@ -77,33 +82,45 @@ class Display:
             plt.cm.turbo(np.linspace(  # type: ignore
                 0, 1, num_classifiers)))
 
-        # Create the plot
-        fig, ax = plt.subplots(figsize=(10, 6))
-
         # Extract the classifiers, metrics, and scores from the results
         classifiers = list(results.keys())
-        num_metrics = len(list(results.values())[0])
-        if num_metrics == 0:
+        x_labels = list(list(results.values())[0].keys())
+        if len(x_labels) == 0:
             raise ValueError("No profiler metrics given by user.")
-        x_labels = list(results.values())[0].keys()
-
-        # Plot the scores for each classifier and metric
-        for i, classifier in enumerate(classifiers):
-            scores = [results[classifier][metric] for metric in x_labels]
-            ax.bar(
-                [j + i * (0.8 / len(classifiers)) for j in range(num_metrics)],
-                scores,
-                width=0.8 / len(classifiers),
-                color=cmap(i),
-                label=classifier)
+
+        # The quality scores share an axis, every performance metric has
+        # its own axis since their units and scales differ
+        quality = [m for m in x_labels if m not in PERFORMANCE_METRICS]
+        performance = [m for m in x_labels if m in PERFORMANCE_METRICS]
+        groups = ([(quality, 'Score', 14)] if quality else []) + [
+            ([metric], PERFORMANCE_METRICS[metric], 10)
+            for metric in performance
+        ]
+        fig, axes = plt.subplots(1,
+                                 len(groups),
+                                 figsize=(10 + 2 * len(performance), 6),
+                                 squeeze=False,
+                                 width_ratios=[len(m) for m, _, _ in groups])
+
+        width = 0.8 / len(classifiers)
+        for ax, (metrics, ylabel, fontsize) in zip(axes[0], groups):
+            # Plot the scores for each classifier and metric
+            for i, classifier in enumerate(classifiers):
+                scores = [results[classifier][metric] for metric in metrics]
+                ax.bar([j + i * width for j in range(len(metrics))],
+                       scores,
+                       width=width,
+                       color=cmap(i),
+                       label=classifier)
+            ax.set_ylabel(ylabel)
+            ax.set_xticks([i + 0.4 for i in range(len(metrics))])
+            ax.set_xticklabels(metrics, fontsize=fontsize)
 
         # Set the plot properties
-        ax.set_ylabel('Score')
-        ax.set_xlabel('Metrics')
-        ax.set_title('Classifier Performance Comparison')
-        ax.set_xticks([i + 0.4 for i in range(num_metrics)])
-        ax.set_xticklabels(x_labels, fontsize=14)
-        ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1))
+        axes[0][0].set_xlabel('Metrics')
+        fig.suptitle('Classifier Performance Comparison')
+        axes[0][-1].legend(loc='upper right', bbox_to_anchor=(1.15, 1))
+        fig.tight_layout()
 
         # Display the plot
         plt.show()
@@ -1,13 +1,17 @@
+import importlib
 from abc import ABC
 
-from simpleclassifier.base import (Classifier, SplitterDataset, Splitter)
+from simpleclassifier.base import (Classifier, SearchStrategy, SplitterDataset,
+                                   Splitter)
 
 
 class BaseFactory(ABC):
     registry = None
+    lazy_registry = None
 
     def __init_subclass__(cls):
         cls.registry = {}
+        cls.lazy_registry = {}
 
     @classmethod
     def register(cls, name: str):
@@ -25,18 +29,39 @@ class BaseFactory(ABC):
 
         return inner_wrapper
 
+    @classmethod
+    def register_lazy(cls, name: str, module: str):
+        """
+        Register a name whose class is defined in a module that is only
+        imported on the first ``create_instance`` call for that name.
+
+        The module must register the class under the same name when it is
+        imported.
+        """
+        cls.lazy_registry[name] = module
+
     @classmethod
     def get_registered_class_type(cls):
         raise NotImplementedError(
             "Subclasses must implement get_registered_class_type method")
 
     @classmethod
-    def create_instance(cls, name: str, **kwargs):
+    def get_registered_names(cls) -> list[str]:
+        return list(dict.fromkeys([*cls.registry, *cls.lazy_registry]))
+
+    @classmethod
+    def get_class(cls, name: str):
+        if name not in cls.registry and name in cls.lazy_registry:
+            importlib.import_module(cls.lazy_registry[name])
         if name not in cls.registry:
             raise ValueError(
                 f"No {cls.__name__.lower()} registered for {name}, registered "
-                f"{cls.__name__.lower()}s are: {list(cls.registry.keys())}")
-        class_ = cls.registry[name]
+                f"{cls.__name__.lower()}s are: {cls.get_registered_names()}")
+        return cls.registry[name]
+
+    @classmethod
+    def create_instance(cls, name: str, **kwargs):
+        class_ = cls.get_class(name)
         instance = class_(**kwargs)
         return instance
 
@@ -60,3 +85,25 @@ class SplitterFactory(BaseFactory):
     @classmethod
     def get_registered_class_type(cls):
         return Splitter
+
+
+class SearchStrategyFactory(BaseFactory):
+
+    @classmethod
+    def get_registered_class_type(cls):
+        return SearchStrategy
+
+
+for name in ("knn", "lr", "rf", "svm", "sgd", "nb", "mlp"):
+    ClassifierFactory.register_lazy(name, "simpleclassifier.classifiers")
+for name in ("breast_cancer", "iris", "wine", "csv", "npy", "columnar",
+             "blobs", "moons", "sparse_high_dim", "imbalanced"):
+    SplitterDatasetFactory.register_lazy(name,
+                                         "simpleclassifier.splitter_datasets")
+for name in ("percentage", "percentage_shuffle", "percentage_stratified",
+             "kfold", "stratified_kfold", "repeated_kfold",
+             "repeated_stratified_kfold"):
+    SplitterFactory.register_lazy(name, "simpleclassifier.splitters")
+for name in ("grid", "random", "halving", "tpe"):
+    SearchStrategyFactory.register_lazy(
+        name, "simpleclassifier.hyperparameter_tuner")
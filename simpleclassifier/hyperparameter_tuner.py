@@ -1,6 +1,1105 @@
-from simpleclassifier.base import SplitterDataset
+import itertools
+import math
+import multiprocessing
+import queue
+import time
+import warnings
+from typing import Optional
 
-from sklearn.model_selection import GridSearchCV
+from simpleclassifier.base import SearchStrategy, SplitterDataset
+from simpleclassifier.cache import TuningCache, fingerprint
+from simpleclassifier.factory import SearchStrategyFactory
+from simpleclassifier.scheduler import CostModel, LPTGridSearchCV, search_shape
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs, parallel_backend
+from scipy.stats import loguniform, randint, uniform
+from sklearn.base import clone, is_classifier
+from sklearn.exceptions import FitFailedWarning
+from sklearn.experimental import enable_halving_search_cv  # noqa
+from sklearn.model_selection import (GridSearchCV, HalvingGridSearchCV,
+                                     ParameterGrid, ParameterSampler,
+                                     RandomizedSearchCV, check_cv)
+
+BACKENDS = ("loky", "threading", "multiprocessing")
+SCHEDULES = ("lpt", "fifo")
+
+
+class Real:
+    """
+    A continuous search dimension between ``low`` and ``high``.
+    """
+
+    def __init__(self, low: float, high: float, log: bool = False):
+        """
+        Initialize the Real dimension.
+
+        :param low: The lower bound, included.
+        :type low: float
+        :param high: The upper bound, included.
+        :type high: float
+        :param log: Whether the dimension is searched on a log scale.
+        :type log: bool, optional
+        :raises ValueError: If the bounds are invalid.
+        """
+        if not low < high:
+            raise ValueError("low must be smaller than high")
+        if log and low <= 0:
+            raise ValueError("log-scaled dimensions must have a positive low")
+        self.low = low
+        self.high = high
+        self.log = log
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(low={self.low!r}, high={self.high!r}, "
+                f"log={self.log!r})")
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """
+        The bounds of the dimension in the search space, i.e. after the
+        log transform for log-scaled dimensions.
+        """
+        if self.log:
+            return math.log(self.low), math.log(self.high)
+        return float(self.low), float(self.high)
+
+    def to_internal(self, value) -> float:
+        """
+        Map a hyperparameter value into the search space.
+        """
+        return math.log(value) if self.log else float(value)
+
+    def from_internal(self, value: float):
+        """
+        Map a point of the search space back to a hyperparameter value.
+        """
+        low, high = self.bounds
+        value = min(max(value, low), high)
+        if self.log:
+            # exp(log(x)) is not exactly x, keep the value in bounds
+            return min(max(math.exp(value), self.low), self.high)
+        return value
+
+    def to_distribution(self):
+        """
+        Return the scipy distribution used by a randomized search.
+        """
+        if self.log:
+            return loguniform(self.low, self.high)
+        return uniform(self.low, self.high - self.low)
+
+
+class Integer(Real):
+    """
+    An integer search dimension between ``low`` and ``high``.
+    """
+
+    def __init__(self, low: int, high: int, log: bool = False):
+        super().__init__(int(low), int(high), log)
+
+    def from_internal(self, value: float) -> int:
+        """
+        Map a point of the search space back to the nearest integer.
+        """
+        return int(round(super().from_internal(value)))
+
+    def to_distribution(self):
+        """
+        Return the scipy distribution used by a randomized search.
+        """
+        if self.log:
+            raise ValueError("log-scaled integer dimensions are only "
+                             "supported by the 'tpe' strategy")
+        return randint(self.low, self.high + 1)
+
+
+class Categorical:
+    """
+    A search dimension over a finite list of choices.
+    """
+
+    def __init__(self, choices: list):
+        """
+        Initialize the Categorical dimension.
+
+        :param choices: The possible values of the dimension.
+        :type choices: list
+        :raises ValueError: If no choices are given.
+        """
+        if len(choices) == 0:
+            raise ValueError("choices must not be empty")
+        self.choices = list(choices)
+
+    def __repr__(self):
+        return f"Categorical({self.choices!r})"
+
+    def to_distribution(self):
+        """
+        Return the choices, sampled uniformly by a randomized search.
+        """
+        return self.choices
+
+
+class SearchSpace:
+    """
+    A search space made of named dimensions.
+
+    Unlike a parameter grid, a search space can contain continuous,
+    integer and log-scaled dimensions next to categorical ones, and
+    conditional dimensions that only matter for some values of a
+    categorical dimension, e.g. the ``degree`` of a polynomial kernel.
+    Candidates leave out the dimensions that are inactive for them, so the
+    combinations that only differ in ignored hyperparameters are evaluated
+    once.
+    """
+
+    DIMENSION_TYPES = {"float": Real, "int": Integer}
+
+    def __init__(self, dimensions: dict, conditions: Optional[dict] = None):
+        """
+        Initialize the SearchSpace.
+
+        :param dimensions: The dimensions of the space, keyed by the
+            hyperparameter name.
+        :type dimensions: dict
+        :param conditions: The dimensions that are only active for some
+            values of other, categorical dimensions, e.g.
+            ``{"degree": {"kernel": ["poly"]}}``. A dimension with several
+            parents is active when all of them have one of their values.
+        :type conditions: dict, optional
+        :raises ValueError: If a condition refers to an unknown or a
+            non-categorical dimension.
+        """
+        conditions = {
+            name: {
+                parent:
+                list(values) if isinstance(values,
+                                           (list, tuple)) else [values]
+                for parent, values in parents.items()
+            }
+            for name, parents in (conditions or {}).items()
+        }
+        for name, parents in conditions.items():
+            if name not in dimensions:
+                raise ValueError(f"Unknown conditional dimension: {name}")
+            for parent in parents:
+                if not isinstance(dimensions.get(parent), Categorical):
+                    raise ValueError(f"The condition of {name} must refer to "
+                                     f"a categorical dimension, not {parent}")
+        self.dimensions = dimensions
+        self.conditions = conditions
+
+    def __repr__(self):
+        if self.conditions:
+            return f"SearchSpace({self.dimensions!r}, {self.conditions!r})"
+        return f"SearchSpace({self.dimensions!r})"
+
+    def is_active(self, name: str, params: dict) -> bool:
+        """
+        Tell whether a dimension matters for a candidate.
+
+        :param name: The name of the dimension.
+        :type name: str
+        :param params: The values of the parent dimensions.
+        :type params: dict
+        :rtype: bool
+        """
+        return all(
+            params.get(parent) in values
+            for parent, values in self.conditions.get(name, {}).items())
+
+    def prune(self, params: dict) -> dict:
+        """
+        Remove the values of the dimensions that are inactive for a
+        candidate.
+
+        :param params: The values of every dimension.
+        :type params: dict
+        :return: The values of the active dimensions.
+        :rtype: dict
+        """
+        return {
+            name: value
+            for name, value in params.items() if self.is_active(name, params)
+        }
+
+    @classmethod
+    def from_config(cls, config: dict) -> "SearchSpace":
+        """
+        Create a search space from its YAML declaration.
+
+        A dimension is either a list of choices or a mapping with a
+        ``type`` of "float", "int" or "categorical", e.g.
+        ``{type: float, low: 0.01, high: 100, log: true}`` or
+        ``{type: categorical, choices: [rbf, sigmoid]}``. A mapping with a
+        ``when`` key is only active for the given values of other
+        dimensions, e.g. ``{type: int, low: 2, high: 5, when: {kernel:
+        poly}}``.
+
+        :param config: The declaration of each dimension.
+        :type config: dict
+        :return: The search space.
+        :rtype: SearchSpace
+        :raises ValueError: If a dimension type is unknown.
+        """
+        dimensions, conditions = {}, {}
+        for name, spec in config.items():
+            if isinstance(spec, (list, tuple)):
+                dimensions[name] = Categorical(spec)
+                continue
+            spec = dict(spec)
+            if "when" in spec:
+                conditions[name] = spec.pop("when")
+            type_ = spec.pop("type", "float")
+            if type_ == "categorical":
+                dimensions[name] = Categorical(spec["choices"])
+            elif type_ in cls.DIMENSION_TYPES:
+                dimensions[name] = cls.DIMENSION_TYPES[type_](**spec)
+            else:
+                raise ValueError(
+                    f"Invalid dimension type: {type_}. Please provide one of "
+                    "the following: 'float', 'int', 'categorical'.")
+        return cls(dimensions, conditions)
+
+    @classmethod
+    def from_param_grid(cls, param_grid) -> "SearchSpace":
+        """
+        Create a search space from a parameter grid.
+
+        :param param_grid: A search space or a dictionary mapping each
+            hyperparameter to a list of values.
+        :return: The search space.
+        :rtype: SearchSpace
+        """
+        if isinstance(param_grid, SearchSpace):
+            return param_grid
+        return cls({
+            name: Categorical(values)
+            for name, values in param_grid.items()
+        })
+
+    def to_param_grid(self):
+        """
+        Convert the search space to a parameter grid.
+
+        A space with conditions becomes a list of one grid per distinct
+        candidate. The candidates keep the order of the full grid, so a
+        search breaks ties between equal scores as it would on the full
+        grid.
+
+        :return: A dictionary mapping each hyperparameter to its choices,
+            or a list of such dictionaries.
+        :rtype: dict or list[dict]
+        :raises ValueError: If the space has non-categorical dimensions.
+        """
+        if not all(
+                isinstance(dimension, Categorical)
+                for dimension in self.dimensions.values()):
+            raise ValueError("Only the 'random' and 'tpe' strategies support "
+                             "continuous and integer dimensions")
+        param_grid = {
+            name: dimension.choices
+            for name, dimension in self.dimensions.items()
+        }
+        if not self.conditions:
+            return param_grid
+        candidates = {}
+        for params in ParameterGrid(param_grid):
+            params = self.prune(params)
+            candidates.setdefault(_describe_params(params), params)
+        return [{
+            name: [value]
+            for name, value in params.items()
+        } for params in candidates.values()]
+
+    def to_distributions(self):
+        """
+        Convert the search space to distributions for a randomized search.
+
+        With conditions, a categorical space is sampled from its distinct
+        candidates, and another space becomes one set of distributions per
+        combination of the parent values, each with its active dimensions.
+
+        :return: A dictionary mapping each hyperparameter to a scipy
+            distribution or a list of choices, or a list of such
+            dictionaries.
+        :rtype: dict or list[dict]
+        """
+        distributions = {
+            name: dimension.to_distribution()
+            for name, dimension in self.dimensions.items()
+        }
+        if not self.conditions:
+            return distributions
+        if all(
+                isinstance(dimension, Categorical)
+                for dimension in self.dimensions.values()):
+            return self.to_param_grid()
+        parents = sorted({
+            parent
+            for parents in self.conditions.values()
+            for parent in parents
+        })
+        branches = []
+        for values in itertools.product(*(self.dimensions[parent].choices
+                                          for parent in parents)):
+            fixed = dict(zip(parents, values))
+            branch = {
+                name: [fixed[name]] if name in fixed else distribution
+                for name, distribution in distributions.items()
+                if self.is_active(name, fixed)
+            }
+            if branch not in branches:
+                branches.append(branch)
+        return branches
+
+
+class TPESearchCV:
+    """
+    A sequential model-based optimizer using a Tree-structured Parzen
+    Estimator (TPE).
+
+    After a few random startup trials, the evaluated trials are split
+    into the best ``gamma`` fraction and the rest. Each dimension gets a
+    Parzen density for both groups, and new trials are the candidates
+    sampled from the density of the good trials that maximize the ratio
+    between both densities. Trials are proposed and evaluated in batches
+    so that a batch runs in parallel.
+
+    The fitted object exposes the same attributes as the scikit-learn
+    searches: ``best_estimator_``, ``best_params_``, ``best_score_``,
+    ``best_index_`` and ``cv_results_``.
+
+    With a ``deadline``, a :py:func:`time.time` timestamp, the trials are
+    fitted out of process, in worker processes started once for the whole
+    search. No batch is proposed after the deadline and the fits of the
+    running batch are cancelled when it passes. The trials evaluated on
+    every fold are kept and ``budget_exhausted_`` is set.
+
+    As in the scikit-learn searches, a trial whose fit fails on a fold,
+    e.g. an invalid combination of hyperparameters, is scored
+    ``error_score`` there, or the error is raised if it is "raise". Failed
+    trials are not used to propose the next ones.
+    """
+
+    def __init__(self,
+                 estimator,
+                 search_space: SearchSpace,
+                 n_trials: int = 30,
+                 n_startup_trials: int = 10,
+                 batch_size: Optional[int] = None,
+                 gamma: float = 0.25,
+                 n_ei_candidates: int = 24,
+                 cv=5,
+                 n_jobs: Optional[int] = None,
+                 pre_dispatch="2*n_jobs",
+                 random_state: Optional[int] = None,
+                 deadline: Optional[float] = None,
+                 error_score=np.nan):
+        self.estimator = estimator
+        self.search_space = search_space
+        self.n_trials = n_trials
+        self.n_startup_trials = n_startup_trials
+        self.batch_size = batch_size
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.pre_dispatch = pre_dispatch
+        self.random_state = random_state
+        self.deadline = deadline
+        self.error_score = error_score
+
+    def fit(self, X, y):
+        """
+        Run the optimization and refit the best trial on the whole data.
+
+        :param X: The training feature matrix.
+        :param y: The training target variable.
+        :return: The fitted search.
+        :rtype: TPESearchCV
+        """
+        rng = np.random.default_rng(self.random_state)
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        folds = list(cv.split(X, y))
+        batch_size = self.batch_size or max(1, effective_n_jobs(self.n_jobs))
+        parallel = Parallel(n_jobs=self.n_jobs, pre_dispatch=self.pre_dispatch)
+
+        # the processes evaluating the trials until the deadline, started
+        # by the first batch
+        pool = _DeadlinePool(self.estimator, X, y, self.n_jobs,
+                             self.error_score)
+        self.budget_exhausted_ = False
+        trials, out = [], []
+        try:
+            while len(trials) < self.n_trials and not self.budget_exhausted_:
+                n_batch = min(batch_size, self.n_trials - len(trials))
+                scores = [
+                    np.mean([r[0] for r in out[i:i + len(folds)]])
+                    for i in range(0, len(out), len(folds))
+                ]
+                if len(trials) < self.n_startup_trials:
+                    batch = []
+                    for _ in range(n_batch):
+                        batch.append(self._sample_prior(rng, trials + batch))
+                else:
+                    batch = self._propose(trials, scores, n_batch, rng)
+                if self.deadline is None:
+                    fit = delayed(_fit_and_score)
+                    out.extend(
+                        parallel(
+                            fit(clone(self.estimator), X, y, train, test,
+                                params, self.error_score) for params in batch
+                            for train, test in folds))
+                else:
+                    batch, batch_out = pool.evaluate_until(
+                        batch, folds, self.deadline)
+                    out.extend(batch_out)
+                    self.budget_exhausted_ = (len(batch) < n_batch
+                                              or time.time() >= self.deadline)
+                trials.extend(batch)
+        finally:
+            pool.close()
+        return _finish_search(self, X, y, trials, out, len(folds))
+
+    def _sample_prior(self, rng, seen: list[dict]) -> dict:
+        """
+        Sample one trial uniformly from the search space, retrying a few
+        times when the trial was already seen.
+        """
+        for _ in range(self.n_ei_candidates):
+            params = {}
+            for name, dimension in self.search_space.dimensions.items():
+                if isinstance(dimension, Categorical):
+                    index = rng.integers(len(dimension.choices))
+                    params[name] = dimension.choices[index]
+                else:
+                    params[name] = dimension.from_internal(
+                        rng.uniform(*dimension.bounds))
+            params = self.search_space.prune(params)
+            if params not in seen:
+                break
+        return params
+
+    def _propose(self, trials, scores, n_batch, rng) -> list[dict]:
+        """
+        Propose a batch of new trials from the evaluated ones. The
+        densities of a conditional dimension are built from the trials it
+        was active in, and only the active dimensions of a candidate count
+        in its ratio. Failed trials are left out of the densities.
+        """
+        scores = np.asarray(scores, dtype=float)
+        valid = np.flatnonzero(~np.isnan(scores))
+        if len(valid) == 0:
+            batch = []
+            for _ in range(n_batch):
+                batch.append(self._sample_prior(rng, trials + batch))
+            return batch
+        seen = trials
+        trials = [trials[i] for i in valid]
+        scores = scores[valid]
+        order = np.argsort(-scores, kind="stable")
+        n_good = max(1, int(math.ceil(self.gamma * len(trials))))
+        good = [trials[i] for i in order[:n_good]]
+        bad = [trials[i] for i in order[n_good:]]
+
+        batch = []
+        for _ in range(n_batch):
+            candidates = [{} for _ in range(self.n_ei_candidates)]
+            ratios = {}
+            for name, dimension in self.search_space.dimensions.items():
+                good_values = [t[name] for t in good if name in t]
+                bad_values = [t[name] for t in bad if name in t]
+                if isinstance(dimension, Categorical):
+                    samples, ratio = _categorical_tpe(dimension, good_values,
+                                                      bad_values,
+                                                      self.n_ei_candidates,
+                                                      rng)
+                    values = [dimension.choices[i] for i in samples]
+                else:
+                    samples, ratio = _numerical_tpe(
+                        dimension,
+                        [dimension.to_internal(v) for v in good_values],
+                        [dimension.to_internal(v)
+                         for v in bad_values], self.n_ei_candidates, rng)
+                    values = [dimension.from_internal(v) for v in samples]
+                ratios[name] = ratio
+                for candidate, value in zip(candidates, values):
+                    candidate[name] = value
+            candidates = [
+                self.search_space.prune(candidate) for candidate in candidates
+            ]
+            log_ratio = np.array([
+                sum(ratios[name][i] for name in candidate)
+                for i, candidate in enumerate(candidates)
+            ])
+
+            seen = seen + batch
+            for i in np.argsort(-log_ratio, kind="stable"):
+                if candidates[i] not in seen:
+                    batch.append(candidates[i])
+                    break
+            else:
+                batch.append(self._sample_prior(rng, seen))
+        return batch
+
+
+class BudgetedSearchCV:
+    """
+    A search over a fixed list of candidates bounded by a deadline.
+
+    The fits of every candidate on every fold run out of process, in a
+    pool of ``n_jobs`` worker processes, at least one, started for the
+    search. No fit is issued once the deadline, a :py:func:`time.time`
+    timestamp, has passed, and the pool is terminated then, which cancels
+    the fits still running, e.g. a slow polynomial kernel. The best
+    candidate evaluated on every fold is refitted on the whole data; when
+    no candidate finished, the estimator is fitted with its default
+    parameters. ``budget_exhausted_`` tells whether candidates were
+    skipped. As in the scikit-learn searches, a candidate whose fit fails
+    on a fold is scored ``error_score`` there, or the error is raised if it
+    is "raise".
+
+    The fitted object exposes the same attributes as the scikit-learn
+    searches: ``best_estimator_``, ``best_params_``, ``best_score_``,
+    ``best_index_`` and ``cv_results_``, the latter only listing the
+    evaluated candidates.
+    """
+
+    def __init__(self,
+                 estimator,
+                 candidates: list[dict],
+                 deadline: float,
+                 cv=5,
+                 n_jobs: Optional[int] = None,
+                 error_score=np.nan):
+        self.estimator = estimator
+        self.candidates = candidates
+        self.deadline = deadline
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.error_score = error_score
+
+    def fit(self, X, y):
+        """
+        Evaluate the candidates until the deadline and refit the best one on
+        the whole data.
+
+        :param X: The training feature matrix.
+        :param y: The training target variable.
+        :return: The fitted search.
+        :rtype: BudgetedSearchCV
+        """
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        folds = list(cv.split(X, y))
+        pool = _DeadlinePool(self.estimator, X, y, self.n_jobs,
+                             self.error_score)
+        try:
+            trials, out = pool.evaluate_until(self.candidates, folds,
+                                              self.deadline)
+        finally:
+            pool.close()
+        self.budget_exhausted_ = len(trials) < len(self.candidates)
+        return _finish_search(self, X, y, trials, out, len(folds))
+
+
+def _finish_search(search, X, y, trials: list[dict], out: list, n_splits: int):
+    """
+    Select the best of the evaluated trials, build the ``cv_results_`` and
+    refit the best trial on the whole data.
+
+    :param search: The search to set the results of.
+    :param trials: The evaluated trials.
+    :param out: The score and fit time of every trial on every fold, trial
+        by trial.
+    :param n_splits: The number of folds.
+    :return: The fitted search.
+    """
+    out = np.asarray(out, dtype=float).reshape(len(trials), n_splits, 2)
+    scores = out[:, :, 0].mean(axis=1)
+    if trials and np.isnan(scores).all():
+        raise ValueError(f"All the {len(trials)} evaluated candidates failed "
+                         "to fit, see the FitFailedWarning messages")
+    if trials:
+        search.best_index_ = int(np.nanargmax(scores))
+        search.best_params_ = trials[search.best_index_]
+        search.best_score_ = float(scores[search.best_index_])
+    else:
+        search.best_index_ = None
+        search.best_params_ = {}
+        search.best_score_ = np.nan
+    search.cv_results_ = {
+        "params": trials,
+        "mean_test_score": scores,
+        "std_test_score": out[:, :, 0].std(axis=1),
+        "mean_fit_time": out[:, :, 1].mean(axis=1),
+        "rank_test_score": _rank(scores),
+    }
+    search.n_splits_ = n_splits
+    search.best_estimator_ = clone(
+        search.estimator).set_params(**search.best_params_)
+    search.best_estimator_.fit(X, y)
+    return search
+
+
+class _DeadlinePool:
+    """
+    The worker processes fitting the candidates of a budgeted search.
+
+    The estimator and the training data are sent to the workers once, when
+    the first candidates are evaluated, and the workers are reused by the
+    following calls of :py:meth:`evaluate_until`, e.g. the batches of a TPE
+    search. The fits run out of process so that the ones still running at
+    the deadline can be cancelled by terminating the workers, which a fit
+    in the calling process, e.g. in the C code of libsvm, would not allow.
+    """
+
+    def __init__(self, estimator, X, y, n_jobs: Optional[int], error_score):
+        self.estimator = estimator
+        self.X = X
+        self.y = y
+        self.n_jobs = n_jobs
+        self.error_score = error_score
+        self._pool = None
+        self._n_workers = 0
+
+    def evaluate_until(self, candidates: list[dict], folds: list,
+                       deadline: float) -> tuple:
+        """
+        Fit and score candidates on every fold until a deadline.
+
+        At most twice as many fits as workers are queued at a time, and the
+        workers are terminated at the deadline, cancelling the running fits.
+        A fit that fails is scored ``error_score``, see
+        :py:func:`_fit_and_score`.
+
+        :return: The candidates evaluated on every fold, in the given order,
+            and their score and fit time on every fold.
+        :rtype: tuple[list[dict], list]
+        """
+        tasks = [(params, train, test) for params in candidates
+                 for train, test in folds]
+        results = [None] * len(tasks)
+        if tasks and time.time() < deadline:
+            if self._pool is None:
+                self._n_workers = min(effective_n_jobs(self.n_jobs),
+                                      len(tasks))
+                self._pool = multiprocessing.get_context().Pool(
+                    self._n_workers,
+                    initializer=_init_worker,
+                    initargs=(self.estimator, self.X, self.y,
+                              self.error_score))
+            done = queue.SimpleQueue()
+            n_issued = n_finished = 0
+            while n_finished < len(tasks):
+                while (n_issued < len(tasks)
+                       and n_issued - n_finished < 2 * self._n_workers
+                       and time.time() < deadline):
+                    self._pool.apply_async(_run_task,
+                                           (n_issued, *tasks[n_issued]),
+                                           callback=done.put,
+                                           error_callback=done.put)
+                    n_issued += 1
+                try:
+                    result = done.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    # the deadline passed, cancel the running fits
+                    self.close()
+                    break
+                if isinstance(result, BaseException):
+                    self.close()
+                    raise result
+                index, score, fit_time = result
+                results[index] = (score, fit_time)
+                n_finished += 1
+
+        n_splits = len(folds)
+        evaluated, out = [], []
+        for i, params in enumerate(candidates):
+            fold_results = results[i * n_splits:(i + 1) * n_splits]
+            if None not in fold_results:
+                evaluated.append(params)
+                out.extend(fold_results)
+        return evaluated, out
+
+    def close(self):
+        """
+        Terminate the workers, cancelling the fits still running.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
+# The estimator and the training data of a worker process of a
+# :py:class:`_DeadlinePool`, sent once instead of with every task
+_worker_state = {}
+
+
+def _init_worker(estimator, X, y, error_score):
+    _worker_state.update(estimator=estimator,
+                         X=X,
+                         y=y,
+                         error_score=error_score)
+
+
+def _run_task(index: int, params: dict, train, test) -> tuple:
+    score, fit_time = _fit_and_score(clone(_worker_state["estimator"]),
+                                     _worker_state["X"], _worker_state["y"],
+                                     train, test, params,
+                                     _worker_state["error_score"])
+    return index, score, fit_time
+
+
+def _fit_and_score(estimator, X, y, train, test, params, error_score=np.nan):
+    """
+    Fit an estimator on one fold and score it on the held-out part.
+
+    When the fit or the scoring fails, a FitFailedWarning is issued and the
+    fold is scored ``error_score``, unless it is "raise".
+
+    :return: The score and the fit time in seconds.
+    :rtype: tuple[float, float]
+    """
+    start = time.perf_counter()
+    try:
+        estimator.set_params(**params)
+        estimator.fit(X[train], y[train])
+        fit_time = time.perf_counter() - start
+        return estimator.score(X[test], y[test]), fit_time
+    except Exception as error:
+        if error_score == "raise":
+            raise
+        warnings.warn(
+            f"Fitting the candidate {params} failed, it is scored "
+            f"{error_score}: {error!r}", FitFailedWarning)
+        return error_score, time.perf_counter() - start
+
+
+def _describe_params(params: dict) -> str:
+    """
+    Identify the values of a candidate.
+    """
+    return repr(sorted(params.items()))
+
+
+def _find_param(param_grid, name: str) -> Optional[str]:
+    """
+    Find a hyperparameter in a grid or a list of grids, either by name or
+    nested in an estimator as ``<estimator>__<name>``.
+    """
+    grids = param_grid if isinstance(param_grid, list) else [param_grid]
+    for key in itertools.chain.from_iterable(grids):
+        if key == name or key.endswith(f"__{name}"):
+            return key
+    return None
+
+
+def _rank(scores: np.ndarray) -> np.ndarray:
+    """
+    Rank the scores from best to worst, ties sharing the lowest rank.
+    """
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.int32)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    for i in range(1, len(order)):
+        if scores[order[i]] == scores[order[i - 1]]:
+            ranks[order[i]] = ranks[order[i - 1]]
+    return ranks
+
+
+def _parzen(observations, low, high):
+    """
+    Build an adaptive Parzen estimator made of a uniform prior and one
+    Gaussian per observation, whose width is the distance to the farthest
+    neighbouring observation.
+
+    :return: The means, standard deviations and weights of the mixture, the
+        prior being the first component.
+    """
+    mus = np.sort(np.asarray(observations, dtype=float))
+    width = high - low
+    if len(mus):
+        neighbours = np.concatenate(([low], mus, [high]))
+        sigmas = np.maximum(mus - neighbours[:-2], neighbours[2:] - mus)
+        sigmas = np.clip(sigmas, width / min(100.0, 1.0 + len(mus)), width)
+    else:
+        sigmas = np.empty(0)
+    mus = np.concatenate(([(low + high) / 2], mus))
+    sigmas = np.concatenate(([width], sigmas))
+    weights = np.full(len(mus), 1.0 / len(mus))
+    return mus, sigmas, weights
+
+
+def _parzen_log_pdf(x, mus, sigmas, weights, low, high):
+    """
+    Evaluate the log density of a Parzen estimator built by
+    :py:func:`_parzen`.
+    """
+    z = (x[:, None] - mus[None, :]) / sigmas[None, :]
+    pdf = np.exp(-0.5 * z**2) / (sigmas[None, :] * math.sqrt(2 * math.pi))
+    # the first component is the uniform prior
+    pdf[:, 0] = 1.0 / (high - low)
+    return np.log(pdf @ weights + 1e-300)
+
+
+def _numerical_tpe(dimension, good, bad, n_candidates, rng):
+    """
+    Sample candidates from the good Parzen estimator of a numerical
+    dimension and score them with the log density ratio.
+
+    :return: The candidates in the search space and their log ratios.
+    """
+    low, high = dimension.bounds
+    good_params = _parzen(good, low, high)
+    bad_params = _parzen(bad, low, high)
+
+    mus, sigmas, weights = good_params
+    components = rng.choice(len(mus), size=n_candidates, p=weights)
+    samples = np.where(components == 0, rng.uniform(low, high, n_candidates),
+                       rng.normal(mus[components], sigmas[components]))
+    samples = np.clip(samples, low, high)
+    log_ratio = (_parzen_log_pdf(samples, *good_params, low, high) -
+                 _parzen_log_pdf(samples, *bad_params, low, high))
+    return samples, log_ratio
+
+
+def _categorical_tpe(dimension, good, bad, n_candidates, rng):
+    """
+    Sample candidates from the smoothed choice frequencies of the good
+    trials of a categorical dimension and score them with the log
+    probability ratio.
+
+    :return: The indices of the candidates and their log ratios.
+    """
+    n_choices = len(dimension.choices)
+
+    def probabilities(values):
+        counts = np.ones(n_choices)
+        for value in values:
+            counts[dimension.choices.index(value)] += 1
+        return counts / counts.sum()
+
+    p_good, p_bad = probabilities(good), probabilities(bad)
+    samples = rng.choice(n_choices, size=n_candidates, p=p_good)
+    return samples, np.log(p_good[samples]) - np.log(p_bad[samples])
+
+
+@SearchStrategyFactory.register("grid")
+class GridSearchStrategy(SearchStrategy):
+    """
+    An exhaustive search over every combination of the parameter grid.
+    """
+
+    def create_search(self, model, param_grid, cv, n_jobs, pre_dispatch):
+        """
+        Create an exhaustive grid search.
+
+        :return: The unfitted grid search.
+        :rtype: sklearn.model_selection.GridSearchCV
+        """
+        if isinstance(param_grid, SearchSpace):
+            param_grid = param_grid.to_param_grid()
+        return GridSearchCV(model,
+                            param_grid,
+                            cv=cv,
+                            n_jobs=n_jobs,
+                            pre_dispatch=pre_dispatch)
+
+
+@SearchStrategyFactory.register("random")
+class RandomSearchStrategy(SearchStrategy):
+    """
+    A randomized search that evaluates a fixed budget of candidates
+    sampled from the parameter grid.
+    """
+
+    def __init__(self, n_iter: int = 10, random_state: int = 0):
+        """
+        Initialize the RandomSearchStrategy.
+
+        :param n_iter: The number of sampled candidates.
+        :type n_iter: int, optional
+        :param random_state: A controller for the sampling of the candidates.
+        :type random_state: int, optional
+        :raises ValueError: If n_iter is smaller than 1.
+        """
+        super().__init__(random_state)
+        if n_iter < 1:
+            raise ValueError("n_iter must be at least 1")
+        self.n_iter = n_iter
+
+    def create_search(self, model, param_grid, cv, n_jobs, pre_dispatch):
+        """
+        Create a randomized search.
+
+        Continuous and integer dimensions of a search space are sampled
+        from their distributions.
+
+        :return: The unfitted randomized search.
+        :rtype: sklearn.model_selection.RandomizedSearchCV
+        """
+        if isinstance(param_grid, SearchSpace):
+            param_grid = param_grid.to_distributions()
+        return RandomizedSearchCV(model,
+                                  param_grid,
+                                  n_iter=self.n_iter,
+                                  cv=cv,
+                                  n_jobs=n_jobs,
+                                  pre_dispatch=pre_dispatch,
+                                  random_state=self.random_state)
+
+
+@SearchStrategyFactory.register("halving")
+class HalvingSearchStrategy(SearchStrategy):
+    """
+    A successive halving search.
+
+    All candidates are first evaluated with a small amount of resources,
+    and only the best ``1 / factor`` of them are evaluated again with
+    ``factor`` times more resources. The resource is either the number of
+    training samples or, for ensembles, the number of estimators.
+    """
+
+    def __init__(self,
+                 factor: int = 3,
+                 resource: str = "auto",
+                 random_state: int = 0):
+        """
+        Initialize the HalvingSearchStrategy.
+
+        :param factor: The proportion of candidates kept at each iteration.
+        :type factor: int, optional
+        :param resource: The resource that grows with each iteration, either
+            "n_samples", "n_estimators" or "auto". "auto" uses
+            "n_estimators" when it is part of the parameter grid and
+            "n_samples" otherwise.
+        :type resource: str, optional
+        :param random_state: A controller for the subsampling of the samples.
+        :type random_state: int, optional
+        :raises ValueError: If factor is smaller than 2.
+        """
+        super().__init__(random_state)
+        if factor < 2:
+            raise ValueError("factor must be at least 2")
+        self.factor = factor
+        self.resource = resource
+
+    def create_search(self, model, param_grid, cv, n_jobs, pre_dispatch):
+        """
+        Create a successive halving search.
+
+        When the resource is a hyperparameter, its values are removed from
+        the grid and used as the bounds of the resource instead.
+
+        :return: The unfitted successive halving search.
+        :rtype: sklearn.model_selection.HalvingGridSearchCV
+        """
+        if isinstance(param_grid, SearchSpace):
+            param_grid = param_grid.to_param_grid()
+        resource = self.resource
+        if resource == "auto":
+            resource = ("n_estimators" if _find_param(
+                param_grid, "n_estimators") else "n_samples")
+
+        if resource == "n_samples":
+            min_resources, max_resources = "exhaust", "auto"
+        else:
+            # the model may be nested, e.g. behind the preprocessing
+            resource = _find_param(param_grid, resource) or resource
+            grids = param_grid if isinstance(param_grid,
+                                             list) else [param_grid]
+            values, remaining = [], []
+            for grid in grids:
+                grid = dict(grid)
+                values.extend(grid.pop(resource, None) or [])
+                if grid not in remaining:
+                    remaining.append(grid)
+            param_grid = (remaining
+                          if isinstance(param_grid, list) else remaining[0])
+            if not values:
+                raise ValueError(
+                    f"resource '{resource}' is not part of the parameter grid")
+            min_resources, max_resources = min(values), max(values)
+
+        return HalvingGridSearchCV(model,
+                                   param_grid,
+                                   factor=self.factor,
+                                   resource=resource,
+                                   min_resources=min_resources,
+                                   max_resources=max_resources,
+                                   cv=cv,
+                                   n_jobs=n_jobs,
+                                   return_train_score=False,
+                                   random_state=self.random_state)
+
+
+@SearchStrategyFactory.register("tpe")
+class TPESearchStrategy(SearchStrategy):
+    """
+    An adaptive search that spends a fixed budget of trials where the
+    previous trials scored best, see :py:class:`TPESearchCV`.
+    """
+
+    def __init__(self,
+                 n_trials: int = 30,
+                 n_startup_trials: int = 10,
+                 batch_size: Optional[int] = None,
+                 gamma: float = 0.25,
+                 n_ei_candidates: int = 24,
+                 random_state: int = 0):
+        """
+        Initialize the TPESearchStrategy.
+
+        :param n_trials: The total number of evaluated trials.
+        :type n_trials: int, optional
+        :param n_startup_trials: The number of random trials evaluated
+            before the Parzen estimators are used.
+        :type n_startup_trials: int, optional
+        :param batch_size: The number of trials proposed and evaluated in
+            parallel, defaults to the number of jobs.
+        :type batch_size: int, optional
+        :param gamma: The fraction of trials considered good.
+        :type gamma: float, optional
+        :param n_ei_candidates: The number of candidates sampled to propose
+            one trial.
+        :type n_ei_candidates: int, optional
+        :param random_state: A controller for the sampling of the trials.
+        :type random_state: int, optional
+        :raises ValueError: If n_trials is smaller than 1 or gamma is not
+            within the range (0, 1).
+        """
+        super().__init__(random_state)
+        if n_trials < 1:
+            raise ValueError("n_trials must be at least 1")
+        if not 0 < gamma < 1:
+            raise ValueError("gamma must be between 0 and 1")
+        self.n_trials = n_trials
+        self.n_startup_trials = n_startup_trials
+        self.batch_size = batch_size
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+
+    def create_search(self, model, param_grid, cv, n_jobs, pre_dispatch):
+        """
+        Create a TPE search.
+
+        :return: The unfitted TPE search.
+        :rtype: TPESearchCV
+        """
+        return TPESearchCV(model,
+                           SearchSpace.from_param_grid(param_grid),
+                           n_trials=self.n_trials,
+                           n_startup_trials=self.n_startup_trials,
+                           batch_size=self.batch_size,
+                           gamma=self.gamma,
+                           n_ei_candidates=self.n_ei_candidates,
+                           cv=cv,
+                           n_jobs=n_jobs,
+                           pre_dispatch=pre_dispatch,
+                           random_state=self.random_state)
 
 
 class SKLearnHyperparameterTuner:
@@ -9,24 +1108,308 @@ class SKLearnHyperparameterTuner:
 
     """
 
-    def __init__(self, dataset: SplitterDataset):
+    # The prefix of the model parameters behind the preprocessing
+    PREFIX = "estimator__"
+
+    def __init__(self,
+                 dataset: SplitterDataset,
+                 n_jobs: Optional[int] = None,
+                 backend: Optional[str] = None,
+                 pre_dispatch: str = "2*n_jobs",
+                 cv: Optional[int] = None,
+                 strategy: str = "grid",
+                 strategy_options: Optional[dict] = None,
+                 search_space: Optional[dict] = None,
+                 cache: Optional[TuningCache] = None,
+                 schedule: str = "lpt",
+                 cost_history: Optional[str] = None,
+                 time_budget: Optional[float] = None,
+                 deadline: Optional[float] = None):
         """
         Initialize the HyperparameterTuner.
 
         :param dataset: The dataset object used for training and testing the model.
         :type dataset: SplitterDataset
+        :param n_jobs: The number of jobs used to evaluate the candidates,
+            ``-1`` uses all processors and ``None`` runs on a single core.
+        :type n_jobs: int, optional
+        :param backend: The joblib backend used to run the jobs, one of
+            "loky", "threading" or "multiprocessing". ``None`` keeps the
+            joblib default.
+        :type backend: str, optional
+        :param pre_dispatch: The number of jobs dispatched ahead of time.
+        :type pre_dispatch: str or int, optional
+        :param cv: The number of cross-validation folds. By default the folds
+            precomputed by the splitter of the dataset are used, or 5 folds
+            if the splitter has none.
+        :type cv: int, optional
+        :param strategy: The codename of the search strategy, e.g. "grid",
+            "random", "halving" or "tpe".
+        :type strategy: str, optional
+        :param strategy_options: Keyword arguments for the search strategy.
+        :type strategy_options: dict, optional
+        :param search_space: A search space declaration, see
+            :py:meth:`SearchSpace.from_config`, searched instead of the
+            parameter grid of the classifier.
+        :type search_space: dict, optional
+        :param cache: A cache of earlier tuning results. When the same data,
+            model and search were tuned before, the stored results are
+            reused instead of running the search again.
+        :type cache: TuningCache, optional
+        :param schedule: The order parallel grid searches dispatch their
+            candidates in, "lpt" for the most expensive first according to
+            the cost model, see
+            :py:class:`~simpleclassifier.scheduler.LPTGridSearchCV`, or
+            "fifo" for the grid order.
+        :type schedule: str, optional
+        :param cost_history: A JSON file the fit times of the searched
+            candidates are recorded in, so later runs estimate the cost of
+            their candidates from them.
+        :type cost_history: str, optional
+        :param time_budget: The wall-clock seconds a tuning may take. When
+            they run out, no more candidates are evaluated, the running fits
+            are cancelled and the best candidate evaluated so far is used.
+            The fits of a budgeted search run out of process, in ``n_jobs``
+            worker processes of its own, at least one, which receive a copy
+            of the training data.
+        :type time_budget: float, optional
+        :param deadline: A :py:func:`time.time` timestamp after which no
+            tuning may run, e.g. the end of the budget of the whole run.
+        :type deadline: float, optional
+        :raises ValueError: If the backend, the strategy or the schedule is
+            unknown, cv is smaller than 2, the time budget is not positive, a
+            budget is given to the halving strategy or combined with a
+            backend.
         """
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}. Please provide one "
+                             f"of the following: {', '.join(BACKENDS)}.")
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Invalid schedule: {schedule}. Please provide "
+                             f"one of the following: {', '.join(SCHEDULES)}.")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        if backend is not None and (time_budget is not None
+                                    or deadline is not None):
+            raise ValueError("A time budget runs the fits in worker processes "
+                             "of its own and cannot be combined with a "
+                             "backend")
+        if cv is None:
+            cv = getattr(dataset, "cv_folds", None) or 5
+        elif cv < 2:
+            raise ValueError("cv must be at least 2")
+
         self.dataset = dataset
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.pre_dispatch = pre_dispatch
+        self.cv = cv
+        self.strategy = SearchStrategyFactory.create_instance(
+            strategy, **(strategy_options or {}))
+        if ((time_budget is not None or deadline is not None)
+                and isinstance(self.strategy, HalvingSearchStrategy)):
+            raise ValueError("The halving strategy cannot be stopped by a "
+                             "time budget, use grid, random or tpe")
+        self.search_space = (SearchSpace.from_config(search_space)
+                             if search_space else None)
+        self.cache = cache
+        self.schedule = schedule
+        self.cost_model = CostModel(cost_history)
+        self.time_budget = time_budget
+        self.deadline = deadline
+        self.search_ = None
+        self.best_params_ = None
+        self.cv_results_ = None
+        self.cache_hit_ = False
+        self.budget_exhausted_ = False
+        self.tune_time_ = None
+        self._stop_at = None
 
     def tune_model(self, model, param_grid):
         """
-        Tune the hyperparameters of a model using grid search.
+        Tune the hyperparameters of a model using the search strategy.
+
+        The fitted search object is kept in ``search_``, and the best
+        hyperparameters and the cross-validation results in
+        ``best_params_`` and ``cv_results_``. With a cache, a repeated
+        search is skipped and ``cache_hit_`` is set. The wall time of the
+        tuning in seconds is kept in ``tune_time_``, and
+        ``budget_exhausted_`` is set when the time budget or the deadline
+        stopped the search early.
 
         :param model: The model to tune.
-        :param param_grid: Dictionary specifying the hyperparameters to search.
+        :param param_grid: Dictionary specifying the hyperparameters to search,
+            ignored when the tuner has a search space.
         :type param_grid: dict
-        :return: The best estimator found by grid search.
+        :return: The best estimator found by the search.
+        """
+        start = time.perf_counter()
+        deadlines = [self.deadline] if self.deadline is not None else []
+        if self.time_budget is not None:
+            deadlines.append(time.time() + self.time_budget)
+        self._stop_at = min(deadlines) if deadlines else None
+        best_estimator = self._tune_model(model, param_grid)
+        self.tune_time_ = time.perf_counter() - start
+        return best_estimator
+
+    def _tune_model(self, model, param_grid):
+        """
+        Run the search or load its result from the cache.
         """
-        grid_search = GridSearchCV(model, param_grid)
-        grid_search.fit(self.dataset.X_train, self.dataset.y_train)
-        return grid_search.best_estimator_
+        if self.search_space is not None:
+            param_grid = self.search_space
+        X, y = self.dataset.X_train, self.dataset.y_train
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_tuning_key(X, y, model,
+                                             self._describe_search(param_grid))
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache_hit_ = True
+                self.best_params_ = entry["best_params"]
+                self.cv_results_ = entry["cv_results"]
+                if entry["estimator"] is not None:
+                    return entry["estimator"]
+                model = clone(model).set_params(**self.best_params_)
+                if self.dataset.preprocessing is None:
+                    return model.fit(X, y)
+                _, Xt = self.dataset.preprocessing.fit_transform()
+                return self.dataset.preprocessing.make_pipeline(
+                    model.fit(Xt, y))
+
+        preprocessing = self.dataset.preprocessing
+        if preprocessing is not None:
+            return self._tune_preprocessed(model, param_grid, preprocessing,
+                                           key)
+
+        search = self._fit_search(model, param_grid, X, y)
+        self.best_params_ = search.best_params_
+        self.cv_results_ = search.cv_results_
+
+        # the result of a search stopped early is not worth reusing
+        if key is not None and not self.budget_exhausted_:
+            self.cache.put(key, self.best_params_, self.cv_results_,
+                           search.best_estimator_)
+        return search.best_estimator_
+
+    def _tune_preprocessed(self, model, param_grid, preprocessing, key):
+        """
+        Search a model behind the memoized preprocessing of the dataset.
+
+        The search runs on row indices, so the preprocessing of each fold is
+        fitted once and shared by every candidate, see
+        :py:class:`~simpleclassifier.preprocessing.PreprocessedEstimator`.
+
+        :return: A pipeline of the preprocessing and the best estimator.
+        :rtype: sklearn.pipeline.Pipeline
+        """
+        from simpleclassifier.preprocessing import (PreprocessedEstimator,
+                                                    prefix_params, row_indices)
+
+        y = self.dataset.y_train
+        search = self._fit_search(PreprocessedEstimator(model, preprocessing),
+                                  prefix_params(param_grid, self.PREFIX),
+                                  row_indices(len(y)), y)
+        self.best_params_ = _strip_prefix(search.best_params_, self.PREFIX)
+        self.cv_results_ = {
+            name.replace(f"param_{self.PREFIX}", "param_"): values
+            for name, values in search.cv_results_.items()
+        }
+        self.cv_results_["params"] = [
+            _strip_prefix(params, self.PREFIX)
+            for params in search.cv_results_["params"]
+        ]
+
+        best_estimator = preprocessing.make_pipeline(
+            search.best_estimator_.estimator_)
+        if key is not None and not self.budget_exhausted_:
+            self.cache.put(key, self.best_params_, self.cv_results_,
+                           best_estimator)
+        return best_estimator
+
+    def _fit_search(self, model, param_grid, X, y):
+        """
+        Create the search of the strategy and fit it with the backend.
+
+        :return: The fitted search, also kept in ``search_``.
+        """
+        search = self.strategy.create_search(model, param_grid, self.cv,
+                                             self.n_jobs, self.pre_dispatch)
+        if self._stop_at is not None:
+            search = self._budget(search)
+        if self.backend is None:
+            search = self._schedule(search)
+            search.fit(X, y)
+        else:
+            with parallel_backend(self.backend):
+                search = self._schedule(search)
+                search.fit(X, y)
+        if self.cost_model.path is not None:
+            n_samples, n_features = search_shape(model, X)
+            n_splits = search.n_splits_
+            self.cost_model.record_search(
+                model, search.cv_results_,
+                n_samples * (n_splits - 1) / n_splits, n_features)
+            self.cost_model.save()
+        self.budget_exhausted_ = getattr(search, "budget_exhausted_", False)
+        self.search_ = search
+        return search
+
+    def _budget(self, search):
+        """
+        Bound a search by the deadline of the tuning. The candidates of grid
+        and randomized searches are drawn as the scikit-learn searches do
+        and evaluated by a :py:class:`BudgetedSearchCV`.
+        """
+        if isinstance(search, TPESearchCV):
+            search.deadline = self._stop_at
+            return search
+        if isinstance(search, RandomizedSearchCV):
+            candidates = ParameterSampler(search.param_distributions,
+                                          search.n_iter,
+                                          random_state=search.random_state)
+        else:
+            candidates = ParameterGrid(search.param_grid)
+        return BudgetedSearchCV(search.estimator,
+                                list(candidates),
+                                self._stop_at,
+                                cv=search.cv,
+                                n_jobs=search.n_jobs,
+                                error_score=search.error_score)
+
+    def _schedule(self, search):
+        """
+        Dispatch the candidates of a parallel grid search longest first.
+        Other searches choose their candidates as they go and keep their
+        order.
+        """
+        if (self.schedule != "lpt" or type(search) is not GridSearchCV
+                or effective_n_jobs(search.n_jobs) < 2):
+            return search
+        return LPTGridSearchCV(cost_model=self.cost_model,
+                               **search.get_params(deep=False))
+
+    def _describe_search(self, param_grid) -> str:
+        """
+        Describe the parameter grid and the search settings that change the
+        outcome of the search, used as part of the cache key.
+        """
+        strategy = self.strategy
+        cv = self.cv
+        if not isinstance(cv, int):
+            # the repr of long index arrays is truncated, so hash the folds
+            cv = fingerprint(*itertools.chain.from_iterable(cv))
+        return repr(
+            (param_grid, cv, type(strategy).__name__,
+             sorted(vars(strategy).items()), self.dataset.preprocessing))
+
+
+def _strip_prefix(params: dict, prefix: str) -> dict:
+    """
+    Remove a prefix from the parameter names of a candidate.
+    """
+    return {
+        name[len(prefix):] if name.startswith(prefix) else name: value
+        for name, value in params.items()
+    }
@@ -0,0 +1,225 @@
+from typing import Callable
+
+import numpy as np
+
+METRICS: dict[str, Callable[[np.ndarray], float]] = {}
+
+# Integer labels below this bound are counted directly instead of sorted
+_MAX_DIRECT_LABEL = 1 << 16
+
+
+def register_metric(name: str):
+    """
+    Decorator to register a metric computed from a confusion matrix.
+
+    The metric is a function that takes the confusion matrix, with the true
+    labels as rows and the predicted labels as columns, and returns a score.
+
+    :param name: The codename of the metric.
+    :type name: str
+    :return: The decorator function.
+    :rtype: Callable
+    """
+
+    def decorator(function):
+        METRICS[name] = function
+        return function
+
+    return decorator
+
+
+def get_registered_metrics() -> list[str]:
+    """
+    Get the codenames of all the registered metrics.
+
+    :return: The codenames of the metrics.
+    :rtype: list[str]
+    """
+    return list(METRICS)
+
+
+def confusion_matrix(y_true, y_pred) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build the confusion matrix of a prediction in a single pass.
+
+    The labels are the union of the true and predicted labels. Small
+    non-negative integer labels are counted directly, other labels are
+    encoded first.
+
+    :param y_true: The true labels.
+    :type y_true: np.ndarray
+    :param y_pred: The predicted labels.
+    :type y_pred: np.ndarray
+    :return: The confusion matrix and the sorted labels.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    y_true = np.asarray(y_true).ravel()
+    y_pred = np.asarray(y_pred).ravel()
+    if y_true.shape != y_pred.shape:
+        raise ValueError(
+            f"y_true and y_pred have different lengths: {len(y_true)} "
+            f"and {len(y_pred)}")
+
+    if (y_true.dtype.kind in "iub" and y_pred.dtype.kind in "iub"
+            and len(y_true) > 0 and min(y_true.min(), y_pred.min()) >= 0
+            and max(y_true.max(), y_pred.max()) < _MAX_DIRECT_LABEL):
+        y_true = y_true.astype(np.intp, copy=False)
+        y_pred = y_pred.astype(np.intp, copy=False)
+        n_values = int(max(y_true.max(), y_pred.max())) + 1
+        present = ((np.bincount(y_true, minlength=n_values) > 0) |
+                   (np.bincount(y_pred, minlength=n_values) > 0))
+        labels = np.flatnonzero(present)
+        codes = np.cumsum(present) - 1
+        true_codes, pred_codes = codes[y_true], codes[y_pred]
+    else:
+        labels, inverse = np.unique(np.concatenate([y_true, y_pred]),
+                                    return_inverse=True)
+        true_codes, pred_codes = inverse[:len(y_true)], inverse[len(y_true):]
+
+    n_labels = len(labels)
+    matrix = np.bincount(true_codes * n_labels + pred_codes,
+                         minlength=n_labels * n_labels)
+    return matrix.reshape(n_labels, n_labels), labels
+
+
+def _divide(numerator, denominator) -> np.ndarray:
+    """
+    Divide element-wise, returning 0 where the denominator is 0.
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _per_class(matrix: np.ndarray):
+    """
+    Return the per-class precision, recall and F1 score and the support.
+    """
+    true_positives = np.diag(matrix)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    precision = _divide(true_positives, predicted)
+    recall = _divide(true_positives, support)
+    f1 = _divide(2 * true_positives, support + predicted)
+    return precision, recall, f1, support
+
+
+def _weighted(scores: np.ndarray, support: np.ndarray) -> float:
+    """
+    Average per-class scores weighted by the support of each class.
+    """
+    return float(_divide(np.dot(scores, support), support.sum()))
+
+
+@register_metric("accuracy")
+def accuracy(matrix: np.ndarray) -> float:
+    """
+    The fraction of correctly predicted samples.
+    """
+    return float(_divide(np.trace(matrix), matrix.sum()))
+
+
+@register_metric("precision")
+def weighted_precision(matrix: np.ndarray) -> float:
+    """
+    The precision of each class, weighted by its support.
+    """
+    precision, _, _, support = _per_class(matrix)
+    return _weighted(precision, support)
+
+
+@register_metric("recall")
+def weighted_recall(matrix: np.ndarray) -> float:
+    """
+    The recall of each class, weighted by its support.
+    """
+    _, recall, _, support = _per_class(matrix)
+    return _weighted(recall, support)
+
+
+@register_metric("f1")
+def weighted_f1(matrix: np.ndarray) -> float:
+    """
+    The F1 score of each class, weighted by its support.
+    """
+    _, _, f1, support = _per_class(matrix)
+    return _weighted(f1, support)
+
+
+@register_metric("precision_macro")
+def macro_precision(matrix: np.ndarray) -> float:
+    """
+    The unweighted mean of the precision of each class.
+    """
+    return float(_per_class(matrix)[0].mean())
+
+
+@register_metric("recall_macro")
+def macro_recall(matrix: np.ndarray) -> float:
+    """
+    The unweighted mean of the recall of each class.
+    """
+    return float(_per_class(matrix)[1].mean())
+
+
+@register_metric("f1_macro")
+def macro_f1(matrix: np.ndarray) -> float:
+    """
+    The unweighted mean of the F1 score of each class.
+    """
+    return float(_per_class(matrix)[2].mean())
+
+
+@register_metric("precision_micro")
+def micro_precision(matrix: np.ndarray) -> float:
+    """
+    The precision computed from the total counts of all classes.
+    """
+    return float(_divide(np.trace(matrix), matrix.sum()))
+
+
+@register_metric("recall_micro")
+def micro_recall(matrix: np.ndarray) -> float:
+    """
+    The recall computed from the total counts of all classes.
+    """
+    return float(_divide(np.trace(matrix), matrix.sum()))
+
+
+@register_metric("f1_micro")
+def micro_f1(matrix: np.ndarray) -> float:
+    """
+    The F1 score computed from the total counts of all classes.
+    """
+    return float(_divide(np.trace(matrix), matrix.sum()))
+
+
+@register_metric("balanced_accuracy")
+def balanced_accuracy(matrix: np.ndarray) -> float:
+    """
+    The mean recall of the classes present in the true labels.
+    """
+    _, recall, _, support = _per_class(matrix)
+    if not support.any():
+        return 0.0
+    return float(recall[support > 0].mean())
+
+
+@register_metric("mcc")
+def matthews_corrcoef(matrix: np.ndarray) -> float:
+    """
+    The multiclass Matthews correlation coefficient.
+    """
+    matrix = matrix.astype(np.float64)
+    true_sum = matrix.sum(axis=1)
+    pred_sum = matrix.sum(axis=0)
+    n_correct = np.trace(matrix)
+    n_samples = matrix.sum()
+    cov_true_pred = n_correct * n_samples - np.dot(true_sum, pred_sum)
+    cov_pred_pred = n_samples**2 - np.dot(pred_sum, pred_sum)
+    cov_true_true = n_samples**2 - np.dot(true_sum, true_sum)
+    if cov_pred_pred * cov_true_true == 0:
+        return 0.0
+    return float(cov_true_pred / np.sqrt(cov_true_true * cov_pred_pred))
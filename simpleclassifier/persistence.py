@@ -0,0 +1,348 @@
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from typing import Optional
+
+import joblib
+import numpy as np
+
+from simpleclassifier.base import Classifier, SplitterDataset
+from simpleclassifier.cache import fingerprint
+
+
+class ModelStore:
+    """
+    A local directory of fitted classifiers and of the scaler of the dataset
+    they were trained on.
+
+    Every model is written with :py:func:`joblib.dump` without compression,
+    so its arrays, e.g. the training rows of k-nearest neighbors or the
+    support vectors of an SVM, are memory-mapped when the model is loaded.
+    Loading is then near-instant and the pages of a model are shared by
+    every process that loads it. The ``manifest.json`` file lists the
+    models with their fit and tuning times and identifies the dataset.
+    """
+
+    MANIFEST = "manifest.json"
+    SCALER = "scaler.joblib"
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: str):
+        """
+        Initialize the ModelStore.
+
+        :param directory: The model directory.
+        :type directory: str
+        """
+        self.directory = os.path.expanduser(directory)
+
+    @property
+    def manifest(self) -> dict:
+        """
+        The manifest of the stored models.
+
+        :rtype: dict
+        :raises FileNotFoundError: If no models were saved in the directory.
+        """
+        path = os.path.join(self.directory, self.MANIFEST)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No saved models found in "
+                                    f"'{self.directory}'")
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def save(self,
+             classifiers: list[Classifier],
+             dataset: Optional[SplitterDataset] = None):
+        """
+        Save fitted classifiers, replacing the models of the directory.
+
+        The models are written to a temporary directory first, so a reader
+        never sees a partially saved directory. Only an empty directory or
+        a directory holding nothing but saved models is replaced.
+
+        :param classifiers: The fitted classifiers.
+        :type classifiers: list[Classifier]
+        :param dataset: The dataset the classifiers were trained on, the
+            dataset of the first classifier by default.
+        :type dataset: SplitterDataset, optional
+        :raises FileExistsError: If the path holds anything but saved models,
+            which would be deleted by replacing it.
+        """
+        import sklearn
+
+        self._check_replaceable()
+        if dataset is None:
+            dataset = classifiers[0].dataset
+        parent = os.path.dirname(os.path.abspath(self.directory))
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=parent, prefix=".")
+        entries = []
+        for classifier in classifiers:
+            class_ = type(classifier)
+            name = class_.__name__
+            joblib.dump(classifier.model,
+                        os.path.join(tmp_path, name + ".joblib"))
+            tuner = getattr(classifier, "tuner", None)
+            entries.append({
+                "name": name,
+                "codename": _codename(class_),
+                "class": f"{class_.__module__}:{class_.__qualname__}",
+                "file": name + ".joblib",
+                "fit_time": getattr(classifier, "fit_time_", None),
+                "tune_time": getattr(classifier, "tune_time_", None),
+                "best_params": getattr(tuner, "best_params_", None),
+            })
+        joblib.dump({
+            "scaler": dataset.scaler,
+            "classes": dataset.classes_
+        }, os.path.join(tmp_path, self.SCALER))
+        manifest = {
+            "format": self.FORMAT_VERSION,
+            "sklearn": sklearn.__version__,
+            "dataset": _describe_dataset(dataset),
+            "classifiers": entries,
+        }
+        with open(os.path.join(tmp_path, self.MANIFEST), "w") as file:
+            # parameters such as numpy scalars are stored as text
+            json.dump(manifest, file, indent=4, default=str)
+            file.write("\n")
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        os.rename(tmp_path, self.directory)
+
+    def _check_replaceable(self):
+        """
+        Make sure that replacing the directory only deletes saved models.
+        """
+        if not os.path.exists(self.directory):
+            return
+        if not os.path.isdir(self.directory):
+            raise FileExistsError(f"'{self.directory}' is not a directory")
+        names = set(os.listdir(self.directory))
+        if not names:
+            return
+        owned = {self.MANIFEST, self.SCALER}
+        if self.MANIFEST in names:
+            owned.update(entry["file"]
+                         for entry in self.manifest.get("classifiers", []))
+        others = sorted(names - owned)
+        if self.MANIFEST not in names or others:
+            raise FileExistsError(
+                f"Refusing to replace '{self.directory}', it holds files that "
+                f"are not saved models: {others or sorted(names)}")
+
+    def load(self,
+             dataset: SplitterDataset,
+             names: Optional[list[str]] = None,
+             mmap_mode: Optional[str] = "r") -> list[Classifier]:
+        """
+        Load the saved classifiers onto a dataset without retraining them.
+
+        The ``fit_time_`` and ``tune_time_`` of the saved run are restored,
+        so the profiler reports the cost of the original training.
+
+        :param dataset: The dataset to profile the classifiers on, which
+            should be built from the same configuration as the saved one.
+        :type dataset: SplitterDataset
+        :param names: The codenames of the classifiers to load, all of them
+            by default.
+        :type names: list[str], optional
+        :param mmap_mode: The memory-map mode of the model arrays, None to
+            read them into memory.
+        :type mmap_mode: str, optional
+        :return: The fitted classifiers, in the saved order.
+        :rtype: list[Classifier]
+        :raises ValueError: If a requested classifier was not saved or the
+            dataset has a different number of features.
+        """
+        manifest = self._check_manifest()
+        saved = manifest["dataset"]
+        if dataset.X_train.shape[1] != saved["n_features"]:
+            raise ValueError(f"The models were trained on "
+                             f"{saved['n_features']} features, the dataset "
+                             f"has {dataset.X_train.shape[1]}")
+        if _describe_dataset(dataset) != saved:
+            warnings.warn("The dataset differs from the one the models were "
+                          "saved with, e.g. its split or dtype changed")
+        entries = self._select(manifest, names)
+        classifiers = []
+        for entry in entries:
+            module, qualname = entry["class"].split(":")
+            class_ = importlib.import_module(module)
+            for attribute in qualname.split("."):
+                class_ = getattr(class_, attribute)
+            classifier = class_(dataset=dataset)
+            classifier.model = joblib.load(os.path.join(
+                self.directory, entry["file"]),
+                                           mmap_mode=mmap_mode)
+            classifier.fit_time_ = entry["fit_time"]
+            classifier.tune_time_ = entry["tune_time"]
+            classifiers.append(classifier)
+        return classifiers
+
+    def predict(self,
+                X,
+                names: Optional[list[str]] = None,
+                batch_size: Optional[int] = None,
+                mmap_mode: Optional[str] = "r") -> dict:
+        """
+        Predict raw, unscaled feature rows with the saved models.
+
+        The rows are scaled by the saved scaler, in batches shared by every
+        model, and the predictions are mapped back to the original labels.
+        No dataset is loaded.
+
+        :param X: The feature matrix.
+        :type X: np.ndarray or scipy.sparse.spmatrix
+        :param names: The codenames of the classifiers to use, all of them
+            by default.
+        :type names: list[str], optional
+        :param batch_size: The number of rows scaled and predicted at once,
+            all rows by default.
+        :type batch_size: int, optional
+        :param mmap_mode: The memory-map mode of the model arrays, None to
+            read them into memory.
+        :type mmap_mode: str, optional
+        :return: The predicted labels keyed by classifier name.
+        :rtype: dict
+        :raises ValueError: If the number of features differs from the
+            training data.
+        """
+        n_features = self.manifest["dataset"]["n_features"]
+        if X.shape[1] != n_features:
+            raise ValueError(f"The models were trained on {n_features} "
+                             f"features, the input has {X.shape[1]}")
+        models = self.load_models(names, mmap_mode)
+        scaler, classes = self.load_scaler()
+        dtype = self.manifest["dataset"]["dtype"]
+
+        n_rows = X.shape[0]
+        batch_size = n_rows if batch_size is None else batch_size
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        predictions = {name: [] for name in models}
+        for start in range(0, n_rows, batch_size):
+            batch = X[start:start + batch_size].astype(dtype)
+            batch = scaler.transform(batch)
+            for name, model in models.items():
+                predictions[name].append(model.predict(batch))
+        results = {}
+        for name, batches in predictions.items():
+            y_pred = np.concatenate(batches) if batches else np.empty(0)
+            results[name] = y_pred if classes is None else classes[y_pred]
+        return results
+
+    def load_models(self,
+                    names: Optional[list[str]] = None,
+                    mmap_mode: Optional[str] = "r") -> dict:
+        """
+        Load the saved estimators, without the classifiers wrapping them.
+
+        :param names: The codenames of the classifiers to load, all of them
+            by default.
+        :type names: list[str], optional
+        :param mmap_mode: The memory-map mode of the model arrays, None to
+            read them into memory.
+        :type mmap_mode: str, optional
+        :return: The fitted estimators keyed by classifier name, in the saved
+            order.
+        :rtype: dict
+        """
+        entries = self._select(self._check_manifest(), names)
+        return {
+            entry["name"]:
+            joblib.load(os.path.join(self.directory, entry["file"]),
+                        mmap_mode=mmap_mode)
+            for entry in entries
+        }
+
+    def load_scaler(self) -> tuple:
+        """
+        Load the fitted scaler of the dataset and its original labels.
+
+        :return: The scaler and the ``classes_`` of the dataset, None when
+            its labels were not encoded.
+        :rtype: tuple
+        """
+        state = joblib.load(os.path.join(self.directory, self.SCALER))
+        return state["scaler"], state["classes"]
+
+    def _check_manifest(self) -> dict:
+        """
+        Read the manifest and warn when the models were saved with another
+        version of scikit-learn, whose pickles may not load correctly.
+        """
+        import sklearn
+
+        manifest = self.manifest
+        if manifest.get("format") != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported model directory format: "
+                             f"{manifest.get('format')}")
+        if manifest["sklearn"] != sklearn.__version__:
+            warnings.warn(f"The models were saved with scikit-learn "
+                          f"{manifest['sklearn']}, this is "
+                          f"{sklearn.__version__}")
+        return manifest
+
+    @staticmethod
+    def _select(manifest: dict, names: Optional[list[str]]) -> list[dict]:
+        """
+        Select the manifest entries of the given codenames, in saved order.
+        """
+        entries = manifest["classifiers"]
+        if not names:
+            return entries
+        saved = [entry["codename"] for entry in entries]
+        missing = [name for name in names if name not in saved]
+        if missing:
+            raise ValueError(f"No saved models for {missing}, the saved "
+                             f"classifiers are {saved}")
+        return [entry for entry in entries if entry["codename"] in names]
+
+
+def load_features(path: str, dtype=None):
+    """
+    Load the feature rows to predict from a ``.npy`` file, which is
+    memory-mapped, or from a CSV file of feature columns without a header.
+
+    :param path: The path of the file.
+    :type path: str
+    :param dtype: The type of the loaded CSV values, float64 by default.
+    :type dtype: str or np.dtype, optional
+    :return: The feature matrix, of shape (n_rows, n_features).
+    :rtype: np.ndarray
+    """
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.loadtxt(path, delimiter=",", ndmin=2, dtype=dtype or float)
+
+
+def _codename(classifier_class: type) -> Optional[str]:
+    """
+    Find the name a classifier class is registered under, if any.
+    """
+    from simpleclassifier.factory import ClassifierFactory
+
+    for name, class_ in ClassifierFactory.registry.items():
+        if class_ is classifier_class:
+            return name
+    return None
+
+
+def _describe_dataset(dataset: SplitterDataset) -> dict:
+    """
+    Identify a dataset and its split in the manifest. The labels are
+    fingerprinted instead of the features, which is cheap and still changes
+    with the rows of the split.
+    """
+    return {
+        "class": f"{type(dataset).__module__}:{type(dataset).__qualname__}",
+        "n_features": int(dataset.X_train.shape[1]),
+        "dtype": dataset.dtype.str,
+        "scaling": dataset.scaling,
+        "labels": fingerprint(dataset.y_train, dataset.y_test),
+    }
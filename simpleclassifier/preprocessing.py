@@ -0,0 +1,327 @@
+import importlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+
+from simpleclassifier.base import array_nbytes
+from simpleclassifier.cache import fingerprint
+
+# The transformers available as preprocessing steps, imported on first use
+TRANSFORMERS = {
+    "standard": "sklearn.preprocessing:StandardScaler",
+    "minmax": "sklearn.preprocessing:MinMaxScaler",
+    "impute": "sklearn.impute:SimpleImputer",
+    "pca": "sklearn.decomposition:PCA",
+    "truncated_svd": "sklearn.decomposition:TruncatedSVD",
+    "polynomial": "sklearn.preprocessing:PolynomialFeatures",
+    "select_k_best": "sklearn.feature_selection:SelectKBest",
+}
+
+
+def make_preprocessor(steps: list):
+    """
+    Build the preprocessing pipeline declared in the YAML configuration,
+    e.g. ``[impute, {pca: {n_components: 10}}]``.
+
+    :param steps: The codename of each transformer, optionally mapped to
+        its keyword arguments.
+    :type steps: list
+    :return: The unfitted pipeline.
+    :rtype: sklearn.pipeline.Pipeline
+    :raises ValueError: If a transformer is unknown.
+    """
+    from sklearn.pipeline import Pipeline
+
+    transformers = []
+    for step in steps:
+        name, options = (step, {}) if isinstance(step, str) else next(
+            iter(step.items()))
+        if name not in TRANSFORMERS:
+            raise ValueError(f"Invalid preprocessing step: {name}. Please "
+                             f"provide one of the following: "
+                             f"{', '.join(TRANSFORMERS)}.")
+        module, class_name = TRANSFORMERS[name].split(":")
+        transformer_class = getattr(importlib.import_module(module),
+                                    class_name)
+        transformers.append((name, transformer_class(**(options or {}))))
+    if not transformers:
+        raise ValueError("The preprocessing needs at least one step")
+    return Pipeline(transformers)
+
+
+class PreprocessingStage:
+    """
+    A preprocessing stage attached to a dataset, which memoizes the
+    transformers fitted on each set of training rows and the matrices they
+    transform.
+
+    Rows are identified by a fingerprint of their indices in ``X_train``,
+    so the transformer of a cross-validation fold is fitted once and reused
+    by every candidate of every classifier tuned on that fold. The memoized
+    matrices are kept under ``max_bytes`` by evicting the least recently
+    used ones.
+
+    The memo is shared by the threads of the process and by the copies
+    ``clone`` makes of an estimator, but worker processes start with an
+    empty memo of their own.
+    """
+
+    def __init__(self,
+                 dataset,
+                 preprocessor,
+                 max_bytes: Optional[int] = 512 * 2**20):
+        """
+        Initialize the PreprocessingStage.
+
+        :param dataset: The dataset whose training data is preprocessed.
+        :type dataset: SplitterDataset
+        :param preprocessor: The unfitted transformer or pipeline.
+        :param max_bytes: The maximum total size of the memoized matrices
+            in bytes, unbounded if None.
+        :type max_bytes: int, optional
+        """
+        self.dataset = dataset
+        self.preprocessor = preprocessor
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def fit_transform(self, rows: Optional[np.ndarray] = None):
+        """
+        Fit the preprocessor on training rows and transform them.
+
+        :param rows: The indices of the rows in ``X_train``, all the rows
+            if None.
+        :type rows: np.ndarray, optional
+        :return: The fitted preprocessor and the transformed rows.
+        :rtype: tuple
+        """
+        key = ("fit", self._rows_key(rows))
+        entry = self._get(key)
+        if entry is None:
+            X, y = self._take(rows), self._take(rows, self.dataset.y_train)
+            transformer = clone(self.preprocessor)
+            entry = (transformer, transformer.fit_transform(X, y))
+            self._put(key, entry, array_nbytes(entry[1]))
+            self._put(("fitted", key[1]), transformer, 0)
+        return entry
+
+    def fit(self, rows: Optional[np.ndarray] = None):
+        """
+        Fit the preprocessor on training rows without transforming them,
+        e.g. to transform them chunk by chunk.
+
+        :param rows: The indices of the rows in ``X_train``, all the rows
+            if None.
+        :type rows: np.ndarray, optional
+        :return: The fitted preprocessor.
+        """
+        key = ("fitted", self._rows_key(rows))
+        transformer = self._get(key)
+        if transformer is None:
+            X, y = self._take(rows), self._take(rows, self.dataset.y_train)
+            transformer = clone(self.preprocessor).fit(X, y)
+            self._put(key, transformer, 0)
+        return transformer
+
+    def transform(self,
+                  train_rows: Optional[np.ndarray],
+                  rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Transform training rows with the preprocessor fitted on other rows,
+        e.g. the validation rows of a fold.
+
+        :param train_rows: The rows the preprocessor was fitted on, all the
+            rows if None.
+        :type train_rows: np.ndarray, optional
+        :param rows: The rows to transform, all the rows if None.
+        :type rows: np.ndarray, optional
+        :return: The transformed rows.
+        :rtype: np.ndarray
+        """
+        train_key, rows_key = self._rows_key(train_rows), self._rows_key(rows)
+        transformer, Xt_train = self.fit_transform(train_rows)
+        if rows_key == train_key:
+            return Xt_train
+        key = ("transform", train_key, rows_key)
+        Xt = self._get(key)
+        if Xt is None:
+            Xt = transformer.transform(self._take(rows))
+            self._put(key, Xt, array_nbytes(Xt))
+        return Xt
+
+    def make_pipeline(self, estimator):
+        """
+        Chain the preprocessor fitted on all the training rows with an
+        estimator fitted on their transform, so that the pipeline predicts
+        raw feature matrices.
+
+        :param estimator: The fitted estimator.
+        :return: The fitted pipeline.
+        :rtype: sklearn.pipeline.Pipeline
+        """
+        from sklearn.pipeline import Pipeline
+
+        transformer = self.fit()
+        return Pipeline([("preprocessing", transformer), ("model", estimator)])
+
+    def _rows_key(self, rows: Optional[np.ndarray]) -> str:
+        """
+        Identify a set of rows, all the rows in order being "all".
+        """
+        if rows is None:
+            return "all"
+        n_rows = self.dataset.X_train.shape[0]
+        if len(rows) == n_rows and np.array_equal(rows, np.arange(n_rows)):
+            return "all"
+        return fingerprint(rows)
+
+    def _take(self, rows: Optional[np.ndarray], array=None) -> np.ndarray:
+        """
+        Select rows of the training features or of another array.
+        """
+        array = self.dataset.X_train if array is None else array
+        return array if rows is None else array[rows]
+
+    def _get(self, key):
+        """
+        Look up a memoized value and mark it as recently used.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value[0]
+
+    def _put(self, key, value, nbytes: int):
+        """
+        Memoize a value and evict the least recently used ones beyond
+        ``max_bytes``. Values larger than the cap are not memoized.
+        """
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.max_bytes is not None and self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def __repr__(self):
+        return f"PreprocessingStage({self.preprocessor!r})"
+
+    def __deepcopy__(self, memo):
+        # cloned estimators share the memo instead of copying it
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        state["nbytes"] = 0
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class PreprocessedEstimator(ClassifierMixin, BaseEstimator):
+    """
+    An estimator searched on row indices instead of features.
+
+    The search passes a column of row indices of ``X_train`` as the feature
+    matrix. The estimator looks up the preprocessor fitted on its training
+    rows in the shared :py:class:`PreprocessingStage`, so the search never
+    refits the preprocessing of a fold.
+    """
+
+    def __init__(self, estimator=None, preprocessing=None):
+        """
+        Initialize the PreprocessedEstimator.
+
+        :param estimator: The estimator fitted on the transformed rows.
+        :param preprocessing: The memoizing preprocessing stage.
+        :type preprocessing: PreprocessingStage
+        """
+        self.estimator = estimator
+        self.preprocessing = preprocessing
+
+    def fit(self, X, y):
+        """
+        Fit the estimator on the transform of the given rows.
+
+        :param X: The row indices, of shape (n_samples, 1).
+        :type X: np.ndarray
+        :param y: The target variable of the rows.
+        :type y: np.ndarray
+        :return: The fitted estimator.
+        :rtype: PreprocessedEstimator
+        """
+        self.train_rows_ = np.asarray(X)[:, 0]
+        _, Xt = self.preprocessing.fit_transform(self.train_rows_)
+        self.estimator_ = clone(self.estimator).fit(Xt, y)
+        self.classes_ = self.estimator_.classes_
+        return self
+
+    def predict(self, X):
+        """
+        Predict the labels of the given rows.
+
+        :param X: The row indices, of shape (n_samples, 1).
+        :type X: np.ndarray
+        :return: The predicted labels.
+        :rtype: np.ndarray
+        """
+        Xt = self.preprocessing.transform(self.train_rows_,
+                                          np.asarray(X)[:, 0])
+        return self.estimator_.predict(Xt)
+
+
+def row_indices(n_rows: int) -> np.ndarray:
+    """
+    Build the feature matrix of row indices searched by a
+    :py:class:`PreprocessedEstimator`.
+
+    :param n_rows: The number of training rows.
+    :type n_rows: int
+    :return: The row indices, of shape (n_rows, 1).
+    :rtype: np.ndarray
+    """
+    return np.arange(n_rows).reshape(-1, 1)
+
+
+def prefix_params(param_grid: Union[dict, list], prefix: str):
+    """
+    Prefix the parameter names of a grid, a list of grids or a search space.
+
+    :param param_grid: The parameter grid.
+    :type param_grid: dict or list or SearchSpace
+    :param prefix: The prefix, e.g. ``"estimator__"``.
+    :type prefix: str
+    :return: The prefixed grid, of the same type.
+    """
+    if isinstance(param_grid, list):
+        return [prefix_params(grid, prefix) for grid in param_grid]
+    if isinstance(param_grid, dict):
+        return {prefix + name: values for name, values in param_grid.items()}
+    conditions = {
+        prefix + name: {
+            prefix + parent: values
+            for parent, values in parents.items()
+        }
+        for name, parents in param_grid.conditions.items()
+    }
+    return type(param_grid)(prefix_params(param_grid.dimensions, prefix),
+                            conditions)
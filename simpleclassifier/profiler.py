@@ -1,21 +1,135 @@
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+import time
+import tracemalloc
+from typing import Optional
+
+import numpy as np
+from sklearn.base import clone
+
+from simpleclassifier.metrics import METRICS, confusion_matrix
+
+# The performance metrics and their units
+PERFORMANCE_METRICS = {
+    "fit_time": "s",
+    "tune_time": "s",
+    "fit_peak_memory": "MiB",
+    "predict_throughput": "rows/s",
+    "predict_peak_memory": "MiB",
+    "row_latency_p50": "ms",
+    "row_latency_p95": "ms",
+    "row_latency_p99": "ms",
+    "batch_latency_p50": "ms",
+    "batch_latency_p95": "ms",
+    "batch_latency_p99": "ms",
+}
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def measure_peak_memory(function, *args, **kwargs):
+    """
+    Call a function and measure the peak memory it allocates.
+
+    The memory is traced with :py:mod:`tracemalloc`, which sees the
+    allocations of Python and NumPy in the current process, but not those
+    of native threads of other libraries or of worker processes.
+
+    :param function: The function to call.
+    :type function: Callable
+    :return: The result of the function and its peak memory in bytes.
+    :rtype: tuple
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        result = function(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return result, max(peak, 0)
 
 
 class Profiler:
     """
     Profiler class to calculate various metrics for a given classifier.
 
-    This application deals with "accuracy", "precision", "recall", and "f1" metrics.
+    The quality metrics are derived from a single confusion matrix of the
+    prediction, see :py:data:`simpleclassifier.metrics.METRICS` for the
+    available ones. The performance metrics of :py:data:`PERFORMANCE_METRICS`
+    report the cost of training and predicting.
     """
 
-    def __init__(self, metrics: list[str]):
+    def __init__(self,
+                 metrics: list[str],
+                 batch_size: Optional[int] = None,
+                 n_jobs: Optional[int] = None,
+                 n_warmup: int = 1,
+                 n_repeats: int = 5,
+                 latency_rows: int = 100,
+                 latency_batch_size: int = 256,
+                 fold_metrics: bool = True):
         """
         Constructor for Profiler class.
 
         :param metrics: List of metrics to calculate.
         :type metrics: list[str]
+        :param batch_size: The number of test rows predicted at once, all
+            rows by default.
+        :type batch_size: int, optional
+        :param n_jobs: The number of threads predicting batches concurrently.
+        :type n_jobs: int, optional
+        :param n_warmup: The number of untimed runs before the timed ones.
+        :type n_warmup: int, optional
+        :param n_repeats: The number of timed runs of the throughput and
+            latency measurements.
+        :type n_repeats: int, optional
+        :param latency_rows: The number of test rows predicted one by one to
+            measure the per-row latency.
+        :type latency_rows: int, optional
+        :param latency_batch_size: The number of rows of the batches used to
+            measure the per-batch latency.
+        :type latency_batch_size: int, optional
+        :param fold_metrics: Whether the quality metrics are also reported
+            for every cross-validation fold of the dataset, with their mean
+            and standard deviation. The tuned model is refitted on each fold.
+        :type fold_metrics: bool, optional
+        :raises ValueError: If a metric is not registered or an option is
+            out of range.
         """
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        available = list(METRICS) + list(PERFORMANCE_METRICS)
+        unknown = [
+            metric for metric in metrics or [] if metric not in available
+        ]
+        if unknown:
+            raise ValueError(f"Invalid metrics {unknown}, "
+                             f"the available metrics are {available}")
+        if n_warmup < 0 or n_repeats < 1:
+            raise ValueError("n_warmup must be at least 0 and n_repeats "
+                             "at least 1")
+        if latency_rows < 1 or latency_batch_size < 1:
+            raise ValueError("latency_rows and latency_batch_size must be "
+                             "at least 1")
         self.metrics = metrics
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.n_warmup = n_warmup
+        self.n_repeats = n_repeats
+        self.latency_rows = latency_rows
+        self.latency_batch_size = latency_batch_size
+        self.fold_metrics = fold_metrics
+
+    @property
+    def trace_fit_memory(self) -> bool:
+        """
+        Whether the peak memory of the fit has to be traced.
+
+        :rtype: bool
+        """
+        return "fit_peak_memory" in (self.metrics or [])
 
     def run(self, classifier):
         """
@@ -25,33 +139,130 @@ class Profiler:
         :return: A dictionary containing the results of the profiler.
         :rtype: dict
         """
+        if not self.metrics:
+            raise RuntimeError("Please specify at least one metric "
+                               "to evaluate the classifier(s)")
 
         # Predict the test set labels using the given classifier
-        y_pred = classifier.predict()
+        y_pred = classifier.predict(batch_size=self.batch_size,
+                                    n_jobs=self.n_jobs)
+        performance = self._measure_performance(classifier)
+
         results = {}
+        matrix = None
+        for metric in self.metrics:
+            if metric in performance:
+                results[metric] = performance[metric]
+                continue
+            if matrix is None:
+                # Count the predictions once, every quality metric is
+                # derived from the matrix
+                matrix, _ = confusion_matrix(classifier.dataset.y_test, y_pred)
+            results[metric] = METRICS[metric](matrix)
 
-        if self.metrics:
-            # Calculate accuracy if requested
-            if "accuracy" in self.metrics:
-                results["accuracy"] = accuracy_score(classifier.dataset.y_test,
-                                                     y_pred)
-            # Calculate precision if requested
-            if "precision" in self.metrics:
-                results["precision"] = precision_score(
-                    classifier.dataset.y_test, y_pred, average="weighted")
-            # Calculate recall if requested
-            if "recall" in self.metrics:
-                results["recall"] = recall_score(classifier.dataset.y_test,
-                                                 y_pred,
-                                                 average="weighted",
-                                                 zero_division=0)
-            # Calculate F1 score if requested
-            if "f1" in self.metrics:
-                results["f1"] = f1_score(classifier.dataset.y_test,
-                                         y_pred,
-                                         average="weighted")
-        else:
-            raise RuntimeError("Please specify at least one metric "
-                               "to evaluate the classifier(s)")
+        folds = getattr(classifier.dataset, "cv_folds", None)
+        if self.fold_metrics and folds:
+            results.update(self._measure_folds(classifier, folds))
+        return results
 
+    def _measure_folds(self, classifier, folds: list) -> dict:
+        """
+        Refit the tuned model on every fold and score its validation rows.
+
+        :param classifier: The fitted classifier.
+        :param folds: The train and validation row indices of each fold.
+        :type folds: list[tuple[np.ndarray, np.ndarray]]
+        :return: The ``<metric>_fold_<i>`` scores of each quality metric,
+            followed by their ``<metric>_cv_mean`` and ``<metric>_cv_std``.
+        :rtype: dict
+        """
+        metrics = [m for m in self.metrics if m in METRICS]
+        if not metrics:
+            return {}
+        X, y = classifier.dataset.X_train, classifier.dataset.y_train
+        scores = {metric: [] for metric in metrics}
+        for train, validation in folds:
+            model = clone(classifier.model).fit(X[train], y[train])
+            matrix, _ = confusion_matrix(y[validation],
+                                         model.predict(X[validation]))
+            for metric in metrics:
+                scores[metric].append(METRICS[metric](matrix))
+
+        results = {}
+        for metric, values in scores.items():
+            for i, value in enumerate(values):
+                results[f"{metric}_fold_{i}"] = value
+        for metric, values in scores.items():
+            results[f"{metric}_cv_mean"] = float(np.mean(values))
+            results[f"{metric}_cv_std"] = float(np.std(values))
+        return results
+
+    def _measure_performance(self, classifier) -> dict:
+        """
+        Measure the requested performance metrics of a fitted classifier.
+
+        The fit metrics are recorded when the classifier is trained by the
+        :py:class:`~simpleclassifier.classifier_profiler.ClassifierProfiler`
+        and are NaN otherwise.
+        """
+        requested = {m for m in self.metrics if m in PERFORMANCE_METRICS}
+        results = {}
+        nan = float("nan")
+        if "fit_time" in requested:
+            results["fit_time"] = getattr(classifier, "fit_time_", nan)
+        if "tune_time" in requested:
+            results["tune_time"] = getattr(classifier, "tune_time_", nan)
+        if "fit_peak_memory" in requested:
+            results["fit_peak_memory"] = getattr(
+                classifier, "fit_peak_memory_", nan) / 2**20
+
+        X = classifier.dataset.X_test
+        if "predict_throughput" in requested:
+            times = self._time_runs(lambda: classifier.predict(
+                X, batch_size=self.batch_size, n_jobs=self.n_jobs))
+            results["predict_throughput"] = X.shape[0] / float(
+                np.median(times))
+        if "predict_peak_memory" in requested:
+            _, peak = measure_peak_memory(classifier.predict,
+                                          X,
+                                          batch_size=self.batch_size,
+                                          n_jobs=self.n_jobs)
+            results["predict_peak_memory"] = peak / 2**20
+
+        for kind, size in (("row", 1), ("batch", self.latency_batch_size)):
+            names = [f"{kind}_latency_p{q}" for q in LATENCY_PERCENTILES]
+            if requested.isdisjoint(names):
+                continue
+            n_rows = min(X.shape[0], self.latency_rows) if size == 1 else \
+                X.shape[0]
+            batches = [
+                X[start:start + size] for start in range(0, n_rows, size)
+            ]
+            times = self._time_runs(classifier.predict_batch, batches)
+            percentiles = np.percentile(times, LATENCY_PERCENTILES) * 1000
+            results.update(zip(names, map(float, percentiles)))
         return results
+
+    def _time_runs(self, function, batches=None) -> np.ndarray:
+        """
+        Time repeated calls of a function after the warm-up runs.
+
+        :param function: The function to time.
+        :type function: Callable
+        :param batches: The arguments of the calls of one run, the function
+            is called once without arguments per run by default.
+        :type batches: list, optional
+        :return: The wall time of every timed call in seconds.
+        :rtype: np.ndarray
+        """
+        calls = [()] if batches is None else [(batch, ) for batch in batches]
+        for _ in range(self.n_warmup):
+            for args in calls:
+                function(*args)
+        times = []
+        for _ in range(self.n_repeats):
+            for args in calls:
+                start = time.perf_counter()
+                function(*args)
+                times.append(time.perf_counter() - start)
+        return np.asarray(times)
@@ -0,0 +1,359 @@
+import heapq
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+from joblib import effective_n_jobs
+from sklearn.model_selection import GridSearchCV, ParameterGrid
+
+# The seconds one fit and score take per million training values (rows
+# times features) before any timing was recorded, per 100 trees for the
+# ensembles. They only need to rank the estimators, the recorded timings
+# replace them.
+PRIORS = {
+    "GaussianNB": 0.005,
+    "SGDClassifier": 0.02,
+    "KNeighborsClassifier": 0.05,
+    "LogisticRegression": 0.1,
+    "MLPClassifier": 0.5,
+    "RandomForestClassifier": 1.0,
+    "SVC": 2.0,
+}
+DEFAULT_PRIOR = 0.1
+# The number of candidates of the strategies with a fixed budget
+BUDGET_OPTIONS = {"random": ("n_iter", 10), "tpe": ("n_trials", 30)}
+
+
+def lpt_order(costs) -> list[int]:
+    """
+    Order jobs longest processing time first, ties keeping their order.
+
+    :param costs: The estimated cost of every job.
+    :type costs: list[float]
+    :return: The indices of the jobs in dispatch order.
+    :rtype: list[int]
+    """
+    return [int(i) for i in np.argsort(-np.asarray(costs), kind="stable")]
+
+
+def lpt_makespan(costs, n_workers: int) -> float:
+    """
+    Predict the makespan of jobs dispatched longest first to the worker
+    that becomes idle first.
+
+    :param costs: The estimated cost of every job.
+    :type costs: list[float]
+    :param n_workers: The number of workers.
+    :type n_workers: int
+    :return: The time the last job finishes.
+    :rtype: float
+    """
+    loads = [0.0] * max(1, n_workers)
+    for i in lpt_order(costs):
+        heapq.heappush(loads, heapq.heappop(loads) + float(costs[i]))
+    return max(loads)
+
+
+class CostModel:
+    """
+    Estimate the cost of fitting and scoring estimators.
+
+    A cost is the number of training values, rows times features, times a
+    rate per estimator, scaled by the number of trees of ensembles. The
+    rate of a candidate is learned from the ``mean_fit_time`` and
+    ``mean_score_time`` of the ``cv_results_`` of earlier searches: the
+    same parameters use their own rate, other parameters the median rate
+    of the estimator and unseen estimators the :py:data:`PRIORS`. With a
+    ``path`` the rates are kept in a JSON file shared by later runs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the CostModel.
+
+        :param path: The JSON file the recorded rates are loaded from and
+            saved to, kept in memory only if None.
+        :type path: str, optional
+        """
+        self.path = None if path is None else os.path.expanduser(path)
+        self.rates = {}
+        if self.path is not None and os.path.exists(self.path):
+            self.rates = _read_rates(self.path)
+
+    def estimate(self, model, params: dict, n_samples: float,
+                 n_features: int) -> float:
+        """
+        Estimate the seconds of one fit and score of a candidate.
+
+        :param model: The untuned estimator.
+        :param params: The parameters of the candidate.
+        :type params: dict
+        :param n_samples: The number of training rows.
+        :type n_samples: float
+        :param n_features: The number of features.
+        :type n_features: int
+        :return: The estimated cost in seconds.
+        :rtype: float
+        """
+        name, params = _unwrap(model, params)
+        rates = self.rates.get(name, {})
+        rate = rates.get(_params_key(params))
+        if rate is not None:
+            rate = rate[0]
+        elif rates:
+            rate = float(np.median([mean for mean, _ in rates.values()]))
+        else:
+            rate = PRIORS.get(name, DEFAULT_PRIOR)
+        return rate * _size(params) * n_samples * n_features / 1e6
+
+    def estimate_classifier(self, classifier) -> float:
+        """
+        Estimate the seconds the tuning and the final fit of a classifier
+        take, from the size of its parameter grid, the shape of its training
+        data and the number of cross-validation folds.
+
+        :param classifier: The untrained classifier.
+        :type classifier: Classifier
+        :return: The estimated cost in seconds.
+        :rtype: float
+        """
+        n_samples, n_features = classifier.dataset.X_train.shape[:2]
+        param_grid = getattr(classifier, "param_grid", None)
+        if not param_grid:
+            # incremental classifiers make n_epochs passes over the data
+            model = classifier.model
+            if model is None:
+                model = classifier.create_model()
+            return getattr(classifier, "n_epochs", 1) * self.estimate(
+                model, model.get_params(), n_samples, n_features)
+
+        if hasattr(param_grid, "to_param_grid"):
+            # a search space, whose conditions may remove candidates
+            param_grid = param_grid.to_param_grid()
+        options = classifier.tuner_options
+        cv = options.get("cv") or len(
+            getattr(classifier.dataset, "cv_folds", None) or []) or 5
+        costs = [
+            self.estimate(classifier.model, params,
+                          n_samples * (cv - 1) / cv, n_features)
+            for params in ParameterGrid(param_grid)
+        ]
+        n_candidates = len(costs)
+        strategy = options.get("strategy", "grid")
+        if strategy in BUDGET_OPTIONS:
+            option, default = BUDGET_OPTIONS[strategy]
+            n_candidates = min(n_candidates, (options.get("strategy_options")
+                                              or {}).get(option, default))
+        mean_cost = float(np.mean(costs))
+        # the candidates on every fold, then the refit on all the rows
+        return (n_candidates * cv * mean_cost + mean_cost * cv / (cv - 1))
+
+    def record_search(self, model, cv_results: dict, n_samples: float,
+                      n_features: int):
+        """
+        Learn the rates of the candidates of a fitted search.
+
+        Searches fitting candidates on subsets, such as successive halving,
+        are skipped.
+
+        :param model: The untuned estimator.
+        :param cv_results: The ``cv_results_`` of the search.
+        :type cv_results: dict
+        :param n_samples: The number of training rows of a fold.
+        :type n_samples: float
+        :param n_features: The number of features.
+        :type n_features: int
+        """
+        if "n_resources" in cv_results or n_samples * n_features == 0:
+            return
+        fit_times = np.asarray(cv_results["mean_fit_time"], dtype=float)
+        score_times = np.asarray(cv_results.get("mean_score_time",
+                                                np.zeros_like(fit_times)),
+                                 dtype=float)
+        for params, seconds in zip(cv_results["params"],
+                                   fit_times + score_times):
+            name, params = _unwrap(model, params)
+            rate = seconds * 1e6 / (_size(params) * n_samples * n_features)
+            rates = self.rates.setdefault(name, {})
+            mean, count = rates.get(_params_key(params), (0.0, 0))
+            rates[_params_key(params)] = [(mean * count + rate) / (count + 1),
+                                          count + 1]
+
+    def save(self):
+        """
+        Merge the recorded rates into the JSON file, keeping the rate with
+        the most observations when another run saved the same candidate.
+        """
+        if self.path is None:
+            return
+        rates = _read_rates(self.path) if os.path.exists(self.path) else {}
+        for name, entries in self.rates.items():
+            saved = rates.setdefault(name, {})
+            for key, entry in entries.items():
+                if key not in saved or saved[key][1] <= entry[1]:
+                    saved[key] = entry
+        self.rates = rates
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so that concurrent runs never
+        # read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".")
+        with os.fdopen(fd, "w") as file:
+            json.dump(rates, file, indent=4)
+        os.replace(tmp_path, self.path)
+
+
+class LPTGridSearchCV(GridSearchCV):
+    """
+    An exhaustive grid search dispatching the most expensive candidates
+    first.
+
+    Jobs dispatched in grid order leave workers idle while the last
+    expensive candidates finish. The candidates are therefore dispatched
+    longest processing time (LPT) first according to a
+    :py:class:`CostModel`, and the results are put back in grid order, so
+    ``cv_results_`` and the selected candidate are those of
+    :py:class:`~sklearn.model_selection.GridSearchCV`. The makespan
+    predicted by the cost model and the actual one are kept in
+    ``predicted_makespan_`` and ``makespan_``.
+    """
+
+    def __init__(self,
+                 estimator,
+                 param_grid,
+                 *,
+                 cost_model: Optional[CostModel] = None,
+                 scoring=None,
+                 n_jobs=None,
+                 refit=True,
+                 cv=None,
+                 verbose=0,
+                 pre_dispatch="2*n_jobs",
+                 error_score=np.nan,
+                 return_train_score=False):
+        super().__init__(estimator,
+                         param_grid,
+                         scoring=scoring,
+                         n_jobs=n_jobs,
+                         refit=refit,
+                         cv=cv,
+                         verbose=verbose,
+                         pre_dispatch=pre_dispatch,
+                         error_score=error_score,
+                         return_train_score=return_train_score)
+        self.cost_model = cost_model
+
+    def fit(self, X, y=None, **params):
+        """
+        Run the search with the candidates dispatched longest first.
+
+        :param X: The training feature matrix.
+        :param y: The training target variable.
+        :return: The fitted search.
+        :rtype: LPTGridSearchCV
+        """
+        self._shape = search_shape(self.estimator, X)
+        try:
+            return super().fit(X, y, **params)
+        finally:
+            del self._shape
+            self._order = None
+
+    def _run_search(self, evaluate_candidates):
+        """
+        Evaluate the candidates of the grid longest first.
+        """
+        candidates = list(ParameterGrid(self.param_grid))
+        n_samples, n_features = self._shape
+        cost_model = self.cost_model or CostModel()
+        costs = [
+            cost_model.estimate(
+                self.estimator, params,
+                n_samples * (self.n_splits_ - 1) / self.n_splits_, n_features)
+            for params in candidates
+        ]
+        self._order = lpt_order(costs)
+        self.predicted_makespan_ = lpt_makespan(
+            np.repeat(costs, self.n_splits_), effective_n_jobs(self.n_jobs))
+        start = time.perf_counter()
+        evaluate_candidates([candidates[i] for i in self._order])
+        self.makespan_ = time.perf_counter() - start
+
+    def _format_results(self,
+                        candidate_params,
+                        n_splits,
+                        out,
+                        more_results=None):
+        # put the candidates and their fold results back in grid order
+        order = getattr(self, "_order", None)
+        if order is not None and len(candidate_params) == len(order):
+            positions = np.argsort(order)
+            candidate_params = [candidate_params[p] for p in positions]
+            out = [
+                out[p * n_splits + split] for p in positions
+                for split in range(n_splits)
+            ]
+        return super()._format_results(candidate_params, n_splits, out,
+                                       more_results)
+
+
+def search_shape(model, X) -> tuple:
+    """
+    Find the number of rows and features a search fits its candidates on.
+
+    :param model: The untuned estimator.
+    :param X: The training feature matrix of the search, the row indices
+        for an estimator searched behind the preprocessing.
+    :return: The number of rows and of features.
+    :rtype: tuple
+    """
+    from simpleclassifier.preprocessing import PreprocessedEstimator
+
+    if isinstance(model, PreprocessedEstimator):
+        return X.shape[0], model.preprocessing.dataset.X_train.shape[1]
+    return X.shape[0], X.shape[1]
+
+
+def _unwrap(model, params: dict) -> tuple:
+    """
+    Name the estimator of a candidate and its own parameters, looking
+    through the estimators searched behind the preprocessing.
+    """
+    from simpleclassifier.preprocessing import PreprocessedEstimator
+
+    if isinstance(model, PreprocessedEstimator):
+        prefix = "estimator__"
+        return type(model.estimator).__name__, {
+            name[len(prefix):]: value
+            for name, value in params.items() if name.startswith(prefix)
+        }
+    return type(model).__name__, params
+
+
+def _params_key(params: dict) -> str:
+    """
+    Identify the parameters of a candidate.
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _size(params: dict) -> float:
+    """
+    Scale the cost of ensembles with their number of estimators.
+    """
+    n_estimators = params.get("n_estimators")
+    return 1.0 if n_estimators is None else n_estimators / 100
+
+
+def _read_rates(path: str) -> dict:
+    """
+    Read the rates of a JSON file, an unreadable file holding none.
+    """
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
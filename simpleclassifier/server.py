@@ -0,0 +1,586 @@
+"""
+Serve the predictions of saved models over a local HTTP endpoint::
+
+    python -m simpleclassifier serve --models models/ --port 8000
+
+Concurrent requests are coalesced into micro-batches, so the models predict
+many rows per call instead of one. ``POST /predict`` takes the raw feature
+rows as ``{"rows": [[...], ...]}`` and answers ``{"labels": [...]}``, and
+``GET /stats`` reports the queue depth, the batch sizes and the latency
+percentiles of every model.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from simpleclassifier.persistence import ModelStore
+
+LATENCY_PERCENTILES = (50, 95, 99)
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error"
+}
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into batches.
+
+    A batch is started by the first waiting request and closed once it
+    holds ``max_batch_size`` rows or ``max_wait`` seconds after that request
+    arrived, whichever comes first. Batches are predicted one at a time in
+    a worker thread, so the event loop keeps accepting requests, which form
+    the next batch, while a batch is being predicted.
+    """
+
+    def __init__(self,
+                 predict: Callable,
+                 max_batch_size: int = 64,
+                 max_wait: float = 0.002,
+                 window: int = 10000):
+        """
+        Initialize the MicroBatcher.
+
+        :param predict: The function predicting the labels of a feature
+            matrix.
+        :type predict: Callable
+        :param max_batch_size: The number of rows that closes a batch. A
+            request is never split, so a batch may exceed it by the rows of
+            its last request.
+        :type max_batch_size: int, optional
+        :param max_wait: The longest time in seconds a request waits for
+            others to join its batch.
+        :type max_wait: float, optional
+        :param window: The number of recent requests whose latencies are
+            reported.
+        :type window: int, optional
+        :raises ValueError: If max_batch_size is smaller than 1 or max_wait
+            is negative.
+        """
+        if max_batch_size < 1 or max_wait < 0:
+            raise ValueError("max_batch_size must be at least 1 and max_wait "
+                             "at least 0")
+        self.predict_function = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.latencies = deque(maxlen=window)
+        self.n_requests = 0
+        self.n_rows = 0
+        self.n_batches = 0
+        self._pending = deque()
+        self._wakeup = None
+        self._task = None
+        self._executor = None
+
+    def start(self):
+        """
+        Start collecting batches in the running event loop.
+        """
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """
+        Stop collecting batches and fail the requests still waiting.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._executor.shutdown(wait=False)
+            self._task = None
+        self._fail(self._pending, RuntimeError("The server was closed"))
+        self._pending.clear()
+
+    async def predict(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Predict rows in the next batch.
+
+        :param rows: The feature matrix of the request.
+        :type rows: np.ndarray
+        :return: The predicted labels.
+        :rtype: np.ndarray
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((rows, future, time.perf_counter()))
+        self._wakeup.set()
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of requests waiting for a batch.
+
+        :rtype: int
+        """
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        """
+        Report the load of the batcher.
+
+        :return: The ``queue_depth``, the number of requests, rows and
+            batches served, the mean batch size in rows and the
+            ``latency_p<q>`` percentiles in milliseconds of the recent
+            requests, from their arrival to their answer.
+        :rtype: dict
+        """
+        stats = {
+            "queue_depth":
+            self.queue_depth,
+            "requests":
+            self.n_requests,
+            "rows":
+            self.n_rows,
+            "batches":
+            self.n_batches,
+            "mean_batch_size":
+            self.n_rows / self.n_batches if self.n_batches else 0.0,
+        }
+        latencies = np.asarray(self.latencies)
+        percentiles = (np.percentile(latencies, LATENCY_PERCENTILES) *
+                       1000 if len(latencies) else [float("nan")] *
+                       len(LATENCY_PERCENTILES))
+        for q, value in zip(LATENCY_PERCENTILES, percentiles):
+            stats[f"latency_p{q}"] = float(value)
+        return stats
+
+    async def _run(self):
+        """
+        Collect and predict batches until the batcher is closed.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            batch = [self._pending.popleft()]
+            n_rows = len(batch[0][0])
+            deadline = batch[0][2] + self.max_wait
+            while n_rows < self.max_batch_size:
+                if self._pending:
+                    batch.append(self._pending.popleft())
+                    n_rows += len(batch[-1][0])
+                    continue
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            await self._predict_batch(loop, batch)
+
+    @staticmethod
+    def _fail(requests, error: Exception):
+        """
+        Answer requests with an error.
+        """
+        for _, future, _ in requests:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _predict_batch(self, loop, batch: list):
+        """
+        Predict the rows of a batch and answer each of its requests. If the
+        batch fails, its requests are predicted one at a time.
+        """
+        try:
+            X = np.concatenate([rows for rows, _, _ in batch])
+            labels = await loop.run_in_executor(self._executor,
+                                                self.predict_function, X)
+        except asyncio.CancelledError:
+            self._fail(batch, RuntimeError("The server was closed"))
+            raise
+        except Exception as error:
+            if len(batch) == 1:
+                self._fail(batch, error)
+                return
+            # predict every request alone, so that only the requests the
+            # model fails on are answered with an error
+            for request in batch:
+                await self._predict_batch(loop, [request])
+            return
+        end = time.perf_counter()
+        start = 0
+        for rows, future, arrival in batch:
+            if not future.done():
+                future.set_result(labels[start:start + len(rows)])
+            start += len(rows)
+            self.latencies.append(end - arrival)
+        self.n_requests += len(batch)
+        self.n_rows += len(X)
+        self.n_batches += 1
+
+
+class PredictionServer:
+    """
+    An asyncio HTTP server predicting with the models of a
+    :py:class:`~simpleclassifier.persistence.ModelStore`.
+
+    Every model has its own :py:class:`MicroBatcher`. The rows of a request
+    are raw features, which are scaled with the saved scaler of the dataset
+    once per batch. The server listens on a TCP port or on a Unix socket
+    and keeps connections alive between requests.
+
+    ``POST /predict`` predicts with the first model and
+    ``POST /predict/<codename>`` with a given one, ``GET /stats`` reports
+    the :py:meth:`MicroBatcher.stats` of every model.
+    """
+
+    def __init__(self,
+                 store: ModelStore,
+                 names: Optional[list[str]] = None,
+                 max_batch_size: int = 64,
+                 max_wait: float = 0.002,
+                 mmap_mode: Optional[str] = "r"):
+        """
+        Initialize the PredictionServer.
+
+        :param store: The saved models.
+        :type store: ModelStore
+        :param names: The codenames of the models to serve, all of them by
+            default.
+        :type names: list[str], optional
+        :param max_batch_size: The number of rows that closes a batch.
+        :type max_batch_size: int, optional
+        :param max_wait: The longest time in seconds a request waits for
+            others to join its batch.
+        :type max_wait: float, optional
+        :param mmap_mode: The memory-map mode of the model arrays, None to
+            read them into memory.
+        :type mmap_mode: str, optional
+        """
+        manifest = store.manifest
+        self.n_features = manifest["dataset"]["n_features"]
+        self.dtype = np.dtype(manifest["dataset"]["dtype"])
+        self.scaler, self.classes = store.load_scaler()
+        models = store.load_models(names, mmap_mode)
+        codenames = {
+            entry["name"]: entry["codename"] or entry["name"]
+            for entry in manifest["classifiers"]
+        }
+        self.batchers = {
+            codenames[name]:
+            MicroBatcher(self._make_predict(model), max_batch_size, max_wait)
+            for name, model in models.items()
+        }
+        self.server = None
+
+    def _make_predict(self, model) -> Callable:
+        """
+        Build the function predicting raw rows with a model.
+        """
+
+        def predict(X):
+            labels = model.predict(self.scaler.transform(X))
+            return labels if self.classes is None else self.classes[labels]
+
+        return predict
+
+    async def start(self,
+                    host: str = "127.0.0.1",
+                    port: int = 8000,
+                    path: Optional[str] = None):
+        """
+        Start listening and batching.
+
+        :param host: The host of the TCP socket.
+        :type host: str, optional
+        :param port: The TCP port, 0 to pick a free one.
+        :type port: int, optional
+        :param path: The path of a Unix socket to listen on instead.
+        :type path: str, optional
+        :return: The address the server listens on, a ``(host, port)``
+            tuple or the socket path.
+        """
+        for batcher in self.batchers.values():
+            batcher.start()
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle,
+                                                          path=path)
+            return path
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """
+        Stop listening and batching.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for batcher in self.batchers.values():
+            await batcher.close()
+
+    def stats(self) -> dict:
+        """
+        Report the load of every model.
+
+        :return: The :py:meth:`MicroBatcher.stats` keyed by codename.
+        :rtype: dict
+        """
+        return {
+            name: batcher.stats()
+            for name, batcher in self.batchers.items()
+        }
+
+    async def _handle(self, reader, writer):
+        """
+        Answer the requests of a connection until the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(
+                    " ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0)))
+                status, payload = await self._route(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                writer.write(
+                    (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     "Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}"
+                     "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str, body: bytes) -> tuple:
+        """
+        Dispatch a request to its endpoint.
+
+        :return: The HTTP status and the JSON payload of the answer.
+        :rtype: tuple
+        """
+        if method == "GET" and target == "/stats":
+            return 200, self.stats()
+        if method != "POST" or not (target == "/predict"
+                                    or target.startswith("/predict/")):
+            return 404, {"error": f"No endpoint {method} {target}"}
+        name = target[len("/predict/"):] or next(iter(self.batchers))
+        if name not in self.batchers:
+            return 404, {
+                "error":
+                f"No model {name}, the models are "
+                f"{list(self.batchers)}"
+            }
+        try:
+            rows = np.asarray(json.loads(body)["rows"], dtype=self.dtype)
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, {"error": f"Invalid request: {error!r}"}
+        if rows.ndim != 2 or rows.shape[1] != self.n_features:
+            return 400, {
+                "error": f"The rows must have {self.n_features} features"
+            }
+        if not np.isfinite(rows).all():
+            return 400, {"error": "The rows must only hold finite values"}
+        try:
+            labels = await self.batchers[name].predict(rows)
+        except Exception as error:
+            return 500, {"error": f"Prediction failed: {error!r}"}
+        return 200, {"labels": labels.tolist()}
+
+
+async def generate_load(rows: np.ndarray,
+                        n_requests: int,
+                        concurrency: int = 16,
+                        host: str = "127.0.0.1",
+                        port: int = 8000,
+                        path: Optional[str] = None,
+                        model: Optional[str] = None) -> dict:
+    """
+    Send prediction requests of one row each to a server from concurrent
+    keep-alive connections, e.g. to measure the effect of the batching.
+
+    :param rows: The rows to predict, request ``i`` predicting row
+        ``i % len(rows)``.
+    :type rows: np.ndarray
+    :param n_requests: The number of requests.
+    :type n_requests: int
+    :param concurrency: The number of connections sending requests at once.
+    :type concurrency: int, optional
+    :param host: The host of the server.
+    :type host: str, optional
+    :param port: The port of the server.
+    :type port: int, optional
+    :param path: The Unix socket of the server, used instead of the host and
+        port.
+    :type path: str, optional
+    :param model: The codename of the model, the first one by default.
+    :type model: str, optional
+    :return: The ``labels`` of every request in order, their client-side
+        ``latencies`` in seconds and the ``throughput`` in requests per
+        second.
+    :rtype: dict
+    """
+    target = "/predict" if model is None else f"/predict/{model}"
+    labels = [None] * n_requests
+    latencies = np.empty(n_requests)
+    indices = iter(range(n_requests))
+
+    async def client():
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in indices:
+                body = json.dumps({
+                    "rows": [rows[i % len(rows)].tolist()]
+                }).encode()
+                start = time.perf_counter()
+                writer.write(
+                    (f"POST {target} HTTP/1.1\r\n"
+                     "Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+                await writer.drain()
+                length = 0
+                status = (await reader.readline()).split()[1]
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                payload = json.loads(await reader.readexactly(length))
+                latencies[i] = time.perf_counter() - start
+                if status != b"200":
+                    raise RuntimeError(payload["error"])
+                labels[i] = payload["labels"][0]
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "labels": labels,
+        "latencies": latencies,
+        "throughput": n_requests / elapsed,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the prediction server from the command line until it is
+    interrupted.
+
+    :param argv: The command line arguments, ``sys.argv`` by default.
+    :type argv: list[str], optional
+    :return: The exit status.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        "python -m simpleclassifier serve",
+        description="Serve the predictions of saved models, batching "
+        "concurrent requests")
+    parser.add_argument("-m",
+                        "--models",
+                        required=True,
+                        help="directory of the models saved with "
+                        "--save-models")
+    parser.add_argument("-c",
+                        "--classifier",
+                        action="append",
+                        help="codename of a model to serve, all of them by "
+                        "default, may be repeated")
+    parser.add_argument("--host",
+                        default="127.0.0.1",
+                        help="host to listen on")
+    parser.add_argument("-p",
+                        "--port",
+                        type=int,
+                        default=8000,
+                        help="TCP port to listen on")
+    parser.add_argument("--unix",
+                        metavar="PATH",
+                        help="Unix socket to listen on instead of a TCP port")
+    parser.add_argument("--max-batch-size",
+                        type=int,
+                        default=64,
+                        help="number of rows that closes a batch")
+    parser.add_argument("--max-wait-ms",
+                        type=float,
+                        default=2.0,
+                        help="longest time a request waits for others to "
+                        "join its batch")
+    parser.add_argument("--stats-interval",
+                        type=float,
+                        default=10.0,
+                        help="seconds between the printed statistics, 0 to "
+                        "disable them")
+    args = parser.parse_args(argv)
+    if args.max_batch_size < 1 or args.max_wait_ms < 0:
+        parser.error("the max batch size must be at least 1 and the max "
+                     "wait at least 0")
+
+    async def serve():
+        server = PredictionServer(ModelStore(args.models),
+                                  names=args.classifier,
+                                  max_batch_size=args.max_batch_size,
+                                  max_wait=args.max_wait_ms / 1000)
+        address = await server.start(args.host, args.port, args.unix)
+        print(f"Serving {', '.join(server.batchers)} on {address}")
+        try:
+            while True:
+                await asyncio.sleep(args.stats_interval or 3600)
+                if args.stats_interval:
+                    _print_stats(server.stats())
+        finally:
+            await server.close()
+            _print_stats(server.stats())
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _print_stats(stats: dict):
+    """
+    Print the statistics of every model on one line each.
+    """
+    for name, values in stats.items():
+        print(f"- {name}: queue {values['queue_depth']}, "
+              f"{values['requests']} requests in {values['batches']} batches "
+              f"(mean {values['mean_batch_size']:.1f} rows), latency "
+              f"p50 {values['latency_p50']:.2f} ms, "
+              f"p99 {values['latency_p99']:.2f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
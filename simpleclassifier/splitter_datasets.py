@@ -1,4 +1,16 @@
-from simpleclassifier.base import SplitterDataset
+import abc
+import itertools
+import os
+import struct
+import tempfile
+import zipfile
+from typing import Optional, Union
+
+import numpy as np
+from scipy import sparse
+
+from simpleclassifier.base import Splitter, SplitterDataset
+from simpleclassifier.cache import DatasetCache
 from simpleclassifier.factory import SplitterDatasetFactory
 
 from sklearn.datasets import load_breast_cancer, load_iris, load_wine
@@ -73,3 +85,742 @@ class WineDataset(SplitterDataset):
         :rtype: sklearn.utils.Bunch
         """
         return load_wine(return_X_y=True)
+
+
+class FileDataset(SplitterDataset):
+    """
+    A base class for datasets read from a local file.
+
+    The feature matrix is read into a temporary memory-mapped file or
+    memory-mapped straight from the source, so that it only lives on disk.
+    The only copies held in memory are the train and test splits, which are
+    then scaled in place.
+    """
+
+    def __init__(self,
+                 splitter: Splitter,
+                 path: str,
+                 target: Union[str, int] = -1,
+                 columns: Optional[list] = None,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the FileDataset.
+
+        :param splitter: The splitter object used for splitting the dataset.
+        :type splitter: Splitter
+        :param path: The path of the data file.
+        :type path: str
+        :param target: The name or the index of the target column.
+        :type target: str or int, optional
+        :param columns: The names or indices of the feature columns to read,
+            all the other columns by default.
+        :type columns: list, optional
+        :param cache: A cache of split and scaled datasets.
+        :type cache: DatasetCache, optional
+        :param dtype: The floating point type of the feature matrices, see
+            :py:class:`~simpleclassifier.base.SplitterDataset`.
+        :type dtype: str or np.dtype, optional
+        :param scaling: How the features are scaled, see
+            :py:class:`~simpleclassifier.base.SplitterDataset`.
+        :type scaling: str, optional
+        """
+        self.path = os.path.expanduser(path)
+        self.target = target
+        self.columns = columns
+        super().__init__(splitter, cache, dtype, scaling)
+
+    def cache_key_parts(self) -> tuple:
+        """
+        Identify the dataset by its file, its modification time and the
+        selected columns.
+
+        :return: The values identifying the dataset.
+        :rtype: tuple
+        """
+        stat = os.stat(self.path)
+        return super().cache_key_parts() + (os.path.abspath(
+            self.path), stat.st_size, stat.st_mtime_ns, self.target,
+                                            self.columns)
+
+    def _select_columns(self, names: list) -> tuple[list[int], int]:
+        """
+        Resolve the feature and target columns to indices.
+
+        :param names: The names of all the columns of the file.
+        :type names: list
+        :return: The indices of the feature columns and of the target column.
+        :rtype: tuple[list[int], int]
+        """
+
+        def index(column):
+            if isinstance(column, int):
+                return column % len(names)
+            if column not in names:
+                raise ValueError(f"Unknown column: {column}. The available "
+                                 f"columns are: {names}")
+            return names.index(column)
+
+        target = index(self.target)
+        if self.columns is None:
+            features = [i for i in range(len(names)) if i != target]
+        else:
+            features = [index(column) for column in self.columns]
+        return features, target
+
+
+@SplitterDatasetFactory.register("csv")
+class CSVDataset(FileDataset):
+    """
+    A dataset class for loading numeric CSV files.
+
+    The file is parsed in chunks of ``chunk_size`` rows that are written
+    straight into a memory-mapped feature matrix, so parsing never holds
+    more than one chunk of text in memory.
+    """
+
+    def __init__(self,
+                 splitter: Splitter,
+                 path: str,
+                 target: Union[str, int] = -1,
+                 columns: Optional[list] = None,
+                 delimiter: str = ",",
+                 header: bool = True,
+                 chunk_size: int = 10000,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the CSVDataset.
+
+        :param delimiter: The string separating the values.
+        :type delimiter: str, optional
+        :param header: Whether the first line holds the column names.
+        :type header: bool, optional
+        :param chunk_size: The number of rows parsed at once.
+        :type chunk_size: int, optional
+
+        See :py:class:`FileDataset` for the other parameters.
+        """
+        self.delimiter = delimiter
+        self.header = header
+        self.chunk_size = chunk_size
+        super().__init__(splitter, path, target, columns, cache, dtype,
+                         scaling)
+
+    def cache_key_parts(self) -> tuple:
+        """
+        Identify the dataset by its file, its columns and its CSV dialect.
+        """
+        return super().cache_key_parts() + (self.delimiter, self.header)
+
+    def load_data(self):
+        """
+        Load the CSV file in chunks.
+
+        :return: The memory-mapped feature data (X) and the target data (y).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        with open(self.path, "r") as file:
+            first = file.readline().rstrip("\r\n").split(self.delimiter)
+            n_rows = sum(1 for line in file if line.strip())
+        if self.header:
+            names = [name.strip() for name in first]
+        else:
+            names = list(range(len(first)))
+            n_rows += 1
+        features, target = self._select_columns(names)
+
+        X = _temporary_memmap((n_rows, len(features)), self.dtype)
+        y_chunks = []
+        with open(self.path, "r") as file:
+            lines = (line for line in file if line.strip())
+            if self.header:
+                next(lines)
+            start = 0
+            while True:
+                chunk = list(itertools.islice(lines, self.chunk_size))
+                if not chunk:
+                    break
+                stop = start + len(chunk)
+                X[start:stop] = np.loadtxt(chunk,
+                                           delimiter=self.delimiter,
+                                           usecols=features,
+                                           ndmin=2)
+                y_chunks.append(
+                    np.loadtxt(chunk,
+                               delimiter=self.delimiter,
+                               usecols=target,
+                               dtype=str,
+                               ndmin=1))
+                start = stop
+        return X, _parse_labels(np.concatenate(y_chunks))
+
+
+@SplitterDatasetFactory.register("npy")
+class NPYDataset(FileDataset):
+    """
+    A dataset class for loading NumPy ``.npy`` and ``.npz`` files.
+
+    A ``.npy`` file holds a matrix whose ``target`` column is the target,
+    unless the target is given by a separate ``target_path`` file. A
+    ``.npz`` archive holds the arrays ``X`` and ``y``. The arrays are
+    memory-mapped, including the members of uncompressed archives.
+    """
+
+    def __init__(self,
+                 splitter: Splitter,
+                 path: str,
+                 target: Union[str, int] = -1,
+                 columns: Optional[list] = None,
+                 target_path: Optional[str] = None,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the NPYDataset.
+
+        :param target_path: The path of a ``.npy`` file holding the target.
+        :type target_path: str, optional
+
+        See :py:class:`FileDataset` for the other parameters.
+        """
+        self.target_path = target_path
+        super().__init__(splitter, path, target, columns, cache, dtype,
+                         scaling)
+
+    def cache_key_parts(self) -> tuple:
+        """
+        Identify the dataset by its files and its columns.
+        """
+        return super().cache_key_parts() + (self.target_path, )
+
+    def load_data(self):
+        """
+        Memory-map the arrays.
+
+        :return: The feature data (X) and the target data (y).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        if self.path.endswith(".npz"):
+            X, y = _load_npz_member(self.path,
+                                    "X"), _load_npz_member(self.path, "y")
+        else:
+            X = np.load(self.path, mmap_mode="r")
+            y = None
+            if self.target_path is not None:
+                y = np.load(self.target_path, mmap_mode="r")
+
+        if y is None:
+            features, target = self._select_columns(list(range(X.shape[1])))
+            y = X[:, target]
+            X = _take_columns(X, features)
+        elif self.columns is not None:
+            X = _take_columns(X, self.columns)
+        return X, y
+
+
+@SplitterDatasetFactory.register("columnar")
+class ColumnarDataset(FileDataset):
+    """
+    A dataset class for loading columnar data.
+
+    The data is either a directory holding one ``<column>.npy`` file per
+    column or a Parquet file, which requires ``pyarrow``. Only the
+    projected ``columns`` and the target column are read.
+    """
+
+    def load_data(self):
+        """
+        Read the projected columns into a memory-mapped feature matrix.
+
+        :return: The feature data (X) and the target data (y).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        if self.path.endswith(".parquet"):
+            return self._load_parquet()
+
+        names = sorted(name[:-len(".npy")] for name in os.listdir(self.path)
+                       if name.endswith(".npy"))
+        features, target = self._select_columns(names)
+        y = np.load(os.path.join(self.path, names[target] + ".npy"))
+        X = _temporary_memmap((len(y), len(features)), self.dtype)
+        for j, i in enumerate(features):
+            X[:, j] = np.load(os.path.join(self.path, names[i] + ".npy"),
+                              mmap_mode="r")
+        return X, y
+
+    def _load_parquet(self):
+        """
+        Read the projected columns of a Parquet file.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError(
+                "Reading Parquet files requires pyarrow, install it with "
+                "'pip install pyarrow'") from error
+
+        names = pq.read_schema(self.path).names
+        features, target = self._select_columns(names)
+        table = pq.read_table(self.path,
+                              columns=[names[i]
+                                       for i in features] + [names[target]])
+        X = _temporary_memmap((table.num_rows, len(features)), self.dtype)
+        for j in range(len(features)):
+            X[:, j] = table.column(j).to_numpy()
+        return X, table.column(len(features)).to_numpy()
+
+
+class SyntheticDataset(SplitterDataset):
+    """
+    A base class for generated datasets of any size.
+
+    The rows are generated in chunks of ``chunk_size`` rows written into a
+    temporary memory-mapped feature matrix, so that only the train and test
+    splits are held in memory. Every chunk draws from its own generator,
+    spawned from ``random_state`` with :py:class:`numpy.random.SeedSequence`,
+    and the parameters shared by all the rows, e.g. the class centers, from
+    another one, so the same settings always generate the same data.
+    """
+
+    #: The settings that define the generated data
+    PARAMS = ("n_samples", "n_features", "n_classes", "random_state",
+              "chunk_size")
+
+    def __init__(self,
+                 splitter: Splitter,
+                 n_samples: int = 10000,
+                 n_features: int = 20,
+                 n_classes: int = 2,
+                 random_state: int = 0,
+                 chunk_size: int = 10000,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the SyntheticDataset.
+
+        :param splitter: The splitter object used for splitting the dataset.
+        :type splitter: Splitter
+        :param n_samples: The number of rows.
+        :type n_samples: int, optional
+        :param n_features: The number of features.
+        :type n_features: int, optional
+        :param n_classes: The number of classes.
+        :type n_classes: int, optional
+        :param random_state: The seed of the generated data.
+        :type random_state: int, optional
+        :param chunk_size: The number of rows generated at once.
+        :type chunk_size: int, optional
+        :param cache: A cache of split and scaled datasets.
+        :type cache: DatasetCache, optional
+        :param dtype: The floating point type of the feature matrices, see
+            :py:class:`~simpleclassifier.base.SplitterDataset`.
+        :type dtype: str or np.dtype, optional
+        :param scaling: How the features are scaled, see
+            :py:class:`~simpleclassifier.base.SplitterDataset`.
+        :type scaling: str, optional
+        :raises ValueError: If a size is out of range.
+        """
+        if n_classes < 2:
+            raise ValueError("n_classes must be at least 2")
+        if n_samples < n_classes:
+            raise ValueError("n_samples must be at least n_classes")
+        if n_features < 1 or chunk_size < 1:
+            raise ValueError("n_features and chunk_size must be at least 1")
+        self.n_samples = n_samples
+        self.n_features = n_features
+        self.n_classes = n_classes
+        self.random_state = random_state
+        self.chunk_size = chunk_size
+        super().__init__(splitter, cache, dtype, scaling)
+
+    def cache_key_parts(self) -> tuple:
+        """
+        Identify the dataset by the settings of the generator.
+
+        :return: The values identifying the dataset.
+        :rtype: tuple
+        """
+        return super().cache_key_parts() + tuple(
+            getattr(self, name) for name in self.PARAMS)
+
+    def load_data(self):
+        """
+        Generate the data chunk by chunk.
+
+        :return: The feature data (X) and the target data (y).
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        X = _temporary_memmap((self.n_samples, self.n_features), self.dtype)
+        y = np.empty(self.n_samples, dtype=np.int64)
+        for rng, params, rows in self.iter_chunks():
+            self.fill_chunk(rng, params, X[rows], y[rows])
+        return X, y
+
+    def iter_chunks(self):
+        """
+        Iterate over the chunks of the generated rows.
+
+        :return: A generator of the random generator of each chunk, the
+            shared parameters and the slice of the rows of the chunk.
+        """
+        params_seed, chunks_seed = np.random.SeedSequence(
+            self.random_state).spawn(2)
+        params = self.make_params(np.random.default_rng(params_seed))
+        starts = range(0, self.n_samples, self.chunk_size)
+        for start, seed in zip(starts, chunks_seed.spawn(len(starts))):
+            stop = min(start + self.chunk_size, self.n_samples)
+            yield np.random.default_rng(seed), params, slice(start, stop)
+
+    def make_params(self, rng: np.random.Generator) -> dict:
+        """
+        Draw the parameters shared by all the chunks.
+
+        :param rng: The generator of the shared parameters.
+        :type rng: np.random.Generator
+        :return: The shared parameters.
+        :rtype: dict
+        """
+        return {}
+
+    @abc.abstractmethod
+    def fill_chunk(self, rng: np.random.Generator, params: dict, X: np.ndarray,
+                   y: np.ndarray):
+        """
+        Generate the rows of one chunk in place.
+
+        :param rng: The generator of the chunk.
+        :type rng: np.random.Generator
+        :param params: The shared parameters.
+        :type params: dict
+        :param X: The zero-filled feature matrix of the chunk.
+        :type X: np.ndarray
+        :param y: The target variable of the chunk.
+        :type y: np.ndarray
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the fill_chunk method")
+
+
+@SplitterDatasetFactory.register("blobs")
+class BlobsDataset(SyntheticDataset):
+    """
+    Gaussian blobs, one per class, with centers drawn uniformly in
+    ``[-center_box, center_box]`` for every feature.
+    """
+
+    PARAMS = SyntheticDataset.PARAMS + ("cluster_std", "center_box")
+
+    def __init__(self,
+                 splitter: Splitter,
+                 n_samples: int = 10000,
+                 n_features: int = 20,
+                 n_classes: int = 2,
+                 random_state: int = 0,
+                 chunk_size: int = 10000,
+                 cluster_std: float = 1.0,
+                 center_box: float = 10.0,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the BlobsDataset.
+
+        :param cluster_std: The standard deviation of the blobs.
+        :type cluster_std: float, optional
+        :param center_box: The bound of the coordinates of the centers.
+        :type center_box: float, optional
+
+        See :py:class:`SyntheticDataset` for the other parameters.
+        """
+        self.cluster_std = cluster_std
+        self.center_box = center_box
+        super().__init__(splitter, n_samples, n_features, n_classes,
+                         random_state, chunk_size, cache, dtype, scaling)
+
+    def make_params(self, rng: np.random.Generator) -> dict:
+        """
+        Draw the centers of the blobs.
+        """
+        return {
+            "centers":
+            rng.uniform(-self.center_box, self.center_box,
+                        (self.n_classes, self.n_features))
+        }
+
+    def fill_chunk(self, rng, params, X, y):
+        """
+        Draw the class of each row and scatter it around the class center.
+        """
+        y[:] = rng.integers(self.n_classes, size=len(y))
+        X[:] = rng.normal(scale=self.cluster_std, size=X.shape)
+        X += params["centers"][y]
+
+
+@SplitterDatasetFactory.register("moons")
+class MoonsDataset(SyntheticDataset):
+    """
+    Two interleaving half circles in the first two features, with Gaussian
+    ``noise``. The other features are pure noise.
+    """
+
+    PARAMS = SyntheticDataset.PARAMS + ("noise", )
+
+    def __init__(self,
+                 splitter: Splitter,
+                 n_samples: int = 10000,
+                 n_features: int = 2,
+                 n_classes: int = 2,
+                 random_state: int = 0,
+                 chunk_size: int = 10000,
+                 noise: float = 0.1,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the MoonsDataset.
+
+        :param noise: The standard deviation of the noise.
+        :type noise: float, optional
+        :raises ValueError: If n_classes is not 2 or n_features is below 2.
+
+        See :py:class:`SyntheticDataset` for the other parameters.
+        """
+        if n_classes != 2 or n_features < 2:
+            raise ValueError("moons has 2 classes and at least 2 features")
+        self.noise = noise
+        super().__init__(splitter, n_samples, n_features, n_classes,
+                         random_state, chunk_size, cache, dtype, scaling)
+
+    def fill_chunk(self, rng, params, X, y):
+        """
+        Draw the class of each row and a point on its half circle.
+        """
+        y[:] = rng.integers(2, size=len(y))
+        angle = rng.uniform(0, np.pi, size=len(y))
+        # the lower moon is flipped and shifted into the upper one
+        X[:, 0] = np.where(y == 0, np.cos(angle), 1 - np.cos(angle))
+        X[:, 1] = np.where(y == 0, np.sin(angle), 0.5 - np.sin(angle))
+        X[:, :2] += rng.normal(scale=self.noise, size=(len(y), 2))
+        X[:, 2:] = rng.normal(size=(len(y), X.shape[1] - 2))
+
+
+@SplitterDatasetFactory.register("sparse_high_dim")
+class SparseHighDimDataset(SyntheticDataset):
+    """
+    Non-negative features of which only a fraction ``density`` is non-zero,
+    like term frequencies of documents. The class of a row is the best
+    scoring of random sparse linear models.
+
+    The features are a CSR matrix built chunk by chunk, so the dense matrix
+    is never allocated.
+    """
+
+    PARAMS = SyntheticDataset.PARAMS + ("density", )
+
+    def __init__(self,
+                 splitter: Splitter,
+                 n_samples: int = 10000,
+                 n_features: int = 1000,
+                 n_classes: int = 2,
+                 random_state: int = 0,
+                 chunk_size: int = 10000,
+                 density: float = 0.01,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the SparseHighDimDataset.
+
+        :param density: The expected fraction of non-zero features.
+        :type density: float, optional
+        :raises ValueError: If density is not in (0, 1].
+
+        See :py:class:`SyntheticDataset` for the other parameters.
+        """
+        if not 0 < density <= 1:
+            raise ValueError("density must be in (0, 1]")
+        self.density = density
+        super().__init__(splitter, n_samples, n_features, n_classes,
+                         random_state, chunk_size, cache, dtype, scaling)
+
+    def make_params(self, rng: np.random.Generator) -> dict:
+        """
+        Draw the weights of the linear models, 10% of them non-zero.
+        """
+        weights = rng.normal(size=(self.n_features, self.n_classes))
+        weights[rng.random(self.n_features) > 0.1] = 0
+        return {"weights": weights}
+
+    def load_data(self):
+        """
+        Generate the sparse data chunk by chunk.
+
+        :return: The CSR feature matrix (X) and the target data (y).
+        :rtype: tuple[scipy.sparse.csr_matrix, np.ndarray]
+        """
+        y = np.empty(self.n_samples, dtype=np.int64)
+        chunks = [
+            self.make_chunk(rng, params, y[rows])
+            for rng, params, rows in self.iter_chunks()
+        ]
+        return sparse.vstack(chunks, format="csr"), y
+
+    def make_chunk(self, rng, params, y) -> sparse.csr_matrix:
+        """
+        Scatter the non-zero values and label each row by its best scoring
+        model.
+
+        :return: The features of the chunk.
+        :rtype: scipy.sparse.csr_matrix
+        """
+        size = len(y) * self.n_features
+        # draw the positions of the non-zero values instead of a dense mask
+        n_nonzero = rng.binomial(size, self.density)
+        positions = rng.integers(size, size=n_nonzero)
+        values = rng.exponential(size=n_nonzero)
+        # a position drawn twice keeps its last value
+        positions, last = np.unique(positions[::-1], return_index=True)
+        rows, columns = np.divmod(positions, self.n_features)
+        X = sparse.csr_matrix(
+            (values[::-1][last].astype(self.dtype), (rows, columns)),
+            shape=(len(y), self.n_features))
+        scores = X @ params["weights"]
+        scores += rng.normal(scale=0.1, size=scores.shape)
+        y[:] = scores.argmax(axis=1)
+        return X
+
+    def fill_chunk(self, rng, params, X, y):
+        """
+        Fill a dense chunk, e.g. for subclasses that need dense features.
+        """
+        X[:] = self.make_chunk(rng, params, y).toarray()
+
+
+@SplitterDatasetFactory.register("imbalanced")
+class ImbalancedDataset(SyntheticDataset):
+    """
+    Overlapping Gaussian blobs whose class frequencies decrease
+    geometrically, the most frequent class being ``imbalance`` times as
+    frequent as the least frequent one.
+    """
+
+    PARAMS = SyntheticDataset.PARAMS + ("imbalance", )
+
+    def __init__(self,
+                 splitter: Splitter,
+                 n_samples: int = 10000,
+                 n_features: int = 20,
+                 n_classes: int = 5,
+                 random_state: int = 0,
+                 chunk_size: int = 10000,
+                 imbalance: float = 10.0,
+                 cache: Optional[DatasetCache] = None,
+                 dtype=None,
+                 scaling: str = "auto"):
+        """
+        Initialize the ImbalancedDataset.
+
+        :param imbalance: The ratio of the frequencies of the most and the
+            least frequent classes.
+        :type imbalance: float, optional
+        :raises ValueError: If imbalance is smaller than 1.
+
+        See :py:class:`SyntheticDataset` for the other parameters.
+        """
+        if imbalance < 1:
+            raise ValueError("imbalance must be at least 1")
+        self.imbalance = imbalance
+        super().__init__(splitter, n_samples, n_features, n_classes,
+                         random_state, chunk_size, cache, dtype, scaling)
+
+    def make_params(self, rng: np.random.Generator) -> dict:
+        """
+        Draw the centers and the frequencies of the classes.
+        """
+        weights = self.imbalance**(-np.arange(self.n_classes) /
+                                   (self.n_classes - 1))
+        return {
+            "centers": rng.normal(size=(self.n_classes, self.n_features)),
+            "weights": weights / weights.sum(),
+        }
+
+    def fill_chunk(self, rng, params, X, y):
+        """
+        Draw the classes by frequency and scatter them around the centers.
+        """
+        y[:] = rng.choice(self.n_classes, size=len(y), p=params["weights"])
+        X[:] = rng.normal(size=X.shape)
+        X += params["centers"][y]
+
+
+def _temporary_memmap(shape: tuple, dtype=np.float64) -> np.memmap:
+    """
+    Allocate an array backed by an anonymous temporary file, which is
+    deleted once the array is garbage collected.
+    """
+    with tempfile.TemporaryFile() as file:
+        if shape[0] * shape[1] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(file, dtype=dtype, mode="w+", shape=shape)
+
+
+def _take_columns(X: np.ndarray, columns: list) -> np.ndarray:
+    """
+    Select columns of a matrix, keeping it memory-mapped when possible.
+    """
+    columns = list(columns)
+    if columns == list(range(X.shape[1])):
+        return X
+    out = _temporary_memmap((X.shape[0], len(columns)), X.dtype)
+    out[:] = X[:, columns]
+    return out
+
+
+def _load_npz_member(path: str, name: str) -> np.ndarray:
+    """
+    Memory-map an array of a ``.npz`` archive.
+
+    Members stored without compression are mapped at their offset in the
+    archive, compressed members are read into memory.
+    """
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name + ".npy")
+        if info.compress_type != zipfile.ZIP_STORED:
+            with archive.open(info) as member:
+                return np.lib.format.read_array(member)
+
+    with open(path, "rb") as file:
+        # the data follows the 30 bytes local file header, the file name
+        # and the extra field
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", file.read(4))
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        if np.lib.format.read_magic(file) == (1, 0):
+            header = np.lib.format.read_array_header_1_0(file)
+        else:
+            header = np.lib.format.read_array_header_2_0(file)
+        shape, fortran_order, dtype = header
+        offset = file.tell()
+    return np.memmap(path,
+                     dtype=dtype,
+                     mode="r",
+                     offset=offset,
+                     shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _parse_labels(labels: np.ndarray) -> np.ndarray:
+    """
+    Convert string labels to integers or floats when they are numeric.
+    """
+    try:
+        values = labels.astype(np.float64)
+    except ValueError:
+        return labels
+    if np.all(values == np.round(values)):
+        return values.astype(np.int64)
+    return values
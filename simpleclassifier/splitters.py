@@ -1,7 +1,10 @@
 from simpleclassifier.base import Splitter
 from simpleclassifier.factory import SplitterFactory
 
-from sklearn.model_selection import train_test_split
+import numpy as np
+from sklearn.model_selection import (KFold, RepeatedKFold,
+                                     RepeatedStratifiedKFold, ShuffleSplit,
+                                     StratifiedKFold, StratifiedShuffleSplit)
 
 
 @SplitterFactory.register("percentage")
@@ -17,26 +20,20 @@ class PercentageSplitter(Splitter):
     the same split will be produced every time.
     """
 
-    def split_data(self, X, y):
+    def split_indices(self, n_samples, y):
         """
-        Perform the data splitting based on the specified percentage.
+        Keep the first rows for training and the last ones for testing.
 
-        :param X: The input feature matrix.
-        :type X: array-like or sparse matrix
-        :param y: The target variable.
+        :param n_samples: The number of rows of the dataset.
+        :type n_samples: int
+        :param y: The target variable, unused.
         :type y: array-like
-        :return: The training and testing subsets.
-        :rtype: tuple (X_train, X_test, y_train, y_test)
+        :return: The slices of the training and testing rows, so the splits
+            are views of the dataset.
+        :rtype: tuple[slice, slice]
         """
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=self.test_size,
-            random_state=self.random_state,
-            shuffle=False,
-            stratify=None,
-        )
-        return X_train, X_test, y_train, y_test
+        n_train, _ = self.split_sizes(n_samples)
+        return slice(0, n_train), slice(n_train, n_samples)
 
 
 @SplitterFactory.register("percentage_shuffle")
@@ -50,26 +47,23 @@ class PercentageShuffleSplitter(Splitter):
     splitting with or without a random state.
     """
 
-    def split_data(self, X, y):
+    def split_indices(self, n_samples, y):
         """
-        Perform the data splitting based on the specified percentage with shuffling.
+        Draw the training and testing rows at random, like
+        :py:func:`sklearn.model_selection.train_test_split` with shuffling.
 
-        :param X: The input feature matrix.
-        :type X: array-like or sparse matrix
-        :param y: The target variable.
+        :param n_samples: The number of rows of the dataset.
+        :type n_samples: int
+        :param y: The target variable, unused.
         :type y: array-like
-        :return: The training and testing subsets.
-        :rtype: tuple (X_train, X_test, y_train, y_test)
+        :return: The indices of the training and testing rows.
+        :rtype: tuple[np.ndarray, np.ndarray]
         """
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=self.test_size,
-            random_state=self.random_state,
-            shuffle=True,
-            stratify=None,
-        )
-        return X_train, X_test, y_train, y_test
+        n_train, n_test = self.split_sizes(n_samples)
+        cv = ShuffleSplit(test_size=n_test,
+                          train_size=n_train,
+                          random_state=self.random_state)
+        return next(cv.split(np.empty((n_samples, 0))))
 
 
 @SplitterFactory.register("percentage_stratified")
@@ -84,24 +78,138 @@ class PercentageStratifiedSplitter(Splitter):
     the training and testing sets will also have the same proportion of each class.
     """
 
-    def split_data(self, X, y):
+    def split_indices(self, n_samples, y):
         """
-        Perform the data splitting based on the specified percentage
-        with stratification.
+        Draw the training and testing rows at random, keeping the class
+        proportions, like :py:func:`sklearn.model_selection.train_test_split`
+        with ``stratify=y``.
 
-        :param X: The input feature matrix.
-        :type X: array-like or sparse matrix
+        :param n_samples: The number of rows of the dataset.
+        :type n_samples: int
         :param y: The target variable.
         :type y: array-like
-        :return: The training and testing subsets.
-        :rtype: tuple (X_train, X_test, y_train, y_test)
+        :return: The indices of the training and testing rows.
+        :rtype: tuple[np.ndarray, np.ndarray]
         """
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=self.test_size,
-            random_state=self.random_state,
-            shuffle=True,
-            stratify=y,
-        )
-        return X_train, X_test, y_train, y_test
+        n_train, n_test = self.split_sizes(n_samples)
+        cv = StratifiedShuffleSplit(test_size=n_test,
+                                    train_size=n_train,
+                                    random_state=self.random_state)
+        return next(cv.split(np.empty((n_samples, 0)), y))
+
+
+@SplitterFactory.register("kfold")
+class KFoldSplitter(PercentageShuffleSplitter):
+    """
+    A splitter that holds out a shuffled test split and divides the training
+    data into ``n_splits`` cross-validation folds.
+
+    The fold indices are computed once per dataset and shared by the tuning
+    of every classifier and by the profiler.
+    """
+
+    def __init__(self,
+                 test_size: float,
+                 random_state: int = 0,
+                 n_splits: int = 5):
+        """
+        Initialize the KFoldSplitter.
+
+        :param test_size: The fraction that defines the test data split.
+        :type test_size: float
+        :param random_state: A controller that controls shuffling.
+        :type random_state: int, optional
+        :param n_splits: The number of folds.
+        :type n_splits: int, optional
+        :raises ValueError: If n_splits is smaller than 2.
+        """
+        if n_splits < 2:
+            raise ValueError("n_splits must be at least 2")
+        super().__init__(test_size, random_state)
+        self.n_splits = n_splits
+
+    def make_cv(self):
+        """
+        Create the scikit-learn cross-validator of the folds.
+
+        :return: The cross-validator.
+        """
+        return KFold(self.n_splits,
+                     shuffle=True,
+                     random_state=self.random_state)
+
+    def make_folds(self, y):
+        """
+        Compute the cross-validation folds of the training data.
+
+        Only the labels are needed, so the features are never copied.
+
+        :param y: The target variable of the training data.
+        :type y: np.ndarray
+        :return: The train and validation row indices of each fold.
+        :rtype: list[tuple[np.ndarray, np.ndarray]]
+        """
+        return list(self.make_cv().split(np.empty((len(y), 0)), y))
+
+
+@SplitterFactory.register("stratified_kfold")
+class StratifiedKFoldSplitter(KFoldSplitter):
+    """
+    A splitter that holds out a stratified test split and divides the
+    training data into ``n_splits`` stratified cross-validation folds.
+    """
+
+    split_indices = PercentageStratifiedSplitter.split_indices
+
+    def make_cv(self):
+        return StratifiedKFold(self.n_splits,
+                               shuffle=True,
+                               random_state=self.random_state)
+
+
+@SplitterFactory.register("repeated_kfold")
+class RepeatedKFoldSplitter(KFoldSplitter):
+    """
+    A splitter that repeats the K-fold cross-validation ``n_repeats`` times
+    with a different shuffling, giving ``n_splits * n_repeats`` folds.
+    """
+
+    def __init__(self,
+                 test_size: float,
+                 random_state: int = 0,
+                 n_splits: int = 5,
+                 n_repeats: int = 2):
+        """
+        Initialize the RepeatedKFoldSplitter.
+
+        :param n_repeats: The number of repetitions.
+        :type n_repeats: int, optional
+        :raises ValueError: If n_splits is smaller than 2 or n_repeats is
+            smaller than 1.
+
+        See :py:class:`KFoldSplitter` for the other parameters.
+        """
+        if n_repeats < 1:
+            raise ValueError("n_repeats must be at least 1")
+        super().__init__(test_size, random_state, n_splits)
+        self.n_repeats = n_repeats
+
+    def make_cv(self):
+        return RepeatedKFold(n_splits=self.n_splits,
+                             n_repeats=self.n_repeats,
+                             random_state=self.random_state)
+
+
+@SplitterFactory.register("repeated_stratified_kfold")
+class RepeatedStratifiedKFoldSplitter(RepeatedKFoldSplitter):
+    """
+    A splitter that repeats the stratified K-fold cross-validation
+    ``n_repeats`` times, with a stratified test split.
+    """
+
+    split_indices = PercentageStratifiedSplitter.split_indices
+
+    def make_cv(self):
+        return RepeatedStratifiedKFold(n_splits=self.n_splits,
+                                       n_repeats=self.n_repeats,
+                                       random_state=self.random_state)
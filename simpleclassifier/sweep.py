@@ -0,0 +1,130 @@
+"""
+Run several configurations in one process, e.g. every classifier on three
+datasets split three ways::
+
+    python simpleclassifier -y sweep.yml
+
+where ``sweep.yml`` declares the values to combine in a ``matrix``::
+
+    classifier_names: [knn, lr]
+    profile_metrics: [accuracy, fit_time]
+    matrix:
+      dataset_name: [iris, wine, breast_cancer]
+      splitting_strategy: [percentage, percentage_shuffle, kfold]
+
+Several configuration files, each with an optional matrix, are combined the
+same way. Each distinct dataset and split is loaded once, every classifier
+of every run is trained in one shared worker pool and the results are
+displayed in one table, labelled ``<dataset>/<splitter>/<classifier>``.
+"""
+import itertools
+import json
+
+from simpleclassifier.classifier_profiler import ClassifierProfiler
+from simpleclassifier.config import (Config, build_classifiers, build_dataset,
+                                     report_memory)
+from simpleclassifier.display import Display
+from simpleclassifier.profiler import Profiler
+from simpleclassifier.scheduler import CostModel
+
+# The configuration keys that select the data of a run, runs agreeing on
+# all of them share their dataset
+DATASET_KEYS = ("dataset_name", "splitting_strategy", "test_size",
+                "splitter_options", "dataset_options", "dataset_cache",
+                "dtype", "preprocessing")
+
+
+def expand_matrix(data: dict) -> list[dict]:
+    """
+    Expand the ``matrix`` of a configuration file into the keys of its runs.
+
+    The matrix maps configuration keys to lists of values, and every
+    combination of the values overrides the other keys of the file in one
+    run. A file without a matrix is a single run.
+
+    :param data: The keys of the configuration file.
+    :type data: dict
+    :return: The keys of every run, in the order of the combinations.
+    :rtype: list[dict]
+    :raises ValueError: If a matrix entry is not a non-empty list.
+    """
+    data = dict(data)
+    matrix = data.pop("matrix", None) or {}
+    for key, values in matrix.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"The matrix entry {key} must be a non-empty "
+                             "list of values")
+    return [{
+        **data,
+        **dict(zip(matrix, values))
+    } for values in itertools.product(*matrix.values())]
+
+
+def dataset_key(config: Config) -> str:
+    """
+    Identify the dataset of a run.
+
+    :param config: The configuration of the run.
+    :type config: Config
+    :return: The key shared by the runs with the same dataset and split.
+    :rtype: str
+    """
+    return json.dumps({key: getattr(config, key)
+                       for key in DATASET_KEYS},
+                      sort_keys=True,
+                      default=str)
+
+
+def run_sweep(configs: list[Config]) -> ClassifierProfiler:
+    """
+    Train, profile and display the classifiers of several runs together.
+
+    The quality and performance metrics are the union of the
+    ``profile_metrics`` of the runs. The ``display_format``, ``n_workers``,
+    ``predict_options`` and ``cost_history`` of the first run apply to the
+    whole sweep.
+
+    :param configs: The configuration of every run.
+    :type configs: list[Config]
+    :return: The profiler holding the trained classifiers and the results.
+    :rtype: ClassifierProfiler
+    """
+    first = configs[0]
+    datasets = {}
+    classifiers, labels, counts = [], [], {}
+    print("Loading all datasets...")
+    for config in configs:
+        key = dataset_key(config)
+        prefix = f"{config.dataset_name}/{config.splitting_strategy}"
+        if key not in datasets:
+            print("-", prefix, end=" ")
+            datasets[key] = build_dataset(config)
+            print("[Done]")
+            report_memory(config, datasets[key])
+        for classifier in build_classifiers(config, datasets[key]):
+            label = f"{prefix}/{type(classifier).__name__}"
+            counts[label] = counts.get(label, 0) + 1
+            if counts[label] > 1:
+                # runs whose labels collide, e.g. runs that only differ in
+                # their tuner_options
+                label = f"{label}#{counts[label]}"
+            classifiers.append(classifier)
+            labels.append(label)
+
+    metrics = []
+    for config in configs:
+        profile_metrics = config.profile_metrics
+        if isinstance(profile_metrics, str):
+            profile_metrics = [profile_metrics]
+        metrics += [m for m in profile_metrics or [] if m not in metrics]
+    classifier_profiler = ClassifierProfiler(
+        classifiers,
+        Profiler(metrics, **first.predict_options),
+        Display(),
+        n_workers=first.n_workers,
+        labels=labels,
+        cost_model=CostModel(first.cost_history))
+    classifier_profiler.train()
+    classifier_profiler.profile_classifiers()
+    classifier_profiler.display_results(first.display_format)
+    return classifier_profiler
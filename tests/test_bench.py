@@ -0,0 +1,103 @@
+from simpleclassifier.bench import (MEMORY_METRICS, TIME_METRICS,
+                                    BenchmarkCase, compare, expand_cases,
+                                    load_suite, main, resized_dataset_class,
+                                    run_suite)
+from simpleclassifier.splitter_datasets import IrisDataset
+from simpleclassifier.splitters import PercentageSplitter
+
+import json
+
+import pytest
+
+SUITE = """
+classifier_names: [nb]
+dataset_names: [iris]
+dataset_sizes: [null, 300]
+splitting_strategies: [percentage, percentage_shuffle]
+repeats: 1
+"""
+
+
+@pytest.fixture
+def suite_path(tmp_path):
+    path = tmp_path / "suite.yml"
+    path.write_text(SUITE)
+    return str(path)
+
+
+def test_expand_cases(suite_path):
+    suite = load_suite(suite_path)
+    assert suite["test_size"] == 0.2
+    assert [case.key for case in expand_cases(suite)] == [
+        "nb/iris/full/percentage",
+        "nb/iris/full/percentage_shuffle",
+        "nb/iris/300/percentage",
+        "nb/iris/300/percentage_shuffle",
+    ]
+
+
+def test_resized_dataset_class():
+    dataset_class = resized_dataset_class(IrisDataset, 400)
+    dataset = dataset_class(splitter=PercentageSplitter(test_size=0.25))
+    assert dataset.X_train.shape == (300, 4)
+    assert len(dataset.y_test) == 100
+
+
+def test_run_suite(suite_path):
+    results = run_suite(load_suite(suite_path), progress=None)
+    assert results["metadata"]["repeats"] == 1
+    result = results["results"]["nb/iris/300/percentage"]
+    assert result["n_train"] == 240 and result["n_test"] == 60
+    for metric in TIME_METRICS + MEMORY_METRICS:
+        assert result[metric] >= 0
+    # naive Bayes is not tuned
+    assert result["tune_time"] == 0
+
+
+def make_run(fit_time, fit_peak_memory=1.0):
+    return {
+        "results": {
+            BenchmarkCase("nb", "iris", None, "percentage").key: {
+                "fit_time": fit_time,
+                "fit_peak_memory": fit_peak_memory
+            }
+        }
+    }
+
+
+def test_compare():
+    baseline = make_run(1.0)
+    assert compare(make_run(1.4), baseline, threshold=1.5) == []
+    regressions = compare(make_run(2.0), baseline, threshold=1.5)
+    assert [(r["metric"], r["ratio"])
+            for r in regressions] == [("fit_time", 2.0)]
+    # differences below the noise floor are ignored
+    assert compare(make_run(0.004), make_run(0.001)) == []
+    assert [r["metric"] for r in compare(make_run(1.0, 10.0), baseline)
+            ] == ["fit_peak_memory"]
+    assert compare(make_run(2.0), {"results": {}}) == []
+
+
+def test_main_detects_regressions(suite_path, tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+    assert main(["-y", suite_path, "-b", str(baseline)]) == 0
+    assert "No baseline found" in capsys.readouterr().out
+
+    assert main(["-y", suite_path, "-b",
+                 str(baseline), "--update-baseline"]) == 0
+    stored = json.loads(baseline.read_text())
+    assert len(stored["results"]) == 4
+
+    # only the impossibly fast dataset times are regressions
+    for result in stored["results"].values():
+        result.update(dict.fromkeys(TIME_METRICS + MEMORY_METRICS, 1e9))
+        result["dataset_time"] = 0.0
+    baseline.write_text(json.dumps(stored))
+    assert main([
+        "-y", suite_path, "-b",
+        str(baseline), "-o",
+        str(output), "--min-seconds", "0"
+    ]) == 1
+    assert "4 regression(s)" in capsys.readouterr().out
+    assert len(json.loads(output.read_text())["results"]) == 4
@@ -0,0 +1,159 @@
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.cache import DatasetCache, TuningCache, fingerprint
+from simpleclassifier.hyperparameter_tuner import SKLearnHyperparameterTuner
+from simpleclassifier.splitters import (PercentageShuffleSplitter,
+                                        PercentageSplitter)
+
+import os
+import pickle
+import time
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.datasets import make_classification
+from sklearn.neighbors import KNeighborsClassifier
+
+PARAM_GRID = {'n_neighbors': [3, 5, 7], 'weights': ['uniform', 'distance']}
+
+
+@pytest.fixture
+def dataset():
+    class FakeDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+def test_fingerprint():
+    X = np.arange(12, dtype=np.float64).reshape(4, 3)
+    assert fingerprint(X) == fingerprint(X.copy())
+    assert fingerprint(X) != fingerprint(X.astype(np.float32))
+    assert fingerprint(X) != fingerprint(X.reshape(3, 4))
+    assert fingerprint(X[:, ::2]) == fingerprint(X[:, ::2].copy())
+    Y = X.copy()
+    Y[0, 0] = 1
+    assert fingerprint(X) != fingerprint(Y)
+
+
+def test_fingerprint_sparse():
+    X = sparse.random(50, 20, density=0.1, format="csr", random_state=0)
+    assert fingerprint(X) == fingerprint(X.copy())
+    assert fingerprint(X) == fingerprint(X.tocoo())
+    assert fingerprint(X) != fingerprint(X.toarray())
+    Y = X.copy()
+    Y.data[0] += 1
+    assert fingerprint(X) != fingerprint(Y)
+
+
+def test_tuning_cache_hit(dataset, tmp_path):
+    cache = TuningCache(str(tmp_path))
+    first = SKLearnHyperparameterTuner(dataset, cache=cache)
+    first_model = first.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert not first.cache_hit_
+    assert len(os.listdir(tmp_path)) == 1
+
+    second = SKLearnHyperparameterTuner(dataset, cache=cache)
+    second_model = second.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert second.cache_hit_
+    assert second.search_ is None
+    assert second.best_params_ == first.best_params_
+    np.testing.assert_array_equal(second.cv_results_["mean_test_score"],
+                                  first.cv_results_["mean_test_score"])
+    np.testing.assert_array_equal(second_model.predict(dataset.X_test),
+                                  first_model.predict(dataset.X_test))
+
+
+def test_tuning_cache_key_changes(dataset, tmp_path):
+    cache = TuningCache(str(tmp_path), store_estimator=False)
+    SKLearnHyperparameterTuner(dataset,
+                               cache=cache).tune_model(KNeighborsClassifier(),
+                                                       PARAM_GRID)
+
+    other_grid = SKLearnHyperparameterTuner(dataset, cache=cache)
+    other_grid.tune_model(KNeighborsClassifier(), {'n_neighbors': [3, 5]})
+    other_strategy = SKLearnHyperparameterTuner(dataset,
+                                                strategy="random",
+                                                strategy_options={"n_iter": 2},
+                                                cache=cache)
+    other_strategy.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert not other_grid.cache_hit_
+    assert not other_strategy.cache_hit_
+
+    # without a stored estimator the best parameters are refitted
+    refit = SKLearnHyperparameterTuner(dataset, cache=cache)
+    model = refit.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert refit.cache_hit_
+    assert model.get_params(
+    )["n_neighbors"] == refit.best_params_["n_neighbors"]
+
+
+def test_tuning_cache_eviction(tmp_path):
+    cache = TuningCache(str(tmp_path), max_bytes=3000)
+    for i in range(5):
+        cache.put(f"key{i}", {"i": i}, {"scores": np.zeros(100)}, None)
+        time.sleep(0.01)
+    assert sum(
+        os.path.getsize(tmp_path / name)
+        for name in os.listdir(tmp_path)) <= 3000
+    assert cache.get("key0") is None
+    assert cache.get("key4")["best_params"] == {"i": 4}
+
+    expired = TuningCache(str(tmp_path), max_age=0)
+    assert expired.get("key4") is None
+    expired.evict()
+    assert os.listdir(tmp_path) == []
+
+
+def test_tuning_cache_from_config(tmp_path):
+    cache = TuningCache.from_config({
+        "directory": str(tmp_path),
+        "max_size_mb": 1,
+        "max_age_days": 2,
+        "store_estimator": False
+    })
+    assert cache.max_bytes == 2**20
+    assert cache.max_age == 2 * 86400
+    assert not cache.store_estimator
+
+
+class CountingDataset(SplitterDataset):
+    loads = 0
+
+    def load_data(self):
+        CountingDataset.loads += 1
+        return make_classification(n_samples=100,
+                                   n_features=10,
+                                   random_state=42)
+
+
+def test_dataset_cache(tmp_path):
+    CountingDataset.loads = 0
+    cache = DatasetCache(str(tmp_path))
+    splitter = PercentageShuffleSplitter(test_size=0.3, random_state=1)
+    first = CountingDataset(splitter=splitter, cache=cache)
+    second = CountingDataset(splitter=splitter, cache=cache)
+    assert CountingDataset.loads == 1
+    for name in SplitterDataset.ARRAY_NAMES:
+        assert isinstance(getattr(second, name), np.memmap)
+        np.testing.assert_array_equal(getattr(first, name),
+                                      getattr(second, name))
+    X = np.random.default_rng(0).normal(size=(5, 10))
+    np.testing.assert_allclose(second.scaler.transform(X),
+                               first.scaler.transform(X))
+
+    # the memory maps are reopened instead of copied when pickled
+    restored = pickle.loads(pickle.dumps(second))
+    assert isinstance(restored.X_train, np.memmap)
+    np.testing.assert_array_equal(restored.X_train, first.X_train)
+
+    # a different split is a different entry
+    CountingDataset(splitter=PercentageShuffleSplitter(test_size=0.3,
+                                                       random_state=2),
+                    cache=cache)
+    CountingDataset(splitter=PercentageSplitter(test_size=0.3), cache=cache)
+    assert CountingDataset.loads == 3
+    assert len(os.listdir(tmp_path)) == 3
@@ -1,10 +1,13 @@
 from simpleclassifier.classifiers import (KNNClassifier,
                                           LogisticRegressionClassifier,
+                                          MLPNetworkClassifier,
+                                          NaiveBayesClassifier,
                                           RandomForestEnsembleClassifier,
-                                          SVMClassifier)
-from simpleclassifier.splitter_datasets import SplitterDataset
+                                          SGDLinearClassifier, SVMClassifier)
+from simpleclassifier.splitter_datasets import IrisDataset, SplitterDataset
 from simpleclassifier.splitters import PercentageSplitter
 
+import numpy as np
 import pytest
 from sklearn.datasets import make_classification
 import warnings
@@ -61,3 +64,132 @@ def test_svm_classifier(dataset):
     svm_classifier.fit()
     predictions = svm_classifier.predict()
     assert len(predictions) == len(dataset.y_test)
+
+
+@pytest.mark.parametrize(
+    "classifier_class",
+    [SGDLinearClassifier, NaiveBayesClassifier, MLPNetworkClassifier])
+@ignore_convergence_warnings
+def test_incremental_classifier(dataset, classifier_class):
+    clf = classifier_class(dataset=dataset, batch_size=16, n_epochs=3)
+    clf.fit()
+    predictions = clf.predict()
+    assert len(predictions) == len(dataset.y_test)
+
+
+def test_naive_bayes_chunks_match_full_fit(dataset):
+    from sklearn.naive_bayes import GaussianNB
+
+    clf = NaiveBayesClassifier(dataset=dataset, batch_size=8, n_epochs=1)
+    clf.fit()
+    full = GaussianNB().fit(dataset.X_train, dataset.y_train)
+    np.testing.assert_allclose(clf.model.theta_, full.theta_)
+    np.testing.assert_array_equal(clf.predict(), full.predict(dataset.X_test))
+
+
+def test_incremental_early_stopping(dataset):
+    clf = SGDLinearClassifier(dataset=dataset,
+                              batch_size=10,
+                              n_epochs=50,
+                              early_stopping=True,
+                              patience=2)
+    clf.fit()
+    assert 1 <= len(clf.holdout_scores_) < 50
+    holdout = clf.holdout_rows_
+    assert len(holdout) == 10
+    assert clf.model.score(dataset.X_train[holdout],
+                           dataset.y_train[holdout]) == max(
+                               clf.holdout_scores_)
+
+
+def test_incremental_early_stopping_sees_every_class():
+    # the unshuffled split of iris sorts the training rows by class, so a
+    # holdout of the last rows would hide the last class from the training
+    dataset = IrisDataset(splitter=PercentageSplitter(test_size=0.3))
+    clf = SGDLinearClassifier(dataset=dataset,
+                              batch_size=10,
+                              early_stopping=True)
+    clf.fit()
+    holdout = clf.holdout_rows_
+    assert len(holdout) == 10
+    assert set(dataset.y_train[holdout]) == {0, 1, 2}
+    assert set(np.delete(dataset.y_train, holdout)) == {0, 1, 2}
+
+
+def test_incremental_invalid_options(dataset):
+    with pytest.raises(ValueError):
+        SGDLinearClassifier(dataset=dataset, batch_size=0)
+    with pytest.raises(ValueError):
+        SGDLinearClassifier(dataset=dataset, n_epochs=0)
+
+
+def test_iter_train_batches_are_views(dataset):
+    batches = list(dataset.iter_train_batches(16))
+    assert [len(y) for _, y in batches] == [16, 16, 16, 16, 6]
+    assert all(np.shares_memory(X, dataset.X_train) for X, _ in batches)
+
+    shuffled = list(
+        dataset.iter_train_batches(16, stop=64, rng=np.random.default_rng(0)))
+    assert sorted(len(y) for _, y in shuffled) == [16, 16, 16, 16]
+    np.testing.assert_array_equal(
+        np.sort(np.concatenate([y for _, y in shuffled])),
+        np.sort(dataset.y_train[:64]))
+
+
+@pytest.mark.parametrize("n_jobs", [None, 3, -1])
+def test_batched_predict_matches_full_predict(dataset, n_jobs):
+    clf = KNNClassifier(dataset=dataset)
+    clf.fit()
+    expected = clf.predict()
+    np.testing.assert_array_equal(clf.predict(batch_size=7, n_jobs=n_jobs),
+                                  expected)
+    np.testing.assert_array_equal(clf.predict(dataset.X_train, batch_size=16),
+                                  clf.model.predict(dataset.X_train))
+    np.testing.assert_array_equal(
+        np.concatenate(list(clf.predict_iter(batch_size=7))), expected)
+    with pytest.raises(ValueError):
+        clf.predict(batch_size=0)
+
+
+def test_batched_predict_keeps_string_labels(dataset):
+    from sklearn.naive_bayes import GaussianNB
+
+    labels = np.array(["a", "long label"])
+    clf = NaiveBayesClassifier(dataset=dataset)
+    clf.model = GaussianNB().fit(dataset.X_train, labels[dataset.y_train])
+    # the first batch only predicts the short label
+    X = dataset.X_test[np.argsort(clf.model.predict(dataset.X_test) != "a",
+                                  kind="stable")]
+    np.testing.assert_array_equal(clf.predict(X, batch_size=4),
+                                  clf.model.predict(X))
+
+
+@pytest.fixture
+def sparse_dataset():
+    from scipy import sparse
+
+    class FakeSparseDataset(SplitterDataset):
+        def load_data(self):
+            X, y = make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+            X[X < 0.5] = 0
+            return sparse.csr_matrix(X), y
+
+    return FakeSparseDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+@ignore_convergence_warnings
+@pytest.mark.parametrize(
+    "classifier_class",
+    [KNNClassifier, LogisticRegressionClassifier, SGDLinearClassifier])
+def test_sparse_classifier(sparse_dataset, classifier_class):
+    classifier = classifier_class(sparse_dataset)
+    classifier.fit()
+    np.testing.assert_array_equal(classifier.predict(batch_size=7),
+                                  classifier.predict())
+
+
+def test_sparse_rejected_by_dense_classifier(sparse_dataset):
+    with pytest.raises(ValueError):
+        NaiveBayesClassifier(sparse_dataset)
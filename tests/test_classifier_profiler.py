@@ -0,0 +1,81 @@
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifier_profiler import ClassifierProfiler
+from simpleclassifier.classifiers import (KNNClassifier,
+                                          LogisticRegressionClassifier,
+                                          RandomForestEnsembleClassifier)
+from simpleclassifier.display import Display
+from simpleclassifier.profiler import Profiler
+from simpleclassifier.splitters import PercentageSplitter
+
+import time
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+
+
+class FakeDataset(SplitterDataset):
+    def load_data(self):
+        return make_classification(n_samples=100,
+                                   n_features=10,
+                                   random_state=42)
+
+
+@pytest.fixture
+def dataset():
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+def make_classifiers(dataset):
+    return [
+        KNNClassifier(dataset=dataset),
+        LogisticRegressionClassifier(dataset=dataset),
+        RandomForestEnsembleClassifier(dataset=dataset),
+    ]
+
+
+def test_invalid_n_workers(dataset):
+    with pytest.raises(ValueError):
+        ClassifierProfiler([], Profiler(["accuracy"]), Display(), n_workers=0)
+
+
+def test_parallel_train_matches_sequential(dataset, capsys):
+    sequential = ClassifierProfiler(make_classifiers(dataset),
+                                    Profiler(["accuracy"]), Display())
+    sequential.train()
+    sequential_out = capsys.readouterr().out
+
+    parallel = ClassifierProfiler(make_classifiers(dataset),
+                                  Profiler(["accuracy"]),
+                                  Display(),
+                                  n_workers=3)
+    parallel.train()
+    parallel_out, makespan = capsys.readouterr().out.rsplit("Makespan:", 1)
+
+    assert parallel_out == sequential_out
+    assert "(longest first on 3 workers)" in makespan
+    assert parallel.makespan_ > 0 and parallel.predicted_makespan_ > 0
+    assert [type(c) for c in parallel.classifiers
+            ] == [type(c) for c in sequential.classifiers]
+    assert all(c.dataset is dataset for c in parallel.classifiers)
+    # KNN and LR tuning is deterministic, RF depends on the global RNG
+    for seq_clf, par_clf in zip(sequential.classifiers[:2],
+                                parallel.classifiers[:2]):
+        assert seq_clf.model.get_params() == par_clf.model.get_params()
+    np.testing.assert_array_equal(sequential.classifiers[0].predict(),
+                                  parallel.classifiers[0].predict())
+
+
+def test_budget_limited_results_are_marked(dataset, capsys):
+    expired = {"deadline": time.time() - 1}
+    classifier_profiler = ClassifierProfiler([
+        KNNClassifier(dataset=dataset, tuner_options=expired),
+        LogisticRegressionClassifier(dataset=dataset)
+    ], Profiler(["accuracy"]), Display())
+    classifier_profiler.train()
+    classifier_profiler.profile_classifiers()
+    classifier_profiler.display_results("dump")
+    assert list(classifier_profiler.results) == [
+        "KNNClassifier [budget-limited]", "LogisticRegressionClassifier"
+    ]
+    assert "- KNNClassifier [budget-limited]: " in capsys.readouterr().out
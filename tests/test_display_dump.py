@@ -83,3 +83,13 @@ def test_classifier_with_no_metrics(capsys):
     display.dump({'classifier1': {}})
     captured = capsys.readouterr()
     assert captured.out == START_END_BORDER + START_END_BORDER
+
+
+def test_performance_metric_units(capsys):
+    display = Display()
+    display.dump({'classifier1': {'accuracy': 0.7, 'fit_time': 1.5}})
+    captured = capsys.readouterr()
+    assert captured.out == f"{START_END_BORDER}{METRIC_BORDER}accuracy" \
+                           f"\n- classifier1: 0.7\n{METRIC_BORDER}" \
+                           f"fit_time [s]\n- classifier1: 1.5\n" \
+                           f"{START_END_BORDER}"
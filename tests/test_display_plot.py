@@ -48,3 +48,27 @@ def test_plot_multiple_classifiers_multiple_metrics():
             display.plot(results)
         except Exception as e:
             pytest.fail(f"Unexpected Exception {e}")
+
+
+def test_plot_performance_metrics_on_separate_axes():
+    display = Display()
+    results = {
+        'classifier1': {
+            'accuracy': 0.9,
+            'f1': 0.8,
+            'fit_time': 1.5,
+            'row_latency_p99': 0.2
+        },
+        'classifier2': {
+            'accuracy': 0.85,
+            'f1': 0.75,
+            'fit_time': 0.1,
+            'row_latency_p99': 0.05
+        }
+    }
+    with patch('matplotlib.pyplot.show'):
+        display.plot(results)
+    import matplotlib.pyplot as plt
+    axes = plt.gcf().axes
+    assert [ax.get_ylabel() for ax in axes] == ['Score', 's', 'ms']
+    plt.close('all')
@@ -1,17 +1,28 @@
 from sklearn.datasets import make_classification
 
-from simpleclassifier.factory import (ClassifierFactory,
+from simpleclassifier.factory import (ClassifierFactory, SearchStrategyFactory,
                                       SplitterDatasetFactory, SplitterFactory)
 from simpleclassifier.base import Classifier, SplitterDataset, Splitter
 from simpleclassifier.classifiers import (KNNClassifier,
                                           LogisticRegressionClassifier,
+                                          MLPNetworkClassifier,
+                                          NaiveBayesClassifier,
                                           RandomForestEnsembleClassifier,
-                                          SVMClassifier)
-from simpleclassifier.splitter_datasets import (BreastCancerDataset,
-                                                IrisDataset, WineDataset)
-from simpleclassifier.splitters import (PercentageSplitter,
+                                          SGDLinearClassifier, SVMClassifier)
+from simpleclassifier.hyperparameter_tuner import (GridSearchStrategy,
+                                                   HalvingSearchStrategy,
+                                                   RandomSearchStrategy,
+                                                   TPESearchStrategy)
+from simpleclassifier.splitter_datasets import (
+    BlobsDataset, BreastCancerDataset, ColumnarDataset, CSVDataset,
+    ImbalancedDataset, IrisDataset, MoonsDataset, NPYDataset,
+    SparseHighDimDataset, WineDataset)
+from simpleclassifier.splitters import (KFoldSplitter, PercentageSplitter,
                                         PercentageShuffleSplitter,
-                                        PercentageStratifiedSplitter)
+                                        PercentageStratifiedSplitter,
+                                        RepeatedKFoldSplitter,
+                                        RepeatedStratifiedKFoldSplitter,
+                                        StratifiedKFoldSplitter)
 
 import pytest
 
@@ -32,8 +43,8 @@ def splitter():
     return PercentageSplitter(test_size=0.3, random_state=42)
 
 
-@pytest.mark.parametrize("codename",
-                         ["knn", "lr", "rf", "svm", "invalid_name"])
+@pytest.mark.parametrize(
+    "codename", ["knn", "lr", "rf", "svm", "sgd", "nb", "mlp", "invalid_name"])
 def test_create_classifier_instance(codename, dataset):
     factory = ClassifierFactory()
 
@@ -44,7 +55,7 @@ def test_create_classifier_instance(codename, dataset):
         assert str(
             excinfo.value) == f"No classifierfactory registered for {codename}, " \
                               f"registered classifierfactorys are: ['knn', 'lr', " \
-                              f"'rf', 'svm']"
+                              f"'rf', 'svm', 'sgd', 'nb', 'mlp']"
     else:
         instance = factory.create_instance(codename, dataset=dataset)
         assert isinstance(instance, Classifier)
@@ -56,7 +67,10 @@ def test_classifier_registration():
         "knn": KNNClassifier,
         "lr": LogisticRegressionClassifier,
         "rf": RandomForestEnsembleClassifier,
-        "svm": SVMClassifier
+        "svm": SVMClassifier,
+        "sgd": SGDLinearClassifier,
+        "nb": NaiveBayesClassifier,
+        "mlp": MLPNetworkClassifier
     }
 
     with pytest.raises(TypeError):
@@ -84,7 +98,9 @@ def test_create_splitter_dataset_instance(codename, splitter):
         assert str(
             excinfo.value) == f"No splitterdatasetfactory registered for {codename}, " \
                               f"registered splitterdatasetfactorys are: [" \
-                              f"'breast_cancer', 'iris', 'wine']"
+                              f"'breast_cancer', 'iris', 'wine', 'csv', " \
+                              f"'npy', 'columnar', 'blobs', 'moons', " \
+                              f"'sparse_high_dim', 'imbalanced']"
     else:
         instance = factory.create_instance(codename, splitter=splitter)
         assert isinstance(instance, SplitterDataset)
@@ -95,7 +111,14 @@ def test_splitter_dataset_registration():
     assert factory.registry == {
         "breast_cancer": BreastCancerDataset,
         "iris": IrisDataset,
-        "wine": WineDataset
+        "wine": WineDataset,
+        "csv": CSVDataset,
+        "npy": NPYDataset,
+        "columnar": ColumnarDataset,
+        "blobs": BlobsDataset,
+        "moons": MoonsDataset,
+        "sparse_high_dim": SparseHighDimDataset,
+        "imbalanced": ImbalancedDataset
     }
 
     with pytest.raises(TypeError):
@@ -124,7 +147,9 @@ def test_create_splitter_instance(codename, test_size=0.3):
         assert str(
             excinfo.value) == f"No splitterfactory registered for {codename}, " \
                               f"registered splitterfactorys are: ['percentage', " \
-                              f"'percentage_shuffle', 'percentage_stratified']"
+                              f"'percentage_shuffle', 'percentage_stratified', " \
+                              f"'kfold', 'stratified_kfold', 'repeated_kfold', " \
+                              f"'repeated_stratified_kfold']"
     else:
         instance = factory.create_instance(codename, test_size=test_size)
         assert isinstance(instance, Splitter)
@@ -135,7 +160,11 @@ def test_splitter_registration():
     assert factory.registry == {
         "percentage": PercentageSplitter,
         "percentage_shuffle": PercentageShuffleSplitter,
-        "percentage_stratified": PercentageStratifiedSplitter
+        "percentage_stratified": PercentageStratifiedSplitter,
+        "kfold": KFoldSplitter,
+        "stratified_kfold": StratifiedKFoldSplitter,
+        "repeated_kfold": RepeatedKFoldSplitter,
+        "repeated_stratified_kfold": RepeatedStratifiedKFoldSplitter
     }
 
     with pytest.raises(TypeError):
@@ -149,3 +178,19 @@ def test_splitter_registration():
         @factory.register("percentage")
         class DuplicatePercentageSplitter(Splitter):
             pass
+
+
+def test_search_strategy_registration():
+    factory = SearchStrategyFactory()
+    assert factory.registry == {
+        "grid": GridSearchStrategy,
+        "random": RandomSearchStrategy,
+        "halving": HalvingSearchStrategy,
+        "tpe": TPESearchStrategy
+    }
+
+    with pytest.raises(TypeError):
+
+        @factory.register("invalid")
+        class InvalidSearchStrategy:
+            pass
@@ -0,0 +1,437 @@
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.hyperparameter_tuner import (BudgetedSearchCV, Integer,
+                                                   Real, SearchSpace,
+                                                   SKLearnHyperparameterTuner)
+from simpleclassifier.splitters import KFoldSplitter, PercentageSplitter
+
+import time
+import warnings
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+from sklearn.dummy import DummyClassifier
+from sklearn.exceptions import FitFailedWarning
+from sklearn.model_selection import ParameterGrid
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+
+PARAM_GRID = {'n_neighbors': [3, 5, 7], 'weights': ['uniform', 'distance']}
+
+
+@pytest.fixture
+def dataset():
+    class FakeDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+def test_invalid_backend(dataset):
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, backend="invalid")
+
+
+def test_invalid_cv(dataset):
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, cv=1)
+
+
+@pytest.mark.parametrize("backend", [None, "loky", "threading"])
+def test_parallel_tuning_matches_sequential(dataset, backend):
+    sequential = SKLearnHyperparameterTuner(dataset).tune_model(
+        KNeighborsClassifier(), PARAM_GRID)
+    parallel = SKLearnHyperparameterTuner(dataset,
+                                          n_jobs=2,
+                                          backend=backend,
+                                          pre_dispatch=4,
+                                          cv=5).tune_model(
+                                              KNeighborsClassifier(),
+                                              PARAM_GRID)
+    assert parallel.get_params() == sequential.get_params()
+
+
+def test_invalid_strategy(dataset):
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, strategy="invalid")
+
+
+def test_random_strategy_budget(dataset):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       strategy="random",
+                                       strategy_options={"n_iter": 3})
+    tuner.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert len(tuner.search_.cv_results_["params"]) == 3
+
+
+def test_halving_strategy_by_samples(dataset):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       cv=3,
+                                       strategy="halving",
+                                       strategy_options={"factor": 2})
+    best = tuner.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert tuner.search_.resource == "n_samples"
+    assert best.get_params()["n_neighbors"] in PARAM_GRID["n_neighbors"]
+    # later iterations only evaluate the surviving candidates
+    assert tuner.search_.n_candidates_[-1] < len(
+        tuner.search_.cv_results_["params"]) / 2
+
+
+def test_halving_strategy_by_n_estimators(dataset):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       cv=3,
+                                       strategy="halving",
+                                       strategy_options={"factor": 2})
+    best = tuner.tune_model(RandomForestClassifier(random_state=0), {
+        'n_estimators': [10, 20, 40],
+        'criterion': ['gini', 'entropy']
+    })
+    assert tuner.search_.resource == "n_estimators"
+    assert tuner.search_.n_resources_ == [10, 20]
+    assert best.n_estimators == 20
+
+
+def test_search_space_from_config():
+    space = SearchSpace.from_config({
+        'C': {
+            'type': 'float',
+            'low': 0.01,
+            'high': 100,
+            'log': True
+        },
+        'degree': {
+            'type': 'int',
+            'low': 2,
+            'high': 4
+        },
+        'kernel': {
+            'type': 'categorical',
+            'choices': ['rbf', 'sigmoid']
+        },
+        'gamma': ['scale', 'auto'],
+    })
+    assert isinstance(space.dimensions['C'], Real)
+    assert isinstance(space.dimensions['degree'], Integer)
+    assert space.dimensions['kernel'].choices == ['rbf', 'sigmoid']
+    assert space.dimensions['gamma'].choices == ['scale', 'auto']
+    with pytest.raises(ValueError):
+        space.to_param_grid()
+
+    with pytest.raises(ValueError):
+        SearchSpace.from_config({'C': {'type': 'invalid'}})
+    with pytest.raises(ValueError):
+        SearchSpace.from_config({'C': {'low': 0, 'high': 1, 'log': True}})
+
+
+def test_grid_strategy_rejects_continuous_space(dataset):
+    tuner = SKLearnHyperparameterTuner(
+        dataset, search_space={'C': {
+            'low': 0.1,
+            'high': 10
+        }})
+    with pytest.raises(ValueError):
+        tuner.tune_model(SVC(), {})
+
+
+def test_random_strategy_with_search_space(dataset):
+    tuner = SKLearnHyperparameterTuner(
+        dataset,
+        strategy="random",
+        strategy_options={"n_iter": 4},
+        search_space={'C': {
+            'low': 0.1,
+            'high': 10,
+            'log': True
+        }})
+    best = tuner.tune_model(SVC(), {})
+    assert 0.1 <= best.C <= 10
+
+
+def test_tpe_strategy(dataset):
+    search_space = {
+        'C': {
+            'type': 'float',
+            'low': 0.01,
+            'high': 100,
+            'log': True
+        },
+        'gamma': {
+            'type': 'float',
+            'low': 1e-4,
+            'high': 1,
+            'log': True
+        },
+        'kernel': ['rbf', 'sigmoid'],
+    }
+    options = {"n_trials": 12, "n_startup_trials": 4, "batch_size": 2}
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       n_jobs=2,
+                                       strategy="tpe",
+                                       strategy_options=options,
+                                       search_space=search_space)
+    best = tuner.tune_model(SVC(), {})
+    results = tuner.search_.cv_results_
+    assert len(results["params"]) == 12
+    assert results["rank_test_score"][tuner.search_.best_index_] == 1
+    assert 0.01 <= best.C <= 100
+    assert 1e-4 <= best.gamma <= 1
+    assert best.kernel in ['rbf', 'sigmoid']
+
+    # the same random state proposes the same trials
+    again = SKLearnHyperparameterTuner(dataset,
+                                       strategy="tpe",
+                                       strategy_options=options,
+                                       search_space=search_space)
+    again.tune_model(SVC(), {})
+    assert again.search_.cv_results_["params"] == results["params"]
+
+
+def test_tpe_strategy_with_param_grid(dataset):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       strategy="tpe",
+                                       strategy_options={"n_trials": 5})
+    best = tuner.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert best.n_neighbors in PARAM_GRID['n_neighbors']
+    params = tuner.search_.cv_results_["params"]
+    # trials are not evaluated twice while the grid is not exhausted
+    assert len({tuple(sorted(p.items())) for p in params}) == len(params)
+
+
+def test_tuner_uses_dataset_folds():
+
+    class FoldDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    dataset = FoldDataset(splitter=KFoldSplitter(test_size=0.3, n_splits=4))
+    tuner = SKLearnHyperparameterTuner(dataset)
+    assert tuner.cv is dataset.cv_folds
+    tuner.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert tuner.search_.n_splits_ == 4
+    # an explicit number of folds takes precedence
+    assert SKLearnHyperparameterTuner(dataset, cv=3).cv == 3
+    assert SKLearnHyperparameterTuner(dataset, cv=3)._describe_search(
+        PARAM_GRID) != tuner._describe_search(PARAM_GRID)
+
+
+class SlowClassifier(ClassifierMixin, BaseEstimator):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def fit(self, X, y):
+        time.sleep(self.delay)
+        self.model_ = DummyClassifier().fit(X, y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(X)
+
+
+class FailingClassifier(SlowClassifier):
+    def __init__(self, delay=0.0, fail=False):
+        super().__init__(delay)
+        self.fail = fail
+
+    def fit(self, X, y):
+        if self.fail:
+            raise ValueError("invalid candidate")
+        return super().fit(X, y)
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_tpe_scores_failed_trials_as_nan(dataset, n_jobs):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       n_jobs=n_jobs,
+                                       strategy="tpe",
+                                       strategy_options={
+                                           "n_trials": 6,
+                                           "n_startup_trials": 2
+                                       })
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FitFailedWarning)
+        tuner.tune_model(FailingClassifier(), {
+            "delay": [0.0, 0.001, 0.002],
+            "fail": [True, False]
+        })
+    scores = tuner.cv_results_["mean_test_score"]
+    failed = [params["fail"] for params in tuner.cv_results_["params"]]
+    assert any(failed) and not all(failed)
+    assert all(np.isnan(score) == fail for score, fail in zip(scores, failed))
+    assert tuner.best_params_["fail"] is False
+
+
+def test_all_failed_trials_raise(dataset):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       strategy="tpe",
+                                       strategy_options={"n_trials": 2})
+    with pytest.warns(FitFailedWarning), pytest.raises(ValueError,
+                                                       match="All the 2"):
+        tuner.tune_model(FailingClassifier(), {"fail": [True]})
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_time_budget_cancels_running_fits(dataset, n_jobs):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       n_jobs=n_jobs,
+                                       cv=2,
+                                       time_budget=1.5)
+    start = time.perf_counter()
+    best = tuner.tune_model(SlowClassifier(), {"delay": [0.0, 30.0]})
+    assert time.perf_counter() - start < 10
+    assert tuner.budget_exhausted_
+    assert tuner.best_params_ == {"delay": 0.0}
+    assert best.delay == 0.0 and hasattr(best, "model_")
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_time_budget_scores_failed_candidates_as_nan(dataset, n_jobs):
+    param_grid = {"delay": [0.0, 0.001], "fail": [True, False]}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FitFailedWarning)
+        grid = SKLearnHyperparameterTuner(dataset)
+        grid.tune_model(FailingClassifier(), param_grid)
+        budgeted = SKLearnHyperparameterTuner(dataset,
+                                              n_jobs=n_jobs,
+                                              time_budget=300)
+        budgeted.tune_model(FailingClassifier(), param_grid)
+    assert isinstance(budgeted.search_, BudgetedSearchCV)
+    assert not budgeted.budget_exhausted_
+    assert budgeted.best_params_ == grid.best_params_
+    np.testing.assert_array_equal(
+        np.isnan(budgeted.cv_results_["mean_test_score"]),
+        np.isnan(grid.cv_results_["mean_test_score"]))
+    with pytest.raises(ValueError, match="All the 1"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FitFailedWarning)
+            SKLearnHyperparameterTuner(dataset, time_budget=300).tune_model(
+                FailingClassifier(), {"fail": [True]})
+
+
+def test_time_budget_without_expiry_matches_grid_search(dataset):
+    grid = SKLearnHyperparameterTuner(dataset)
+    grid.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    budgeted = SKLearnHyperparameterTuner(dataset, time_budget=300)
+    budgeted.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert isinstance(budgeted.search_, BudgetedSearchCV)
+    assert not budgeted.budget_exhausted_
+    assert budgeted.best_params_ == grid.best_params_
+    assert budgeted.cv_results_["params"] == grid.cv_results_["params"]
+
+
+@pytest.mark.parametrize("strategy", ["grid", "random", "tpe"])
+def test_expired_deadline_uses_default_parameters(dataset, strategy):
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       strategy=strategy,
+                                       deadline=time.time() - 1)
+    best = tuner.tune_model(KNeighborsClassifier(), PARAM_GRID)
+    assert tuner.budget_exhausted_
+    assert tuner.best_params_ == {}
+    assert best.get_params() == KNeighborsClassifier().get_params()
+    assert hasattr(best, "classes_")
+
+
+def test_invalid_time_budget(dataset):
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, time_budget=0)
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, strategy="halving", time_budget=10)
+    with pytest.raises(ValueError, match="backend"):
+        SKLearnHyperparameterTuner(dataset,
+                                   backend="threading",
+                                   time_budget=10)
+
+
+SVM_SPACE = {
+    'C': [0.1, 1.0, 10.0],
+    'kernel': ['linear', 'poly', 'rbf'],
+    'degree': {
+        'type': 'categorical',
+        'choices': [2, 3],
+        'when': {
+            'kernel': 'poly'
+        }
+    },
+    'gamma': {
+        'type': 'categorical',
+        'choices': ['scale', 'auto'],
+        'when': {
+            'kernel': ['poly', 'rbf']
+        }
+    },
+}
+
+
+def test_conditional_space_prunes_inactive_dimensions():
+    space = SearchSpace.from_config(SVM_SPACE)
+    assert space.conditions == {
+        'degree': {
+            'kernel': ['poly']
+        },
+        'gamma': {
+            'kernel': ['poly', 'rbf']
+        }
+    }
+    assert space.prune({
+        'C': 1.0,
+        'kernel': 'rbf',
+        'degree': 3,
+        'gamma': 'auto'
+    }) == {
+        'C': 1.0,
+        'kernel': 'rbf',
+        'gamma': 'auto'
+    }
+    candidates = list(ParameterGrid(space.to_param_grid()))
+    # linear: C, poly: C x degree x gamma, rbf: C x gamma
+    assert len(candidates) == 3 + 12 + 6
+    assert candidates[0] == {'C': 0.1, 'kernel': 'linear'}
+    assert all('degree' not in params for params in candidates
+               if params['kernel'] != 'poly')
+    with pytest.raises(ValueError):
+        SearchSpace({'degree': Integer(2, 4)},
+                    conditions={'degree': {
+                        'kernel': ['poly']
+                    }})
+
+
+def test_conditional_grid_matches_full_grid(dataset):
+    full = dict(SVM_SPACE, degree=[2, 3], gamma=['scale', 'auto'])
+    tuner = SKLearnHyperparameterTuner(dataset)
+    full_model = tuner.tune_model(SVC(), full)
+    full_score = tuner.search_.best_score_
+    pruned = SKLearnHyperparameterTuner(dataset)
+    pruned_model = pruned.tune_model(SVC(), SearchSpace.from_config(SVM_SPACE))
+    assert len(pruned.cv_results_["params"]) == 21
+    assert pruned.search_.best_score_ == full_score
+    assert pruned.best_params_ == SearchSpace.from_config(SVM_SPACE).prune(
+        tuner.best_params_)
+    assert (pruned_model.predict(dataset.X_test) == full_model.predict(
+        dataset.X_test)).all()
+
+
+@pytest.mark.parametrize("strategy", ["random", "tpe", "halving"])
+def test_strategies_search_active_dimensions(dataset, strategy):
+    space = SearchSpace.from_config({
+        **SVM_SPACE, 'C': {
+            'type': 'float',
+            'low': 0.1,
+            'high': 10.0,
+            'log': True
+        }
+    } if strategy != "halving" else SVM_SPACE)
+    options = {"random": {"n_iter": 8}, "tpe": {"n_trials": 12}}
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       strategy=strategy,
+                                       strategy_options=options.get(strategy))
+    tuner.tune_model(SVC(), space)
+    for params in tuner.cv_results_["params"]:
+        assert params == space.prune(params)
+        assert ('degree' in params) == (params['kernel'] == 'poly')
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("matplotlib", "sklearn.ensemble", "sklearn.svm",
+                 "sklearn.neighbors", "sklearn.linear_model")
+
+
+def imported_modules(code: str) -> set[str]:
+    """
+    Run the code in a fresh interpreter and return which of the heavy
+    modules it imported.
+    """
+    script = (f"import sys\n{code}\n"
+              f"print(' '.join(m for m in {HEAVY_MODULES!r} "
+              "if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", script],
+                         env=env,
+                         check=True,
+                         capture_output=True,
+                         text=True).stdout
+    return set(out.split())
+
+
+def test_cli_startup_imports_no_heavy_modules():
+    assert imported_modules("import simpleclassifier.__main__") == set()
+
+
+def test_classifier_only_imports_its_estimator():
+    modules = imported_modules("""
+from sklearn.datasets import make_classification
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.factory import ClassifierFactory, SplitterFactory
+
+class FakeDataset(SplitterDataset):
+    def load_data(self):
+        return make_classification(n_samples=50, random_state=42)
+
+splitter = SplitterFactory.create_instance("percentage", test_size=0.3)
+ClassifierFactory.create_instance("knn", dataset=FakeDataset(splitter))
+""")
+    assert "sklearn.neighbors" in modules
+    assert "sklearn.ensemble" not in modules
+    assert "matplotlib" not in modules
+
+
+@pytest.mark.parametrize("name,module", [
+    ("knn", "simpleclassifier.classifiers"),
+    ("iris", "simpleclassifier.splitter_datasets"),
+    ("percentage", "simpleclassifier.splitters"),
+])
+def test_lazy_registration(name, module):
+    modules = imported_modules(f"""
+from simpleclassifier.factory import (ClassifierFactory,
+                                      SplitterDatasetFactory, SplitterFactory)
+factories = [ClassifierFactory, SplitterDatasetFactory, SplitterFactory]
+factory = next(f for f in factories if {name!r} in f.lazy_registry)
+assert {module!r} not in sys.modules
+assert factory.get_class({name!r}).__module__ == {module!r}
+""")
+    assert "matplotlib" not in modules
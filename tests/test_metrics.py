@@ -0,0 +1,99 @@
+from simpleclassifier.metrics import (METRICS, confusion_matrix,
+                                      register_metric)
+
+import warnings
+
+import numpy as np
+import pytest
+from sklearn import metrics
+
+SKLEARN_METRICS = {
+    "accuracy":
+    metrics.accuracy_score,
+    "precision":
+    lambda t, p: metrics.precision_score(
+        t, p, average="weighted", zero_division=0),
+    "recall":
+    lambda t, p: metrics.recall_score(
+        t, p, average="weighted", zero_division=0),
+    "f1":
+    lambda t, p: metrics.f1_score(t, p, average="weighted", zero_division=0),
+    "precision_macro":
+    lambda t, p: metrics.precision_score(
+        t, p, average="macro", zero_division=0),
+    "recall_macro":
+    lambda t, p: metrics.recall_score(t, p, average="macro", zero_division=0),
+    "f1_macro":
+    lambda t, p: metrics.f1_score(t, p, average="macro", zero_division=0),
+    "precision_micro":
+    lambda t, p: metrics.precision_score(
+        t, p, average="micro", zero_division=0),
+    "recall_micro":
+    lambda t, p: metrics.recall_score(t, p, average="micro", zero_division=0),
+    "f1_micro":
+    lambda t, p: metrics.f1_score(t, p, average="micro", zero_division=0),
+    "balanced_accuracy":
+    metrics.balanced_accuracy_score,
+    "mcc":
+    metrics.matthews_corrcoef,
+}
+
+
+def make_labels(kind):
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 4, size=500)
+    # mostly correct, with a class that is never predicted and one that only
+    # appears in the predictions
+    y_pred = np.where(rng.random(500) < 0.7, y_true, rng.integers(0, 5, 500))
+    y_pred[y_pred == 2] = 1
+    if kind == "large":
+        return y_true * 100_000, y_pred * 100_000
+    if kind == "str":
+        names = np.array(["ant", "bee", "cat", "dog", "eel"])
+        return names[y_true], names[y_pred]
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize("kind", ["int", "large", "str"])
+def test_confusion_matrix_matches_sklearn(kind):
+    y_true, y_pred = make_labels(kind)
+    matrix, labels = confusion_matrix(y_true, y_pred)
+    np.testing.assert_array_equal(labels, np.union1d(y_true, y_pred))
+    np.testing.assert_array_equal(
+        matrix, metrics.confusion_matrix(y_true, y_pred, labels=labels))
+
+
+@pytest.mark.parametrize("kind", ["int", "large", "str"])
+@pytest.mark.parametrize("metric", list(SKLEARN_METRICS))
+def test_metrics_match_sklearn(kind, metric):
+    y_true, y_pred = make_labels(kind)
+    matrix, _ = confusion_matrix(y_true, y_pred)
+    with warnings.catch_warnings():
+        # sklearn warns about the class missing from the true labels
+        warnings.simplefilter("ignore")
+        expected = SKLEARN_METRICS[metric](y_true, y_pred)
+    assert METRICS[metric](matrix) == pytest.approx(expected)
+
+
+def test_constant_prediction_metrics():
+    y_true = np.array([0, 0, 1, 1])
+    matrix, _ = confusion_matrix(y_true, np.zeros(4, dtype=int))
+    assert METRICS["mcc"](matrix) == 0.0
+    assert METRICS["precision"](matrix) == pytest.approx(0.25)
+
+
+def test_confusion_matrix_length_mismatch():
+    with pytest.raises(ValueError):
+        confusion_matrix([0, 1], [0])
+
+
+def test_register_metric():
+    @register_metric("error_rate")
+    def error_rate(matrix):
+        return 1 - np.trace(matrix) / matrix.sum()
+
+    try:
+        matrix, _ = confusion_matrix([0, 1, 1, 0], [0, 1, 0, 0])
+        assert METRICS["error_rate"](matrix) == 0.25
+    finally:
+        del METRICS["error_rate"]
@@ -0,0 +1,167 @@
+import csv
+import sys
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+
+from simpleclassifier.__main__ import main
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifiers import (KNNClassifier,
+                                          LogisticRegressionClassifier,
+                                          NaiveBayesClassifier)
+from simpleclassifier.persistence import ModelStore, load_features
+from simpleclassifier.splitters import PercentageSplitter
+
+RAW_X, RAW_Y = make_classification(n_samples=100,
+                                   n_features=10,
+                                   random_state=42)
+
+
+class FakeDataset(SplitterDataset):
+    def load_data(self):
+        return RAW_X.copy(), np.array(["no", "yes"])[RAW_Y]
+
+
+@pytest.fixture
+def dataset():
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3),
+                       dtype="float32")
+
+
+@pytest.fixture
+def classifiers(dataset):
+    classifiers = [
+        KNNClassifier(dataset=dataset),
+        LogisticRegressionClassifier(dataset=dataset),
+    ]
+    for classifier in classifiers:
+        classifier.fit()
+        classifier.fit_time_ = 1.5
+    return classifiers
+
+
+def test_save_and_load(dataset, classifiers, tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    store.save(classifiers)
+    assert [entry["codename"]
+            for entry in store.manifest["classifiers"]] == ["knn", "lr"]
+
+    loaded = store.load(dataset)
+    assert [type(c) for c in loaded] == [type(c) for c in classifiers]
+    # the training rows of k-nearest neighbors are memory-mapped
+    assert isinstance(loaded[0].model._fit_X, np.memmap)
+    assert loaded[0].fit_time_ == 1.5
+    for original, restored in zip(classifiers, loaded):
+        assert restored.dataset is dataset
+        np.testing.assert_array_equal(original.predict(), restored.predict())
+
+    assert [type(c) for c in store.load(dataset, names=["lr"])
+            ] == [LogisticRegressionClassifier]
+    with pytest.raises(ValueError):
+        store.load(dataset, names=["svm"])
+
+
+def test_save_replaces_models(dataset, classifiers, tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    store.save(classifiers)
+    classifier = NaiveBayesClassifier(dataset=dataset)
+    classifier.fit()
+    store.save([classifier])
+    assert [entry["name"] for entry in store.manifest["classifiers"]
+            ] == ["NaiveBayesClassifier"]
+    assert sorted(p.name for p in (tmp_path / "models").iterdir()) == [
+        "NaiveBayesClassifier.joblib", "manifest.json", "scaler.joblib"
+    ]
+
+
+def test_save_keeps_unrelated_files(classifiers, tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        ModelStore(str(tmp_path)).save(classifiers)
+    assert notes.read_text() == "keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.txt"]
+
+    # a store with an unrelated file is not replaced either
+    store = ModelStore(str(tmp_path / "models"))
+    store.save(classifiers)
+    (tmp_path / "models" / "notes.txt").write_text("keep me")
+    with pytest.raises(FileExistsError):
+        store.save(classifiers)
+    assert (tmp_path / "models" / "notes.txt").read_text() == "keep me"
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    ModelStore(str(empty)).save(classifiers)
+    assert (empty / ModelStore.MANIFEST).exists()
+
+
+def test_load_checks_dataset(classifiers, tmp_path):
+    store = ModelStore(str(tmp_path / "models"))
+    with pytest.raises(FileNotFoundError):
+        store.manifest
+    store.save(classifiers)
+    other = FakeDataset(splitter=PercentageSplitter(test_size=0.5),
+                        dtype="float32")
+    with pytest.warns(UserWarning):
+        store.load(other)
+
+
+@pytest.mark.parametrize("batch_size", [None, 7])
+def test_predict_raw_features(dataset, classifiers, tmp_path, batch_size):
+    store = ModelStore(str(tmp_path / "models"))
+    store.save(classifiers)
+    predictions = store.predict(RAW_X[70:], batch_size=batch_size)
+    assert list(predictions) == [
+        "KNNClassifier", "LogisticRegressionClassifier"
+    ]
+    for classifier in classifiers:
+        expected = dataset.decode_labels(classifier.predict())
+        np.testing.assert_array_equal(predictions[type(classifier).__name__],
+                                      expected)
+    with pytest.raises(ValueError):
+        store.predict(RAW_X[:, :5])
+
+
+def test_load_features(tmp_path):
+    np.save(tmp_path / "X.npy", RAW_X)
+    np.savetxt(tmp_path / "X.csv", RAW_X, delimiter=",")
+    assert isinstance(load_features(str(tmp_path / "X.npy")), np.memmap)
+    np.testing.assert_allclose(load_features(str(tmp_path / "X.csv")), RAW_X)
+
+
+def test_cli_save_load_and_predict(tmp_path, monkeypatch, capsys):
+    config = tmp_path / "config.yml"
+    config.write_text("classifier_names: [nb]\n"
+                      "dataset_name: iris\n"
+                      "profile_metrics: [accuracy]\n")
+    models = str(tmp_path / "models")
+    monkeypatch.setattr(
+        sys, "argv",
+        ["prog", "-y", str(config), "--save-models", models])
+    main()
+    trained = capsys.readouterr().out
+    assert "Models saved to" in trained
+
+    monkeypatch.setattr(
+        sys, "argv",
+        ["prog", "-y", str(config), "--load-models", models])
+    main()
+    loaded = capsys.readouterr().out
+    assert "Training all classifiers" not in loaded
+    assert trained.split("Displaying results...")[1] == loaded.split(
+        "Displaying results...")[1]
+
+    from sklearn.datasets import load_iris
+    np.save(tmp_path / "X.npy", load_iris().data[:5])
+    output = tmp_path / "predictions.csv"
+    monkeypatch.setattr(sys, "argv", [
+        "prog", "--load-models", models, "--predict",
+        str(tmp_path / "X.npy"), "-o",
+        str(output)
+    ])
+    main()
+    with open(output, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows == [["NaiveBayesClassifier"]] + [["0"]] * 5
@@ -0,0 +1,155 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifiers import NaiveBayesClassifier
+from simpleclassifier.hyperparameter_tuner import (Categorical, SearchSpace,
+                                                   SKLearnHyperparameterTuner)
+from simpleclassifier.preprocessing import make_preprocessor, prefix_params
+from simpleclassifier.splitters import KFoldSplitter, PercentageSplitter
+
+
+class FakeDataset(SplitterDataset):
+    def load_data(self):
+        return make_classification(n_samples=100,
+                                   n_features=10,
+                                   random_state=42)
+
+
+class CountingScaler(StandardScaler):
+    n_fits = 0
+
+    def fit(self, X, y=None, sample_weight=None):
+        CountingScaler.n_fits += 1
+        return super().fit(X, y, sample_weight)
+
+
+@pytest.fixture
+def dataset():
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+def test_make_preprocessor():
+    preprocessor = make_preprocessor(
+        ["standard", {
+            "pca": {
+                "n_components": 3
+            }
+        }])
+    assert [name for name, _ in preprocessor.steps] == ["standard", "pca"]
+    assert preprocessor.named_steps["pca"].n_components == 3
+
+
+@pytest.mark.parametrize("steps", [["invalid"], []])
+def test_make_preprocessor_invalid(steps):
+    with pytest.raises(ValueError):
+        make_preprocessor(steps)
+
+
+def test_preprocessing_fitted_once_per_fold():
+    dataset = FakeDataset(splitter=KFoldSplitter(test_size=0.3, n_splits=4))
+    CountingScaler.n_fits = 0
+    preprocessing = dataset.attach_preprocessing(CountingScaler())
+
+    SKLearnHyperparameterTuner(dataset).tune_model(KNeighborsClassifier(),
+                                                   {"n_neighbors": [3, 5, 7]})
+    # one fit per fold and one on the whole training data
+    assert CountingScaler.n_fits == 5
+    SKLearnHyperparameterTuner(dataset).tune_model(LogisticRegression(),
+                                                   {"C": [0.1, 1.0]})
+    assert CountingScaler.n_fits == 5
+    assert preprocessing.hits > preprocessing.misses
+
+
+def test_tuned_model_matches_pipeline_search(dataset):
+    dataset.attach_preprocessing(StandardScaler())
+    tuner = SKLearnHyperparameterTuner(dataset, cv=5)
+    model = tuner.tune_model(KNeighborsClassifier(),
+                             {"n_neighbors": [3, 5, 7]})
+
+    search = GridSearchCV(Pipeline([("preprocessing", StandardScaler()),
+                                    ("model", KNeighborsClassifier())]), {
+                                        "model__n_neighbors": [3, 5, 7]
+                                    },
+                          cv=5).fit(dataset.X_train, dataset.y_train)
+    assert isinstance(model, Pipeline)
+    assert tuner.best_params_ == {
+        "n_neighbors": search.best_params_["model__n_neighbors"]
+    }
+    assert list(tuner.cv_results_["param_n_neighbors"]) == [3, 5, 7]
+    np.testing.assert_allclose(tuner.cv_results_["mean_test_score"],
+                               search.cv_results_["mean_test_score"])
+    np.testing.assert_array_equal(model.predict(dataset.X_test),
+                                  search.predict(dataset.X_test))
+
+
+def test_conditional_space_behind_preprocessing(dataset):
+    space = SearchSpace(
+        {
+            "n_neighbors": Categorical([3, 5]),
+            "weights": Categorical(["uniform", "distance"]),
+            "p": Categorical([1, 2])
+        },
+        conditions={"p": {
+            "weights": "distance"
+        }})
+    prefixed = prefix_params(space, "estimator__")
+    assert prefixed.conditions == {
+        "estimator__p": {
+            "estimator__weights": ["distance"]
+        }
+    }
+    dataset.attach_preprocessing(StandardScaler())
+    tuner = SKLearnHyperparameterTuner(dataset, cv=3)
+    tuner.tune_model(KNeighborsClassifier(), space)
+    assert tuner.cv_results_["params"] == [
+        space.prune(params) for params in tuner.cv_results_["params"]
+    ]
+    assert len(tuner.cv_results_["params"]) == 6
+
+
+def test_incremental_classifier_transforms_chunks(dataset):
+    CountingScaler.n_fits = 0
+    preprocessing = dataset.attach_preprocessing(CountingScaler())
+    clf = NaiveBayesClassifier(dataset=dataset, batch_size=16)
+    clf.fit()
+    # the preprocessing was fitted once and never memoized the whole
+    # transformed training data
+    assert CountingScaler.n_fits == 1
+    assert preprocessing.nbytes == 0
+    assert isinstance(clf.model, Pipeline)
+
+    full = GaussianNB().fit(StandardScaler().fit_transform(dataset.X_train),
+                            dataset.y_train)
+    np.testing.assert_allclose(clf.model.named_steps["model"].theta_,
+                               full.theta_)
+
+
+def test_memo_evicts_least_recently_used(dataset):
+    preprocessing = dataset.attach_preprocessing(StandardScaler(),
+                                                 max_bytes=1000)
+    rows = [np.arange(start, start + 10) for start in range(0, 40, 10)]
+    for fold_rows in rows:
+        preprocessing.fit_transform(fold_rows)
+    # each transformed fold takes 800 bytes, only the last one fits
+    assert preprocessing.nbytes == 800
+    preprocessing.fit_transform(rows[-1])
+    assert preprocessing.hits == 1
+
+
+def test_pickle_drops_memo(dataset):
+    preprocessing = dataset.attach_preprocessing(StandardScaler())
+    preprocessing.fit_transform()
+    restored = pickle.loads(pickle.dumps(preprocessing))
+    assert restored.nbytes == 0
+    _, Xt = restored.fit_transform()
+    np.testing.assert_allclose(Xt, preprocessing.fit_transform()[1])
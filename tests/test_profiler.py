@@ -0,0 +1,98 @@
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifier_profiler import _fit_classifier
+from simpleclassifier.classifiers import KNNClassifier
+from simpleclassifier.profiler import PERFORMANCE_METRICS, Profiler
+from simpleclassifier.splitters import (PercentageSplitter,
+                                        RepeatedKFoldSplitter)
+
+import math
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.metrics import accuracy_score, f1_score
+
+
+@pytest.fixture
+def classifier():
+    class FakeDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    clf = KNNClassifier(dataset=FakeDataset(splitter=PercentageSplitter(
+        test_size=0.3)))
+    clf.fit()
+    return clf
+
+
+def test_profiler_results(classifier):
+    y_pred = classifier.predict()
+    y_test = classifier.dataset.y_test
+    results = Profiler(["f1", "accuracy", "mcc"], batch_size=8).run(classifier)
+    assert list(results) == ["f1", "accuracy", "mcc"]
+    assert results["accuracy"] == pytest.approx(accuracy_score(y_test, y_pred))
+    assert results["f1"] == pytest.approx(
+        f1_score(y_test, y_pred, average="weighted"))
+
+
+def test_profiler_single_metric_string(classifier):
+    assert list(Profiler("accuracy").run(classifier)) == ["accuracy"]
+
+
+def test_profiler_invalid_metrics(classifier):
+    with pytest.raises(ValueError):
+        Profiler(["accuracy", "invalid"])
+    with pytest.raises(RuntimeError):
+        Profiler([]).run(classifier)
+
+
+def test_profiler_performance_metrics(classifier):
+    _fit_classifier(classifier, trace_memory=True)
+    metrics = ["accuracy"] + list(PERFORMANCE_METRICS)
+    results = Profiler(metrics,
+                       n_repeats=2,
+                       latency_rows=10,
+                       latency_batch_size=8).run(classifier)
+    assert list(results) == metrics
+    assert results["fit_time"] >= results["tune_time"] > 0
+    assert results["fit_peak_memory"] > 0
+    assert results["predict_throughput"] > 0
+    for kind in ("row", "batch"):
+        p50, p95, p99 = (results[f"{kind}_latency_p{q}"] for q in (50, 95, 99))
+        assert 0 < p50 <= p95 <= p99
+
+
+def test_profiler_without_fit_record(classifier):
+    results = Profiler(["fit_time"]).run(classifier)
+    assert math.isnan(results["fit_time"])
+
+
+def test_profiler_invalid_timing_options():
+    with pytest.raises(ValueError):
+        Profiler(["accuracy"], n_repeats=0)
+    with pytest.raises(ValueError):
+        Profiler(["accuracy"], latency_rows=0)
+
+
+def test_profiler_fold_metrics():
+    class FoldDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    dataset = FoldDataset(
+        splitter=RepeatedKFoldSplitter(test_size=0.3, n_splits=3, n_repeats=2))
+    clf = KNNClassifier(dataset=dataset)
+    clf.fit()
+    results = Profiler(["accuracy", "fit_time"]).run(clf)
+    folds = [results[f"accuracy_fold_{i}"] for i in range(6)]
+    assert list(results)[:2] == ["accuracy", "fit_time"]
+    assert results["accuracy_cv_mean"] == pytest.approx(np.mean(folds))
+    assert results["accuracy_cv_std"] == pytest.approx(np.std(folds))
+    assert "fit_time_fold_0" not in results
+
+    assert list(Profiler(["accuracy"],
+                         fold_metrics=False).run(clf)) == ["accuracy"]
@@ -0,0 +1,111 @@
+import json
+
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifiers import (KNNClassifier,
+                                          RandomForestEnsembleClassifier,
+                                          SGDLinearClassifier, SVMClassifier)
+from simpleclassifier.hyperparameter_tuner import SKLearnHyperparameterTuner
+from simpleclassifier.scheduler import (PRIORS, CostModel, LPTGridSearchCV,
+                                        lpt_makespan, lpt_order)
+from simpleclassifier.splitters import PercentageSplitter
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.model_selection import GridSearchCV
+from sklearn.svm import SVC
+
+PARAM_GRID = {'C': [0.1, 1.0, 10.0], 'kernel': ['linear', 'rbf']}
+
+
+@pytest.fixture
+def dataset():
+    class FakeDataset(SplitterDataset):
+        def load_data(self):
+            return make_classification(n_samples=100,
+                                       n_features=10,
+                                       random_state=42)
+
+    return FakeDataset(splitter=PercentageSplitter(test_size=0.3))
+
+
+def test_lpt_order_is_longest_first_and_stable():
+    assert lpt_order([1, 5, 2, 5]) == [1, 3, 2, 0]
+
+
+def test_lpt_makespan():
+    assert lpt_makespan([3, 3, 2, 2, 2], 2) == 7
+    assert lpt_makespan([3, 1, 1], 4) == 3
+    assert lpt_makespan([1, 2, 3], 1) == 6
+
+
+def test_cost_model_priors_rank_estimators(dataset):
+    cost_model = CostModel()
+    knn = cost_model.estimate_classifier(KNNClassifier(dataset=dataset))
+    svm = cost_model.estimate_classifier(SVMClassifier(dataset=dataset))
+    sgd = cost_model.estimate_classifier(SGDLinearClassifier(dataset=dataset))
+    assert svm > knn > sgd > 0
+    forest = RandomForestEnsembleClassifier(dataset=dataset).model
+    assert cost_model.estimate(forest, {"n_estimators": 200}, 1e6,
+                               1) == (2 * PRIORS["RandomForestClassifier"])
+
+
+def test_cost_model_learns_and_saves(tmp_path):
+    path = tmp_path / "costs.json"
+    cost_model = CostModel(str(path))
+    cv_results = {
+        "params": [{
+            "C": 1.0
+        }, {
+            "C": 10.0
+        }],
+        "mean_fit_time": [1.0, 3.0],
+        "mean_score_time": [0.0, 0.0],
+    }
+    cost_model.record_search(SVC(), cv_results, 1e6, 1)
+    assert cost_model.estimate(SVC(), {"C": 10.0}, 1e6, 1) == 3.0
+    # unseen parameters use the median rate of the estimator
+    assert cost_model.estimate(SVC(), {"C": 5.0}, 2e6, 1) == 4.0
+    cost_model.save()
+
+    assert set(json.loads(path.read_text())) == {"SVC"}
+    assert CostModel(str(path)).estimate(SVC(), {"C": 1.0}, 1e6, 1) == 1.0
+    # halving searches fit on subsets and are not recorded
+    cost_model.record_search(SVC(), {
+        **cv_results, "n_resources": [10, 20]
+    }, 1e6, 1)
+    assert cost_model.rates["SVC"][json.dumps({"C": 1.0})][1] == 1
+
+
+def test_lpt_search_matches_grid_search(dataset):
+    X, y = dataset.X_train, dataset.y_train
+    grid = GridSearchCV(SVC(), PARAM_GRID, n_jobs=2).fit(X, y)
+    lpt = LPTGridSearchCV(SVC(), PARAM_GRID, n_jobs=2).fit(X, y)
+
+    assert lpt.best_params_ == grid.best_params_
+    assert lpt.cv_results_["params"] == grid.cv_results_["params"]
+    np.testing.assert_array_equal(lpt.cv_results_["mean_test_score"],
+                                  grid.cv_results_["mean_test_score"])
+    np.testing.assert_array_equal(lpt.cv_results_["rank_test_score"],
+                                  grid.cv_results_["rank_test_score"])
+    assert lpt.predicted_makespan_ > 0 and lpt.makespan_ > 0
+
+
+def test_tuner_schedules_parallel_grid_searches(dataset, tmp_path):
+    path = tmp_path / "costs.json"
+    tuner = SKLearnHyperparameterTuner(dataset,
+                                       n_jobs=2,
+                                       cost_history=str(path))
+    tuner.tune_model(SVC(), PARAM_GRID)
+    assert isinstance(tuner.search_, LPTGridSearchCV)
+    assert len(json.loads(path.read_text())["SVC"]) == 6
+
+    fifo = SKLearnHyperparameterTuner(dataset, n_jobs=2, schedule="fifo")
+    fifo.tune_model(SVC(), PARAM_GRID)
+    assert type(fifo.search_) is GridSearchCV
+    assert fifo.best_params_ == tuner.best_params_
+
+
+def test_invalid_schedule(dataset):
+    with pytest.raises(ValueError):
+        SKLearnHyperparameterTuner(dataset, schedule="invalid")
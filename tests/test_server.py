@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.classifiers import (KNNClassifier,
+                                          LogisticRegressionClassifier)
+from simpleclassifier.persistence import ModelStore
+from simpleclassifier.server import (MicroBatcher, PredictionServer,
+                                     generate_load)
+from simpleclassifier.splitters import PercentageSplitter
+
+RAW_X, RAW_Y = make_classification(n_samples=200, n_features=8, random_state=0)
+
+
+class FakeDataset(SplitterDataset):
+
+    def load_data(self):
+        return RAW_X.copy(), np.array(["a", "b"])[RAW_Y]
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    dataset = FakeDataset(splitter=PercentageSplitter(test_size=0.3),
+                          dtype="float32")
+    classifiers = [
+        KNNClassifier(dataset=dataset),
+        LogisticRegressionClassifier(dataset=dataset),
+    ]
+    for classifier in classifiers:
+        classifier.fit()
+    store = ModelStore(str(tmp_path_factory.mktemp("server") / "models"))
+    store.save(classifiers)
+    return store
+
+
+async def request(method, target, body=None, port=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = b"" if body is None else json.dumps(body).encode()
+    writer.write((f"{method} {target} HTTP/1.1\r\n"
+                  f"Content-Length: {len(data)}\r\n"
+                  "Connection: close\r\n\r\n").encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_invalid_batcher():
+    with pytest.raises(ValueError):
+        MicroBatcher(len, max_batch_size=0)
+
+
+def test_batcher_coalesces_concurrent_requests():
+    batch_sizes = []
+
+    def predict(X):
+        batch_sizes.append(len(X))
+        return X[:, 0] * 2
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait=0.05)
+        batcher.start()
+        results = await asyncio.gather(
+            *(batcher.predict(np.full((1, 2), i, dtype=float))
+              for i in range(20)))
+        stats = batcher.stats()
+        await batcher.close()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert [result.tolist() for result in results] == [[2.0 * i]
+                                                       for i in range(20)]
+    assert batch_sizes == [8, 8, 4]
+    assert stats["requests"] == 20 and stats["batches"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["latency_p99"] >= stats["latency_p50"] > 0
+
+
+def test_batcher_propagates_errors():
+
+    def predict(X):
+        raise RuntimeError("broken model")
+
+    async def run():
+        batcher = MicroBatcher(predict, max_wait=0)
+        batcher.start()
+        try:
+            await batcher.predict(np.zeros((1, 2)))
+        finally:
+            await batcher.close()
+
+    with pytest.raises(RuntimeError, match="broken model"):
+        asyncio.run(run())
+
+
+def test_batcher_isolates_failing_requests():
+    batch_sizes = []
+
+    def predict(X):
+        batch_sizes.append(len(X))
+        if (X < 0).any():
+            raise ValueError("negative feature")
+        return X[:, 0] * 2
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(batcher.predict(np.ones((2, 2))),
+                                        batcher.predict(-np.ones((1, 2))),
+                                        return_exceptions=True), batch_sizes
+        finally:
+            await batcher.close()
+
+    (good, bad), batch_sizes = asyncio.run(run())
+    # the shared batch failed, then every request was predicted alone
+    assert batch_sizes == [3, 2, 1]
+    assert good.tolist() == [2.0, 2.0]
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.parametrize("unix", [False, True])
+def test_load_generator(store, tmp_path, unix):
+    path = str(tmp_path / "server.sock") if unix else None
+    expected = store.predict(RAW_X[:50])
+
+    async def run():
+        server = PredictionServer(store, max_batch_size=32, max_wait=0.01)
+        address = await server.start(port=0, path=path)
+        port = None if unix else address[1]
+        try:
+            results = {}
+            for model in ("knn", "lr"):
+                results[model] = await generate_load(RAW_X[:50],
+                                                     n_requests=200,
+                                                     concurrency=16,
+                                                     port=port,
+                                                     path=path,
+                                                     model=model)
+            return results, server.stats()
+        finally:
+            await server.close()
+
+    results, stats = asyncio.run(run())
+    for model, name in (("knn", "KNNClassifier"),
+                        ("lr", "LogisticRegressionClassifier")):
+        assert results[model]["labels"] == [
+            expected[name][i % 50] for i in range(200)
+        ]
+        assert stats[model]["requests"] == 200
+        # the concurrent requests were coalesced
+        assert stats[model]["batches"] < 200
+        assert stats[model]["mean_batch_size"] > 1
+        assert np.isfinite(stats[model]["latency_p99"])
+
+
+def test_endpoints(store):
+
+    async def run():
+        server = PredictionServer(store, names=["lr"], max_wait=0)
+        _, port = await server.start(port=0)
+        try:
+            return [
+                await request("POST", "/predict", {"rows": RAW_X[:3].tolist()},
+                              port),
+                await request("GET", "/stats", port=port),
+                await request("POST", "/predict/knn", {"rows": [[0] * 8]},
+                              port),
+                await request("POST", "/predict", {"rows": [[0] * 3]}, port),
+                await request("POST", "/predict", {"values": []}, port),
+                await request("POST", "/predict",
+                              {"rows": [[float("nan")] * 8]}, port),
+                await request("GET", "/missing", port=port),
+            ]
+        finally:
+            await server.close()
+
+    (predict, stats, unknown, shape, invalid, non_finite,
+     missing) = asyncio.run(run())
+    assert predict == (200, {
+        "labels":
+        store.predict(RAW_X[:3])["LogisticRegressionClassifier"].tolist()
+    })
+    assert stats[0] == 200 and list(stats[1]) == ["lr"]
+    assert stats[1]["lr"]["requests"] == 1
+    assert [unknown[0], shape[0], invalid[0], non_finite[0],
+            missing[0]] == [404, 400, 400, 400, 404]
@@ -1,11 +1,16 @@
 from simpleclassifier.splitters import (
+    KFoldSplitter,
     PercentageSplitter,
     PercentageShuffleSplitter,
     PercentageStratifiedSplitter,
+    RepeatedKFoldSplitter,
+    RepeatedStratifiedKFoldSplitter,
+    StratifiedKFoldSplitter,
 )
 
 import pytest
 import numpy as np
+from sklearn.model_selection import train_test_split
 
 
 @pytest.fixture
@@ -94,3 +99,77 @@ def test_percentage_stratified_splitter(x_y_data):
     prop_test_1 = np.mean(y_test == 1).item()
     assert pytest.approx(prop_train_1, abs=0.05) == 0.5
     assert pytest.approx(prop_test_1, abs=0.05) == 0.5
+
+
+@pytest.mark.parametrize("splitter_class,n_folds", [
+    (KFoldSplitter, 3),
+    (StratifiedKFoldSplitter, 3),
+    (RepeatedKFoldSplitter, 6),
+    (RepeatedStratifiedKFoldSplitter, 6),
+])
+def test_kfold_splitters(splitter_class, n_folds):
+    options = {"n_repeats": 2} if "Repeated" in splitter_class.__name__ else {}
+    splitter = splitter_class(test_size=0.25, n_splits=3, **options)
+    y = np.repeat([0, 1], [30, 18])
+    folds = splitter.make_folds(y)
+    assert len(folds) == n_folds
+    for i in range(0, n_folds, 3):
+        # every repetition validates each row exactly once
+        validation = np.concatenate([v for _, v in folds[i:i + 3]])
+        np.testing.assert_array_equal(np.sort(validation), np.arange(48))
+    for train, validation in folds:
+        assert len(np.intersect1d(train, validation)) == 0
+        if "Stratified" in splitter_class.__name__:
+            assert np.bincount(y[validation]).tolist() == [10, 6]
+
+
+def test_stratified_kfold_test_split(x_y_data):
+    mock_X, mock_y = x_y_data
+    for splitter in (StratifiedKFoldSplitter(test_size=0.5),
+                     RepeatedStratifiedKFoldSplitter(test_size=0.5)):
+        _, _, y_train, y_test = splitter.split_data(mock_X, mock_y)
+        assert np.bincount(y_train).tolist() == [3, 3]
+        assert np.bincount(y_test).tolist() == [3, 3]
+
+
+def test_kfold_invalid_options():
+    assert PercentageSplitter(test_size=0.3).make_folds(np.zeros(10)) is None
+    with pytest.raises(ValueError):
+        KFoldSplitter(test_size=0.3, n_splits=1)
+    with pytest.raises(ValueError):
+        RepeatedKFoldSplitter(test_size=0.3, n_repeats=0)
+
+
+@pytest.mark.parametrize("splitter_class,shuffle,stratify", [
+    (PercentageSplitter, False, False),
+    (PercentageShuffleSplitter, True, False),
+    (PercentageStratifiedSplitter, True, True),
+    (StratifiedKFoldSplitter, True, True),
+])
+@pytest.mark.parametrize("n_samples", [50, 100, 333])
+@pytest.mark.parametrize("test_size", [0.1, 0.3, 0.25])
+def test_split_matches_train_test_split(splitter_class, shuffle, stratify,
+                                        n_samples, test_size):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_samples, 3))
+    y = rng.integers(3, size=n_samples)
+    splits = splitter_class(test_size=test_size,
+                            random_state=7).split_data(X, y)
+    expected = train_test_split(X,
+                                y,
+                                test_size=test_size,
+                                random_state=7,
+                                shuffle=shuffle,
+                                stratify=y if stratify else None)
+    for split, reference in zip(splits, expected):
+        np.testing.assert_array_equal(split, reference)
+
+
+def test_unshuffled_split_is_a_view(x_y_data):
+    mock_X, mock_y = x_y_data
+    train, test = PercentageSplitter(test_size=0.3).split_indices(12, mock_y)
+    assert (train, test) == (slice(0, 8), slice(8, 12))
+    X_train, X_test, _, _ = PercentageSplitter(test_size=0.3).split_data(
+        mock_X, mock_y)
+    assert np.shares_memory(X_train, mock_X)
+    assert np.shares_memory(X_test, mock_X)
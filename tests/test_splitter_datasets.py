@@ -1,11 +1,24 @@
+from simpleclassifier.cache import DatasetCache
 from simpleclassifier.splitter_datasets import (
+    BlobsDataset,
     BreastCancerDataset,
+    ColumnarDataset,
+    CSVDataset,
+    ImbalancedDataset,
     IrisDataset,
+    MoonsDataset,
+    NPYDataset,
+    SparseHighDimDataset,
     WineDataset,
 )
-from simpleclassifier.splitters import PercentageSplitter
+from simpleclassifier.base import SplitterDataset
+from simpleclassifier.splitters import (PercentageShuffleSplitter,
+                                        PercentageSplitter)
 
+import numpy as np
 import pytest
+from scipy import sparse
+from sklearn.datasets import make_classification
 
 
 @pytest.fixture
@@ -35,3 +48,302 @@ def test_load_wine(splitter):
     assert dataset.X_test.shape == (54, 13)
     assert dataset.y_train.shape == (124, )
     assert dataset.y_test.shape == (54, )
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=60, n_features=4, random_state=0)
+    return X, y
+
+
+def test_load_csv(tmp_path, data, splitter):
+    X, y = data
+    path = tmp_path / "data.csv"
+    labels = np.array(["no", "yes"])[y]
+    with open(path, "w") as file:
+        file.write("a,b,c,d,label\n")
+        for row, label in zip(X, labels):
+            file.write(",".join(map(str, row.tolist())) + f",{label}\n")
+
+    dataset = CSVDataset(splitter=splitter,
+                         path=str(path),
+                         target="label",
+                         chunk_size=7)
+    assert dataset.X_train.shape == (42, 4)
+    np.testing.assert_array_equal(dataset.y_test, labels[42:])
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_test), X[42:])
+
+    projected = CSVDataset(splitter=splitter,
+                           path=str(path),
+                           columns=["b", "d"],
+                           target="label")
+    np.testing.assert_allclose(
+        projected.scaler.inverse_transform(projected.X_train), X[:42, [1, 3]])
+
+    with pytest.raises(ValueError):
+        CSVDataset(splitter=splitter, path=str(path), target="missing")
+
+
+def test_load_csv_without_header(tmp_path, data, splitter):
+    X, y = data
+    path = tmp_path / "data.csv"
+    np.savetxt(path, np.column_stack([y, X]), delimiter=";")
+    dataset = CSVDataset(splitter=splitter,
+                         path=str(path),
+                         target=0,
+                         delimiter=";",
+                         header=False)
+    assert dataset.X_train.shape == (42, 4)
+    assert dataset.y_train.dtype == np.int64
+    np.testing.assert_array_equal(dataset.y_train, y[:42])
+
+
+def test_load_npy(tmp_path, data, splitter):
+    X, y = data
+    np.save(tmp_path / "data.npy", np.column_stack([X, y]))
+    dataset = NPYDataset(splitter=splitter, path=str(tmp_path / "data.npy"))
+    assert dataset.X_train.shape == (42, 4)
+    np.testing.assert_array_equal(dataset.y_test, y[42:])
+
+    np.save(tmp_path / "X.npy", X)
+    np.save(tmp_path / "y.npy", y)
+    dataset = NPYDataset(splitter=splitter,
+                         path=str(tmp_path / "X.npy"),
+                         target_path=str(tmp_path / "y.npy"),
+                         columns=[0, 2])
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_train), X[:42, [0, 2]])
+
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed])
+def test_load_npz(tmp_path, data, splitter, save):
+    X, y = data
+    path = tmp_path / "data.npz"
+    save(path, X=X, y=y)
+    dataset = NPYDataset(splitter=splitter, path=str(path))
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_train), X[:42])
+    np.testing.assert_array_equal(dataset.y_train, y[:42])
+
+
+def test_load_npz_is_memory_mapped(tmp_path, data):
+    X, y = data
+    path = tmp_path / "data.npz"
+    np.savez(path, X=X, y=y)
+    dataset = NPYDataset.__new__(NPYDataset)
+    dataset.path, dataset.target_path, dataset.columns = str(path), None, None
+    X_loaded, y_loaded = dataset.load_data()
+    assert isinstance(X_loaded, np.memmap)
+    np.testing.assert_array_equal(X_loaded, X)
+    np.testing.assert_array_equal(y_loaded, y)
+
+
+def test_load_columnar(tmp_path, data, splitter):
+    X, y = data
+    directory = tmp_path / "columns"
+    directory.mkdir()
+    for name, column in zip("abcd", X.T):
+        np.save(directory / f"{name}.npy", column)
+    np.save(directory / "target.npy", y)
+
+    dataset = ColumnarDataset(splitter=splitter,
+                              path=str(directory),
+                              target="target",
+                              columns=["d", "a"])
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_train), X[:42, [3, 0]])
+    np.testing.assert_array_equal(dataset.y_test, y[42:])
+
+
+def test_load_parquet(tmp_path, data, splitter):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    X, y = data
+    table = pa.table({
+        **{
+            name: X[:, i]
+            for i, name in enumerate("abcd")
+        }, "target": y
+    })
+    pq.write_table(table, tmp_path / "data.parquet")
+    dataset = ColumnarDataset(splitter=splitter,
+                              path=str(tmp_path / "data.parquet"),
+                              target="target",
+                              columns=["b", "c"])
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_train), X[:42, [1, 2]])
+
+
+@pytest.mark.parametrize(
+    "dataset_class",
+    [BlobsDataset, MoonsDataset, SparseHighDimDataset, ImbalancedDataset])
+def test_synthetic_dataset(splitter, dataset_class):
+    options = dict(n_samples=1000, n_features=30, n_classes=2, chunk_size=300)
+    dataset = dataset_class(splitter=splitter, **options)
+    assert dataset.X_train.shape == (700, 30)
+    assert dataset.X_test.shape == (300, 30)
+    assert set(np.unique(dataset.y_train)) == {0, 1}
+
+    # the same seed generates the same data, another seed other data
+    again = dataset_class(splitter=splitter, **options)
+    np.testing.assert_array_equal(_dense(again.X_train),
+                                  _dense(dataset.X_train))
+    np.testing.assert_array_equal(again.y_test, dataset.y_test)
+    other = dataset_class(splitter=splitter, random_state=1, **options)
+    assert not np.array_equal(_dense(other.X_train), _dense(dataset.X_train))
+
+
+def _dense(X):
+    return X.toarray() if sparse.issparse(X) else X
+
+
+def test_synthetic_dataset_class_settings(splitter):
+    dataset = ImbalancedDataset(splitter=splitter,
+                                n_samples=20000,
+                                n_classes=3,
+                                imbalance=9)
+    counts = np.bincount(np.concatenate([dataset.y_train, dataset.y_test]))
+    np.testing.assert_allclose(counts / counts.sum(),
+                               np.array([9, 3, 1]) / 13,
+                               atol=0.01)
+
+    sparse_dataset = SparseHighDimDataset(splitter=splitter,
+                                          n_samples=2000,
+                                          n_features=500,
+                                          n_classes=4,
+                                          density=0.02)
+    X, _ = sparse_dataset.load_data()
+    assert X.nnz / (2000 * 500) == pytest.approx(0.02, rel=0.05)
+    assert set(np.unique(sparse_dataset.y_train)) == {0, 1, 2, 3}
+
+
+def test_synthetic_dataset_invalid_settings(splitter):
+    with pytest.raises(ValueError):
+        BlobsDataset(splitter=splitter, n_classes=1)
+    with pytest.raises(ValueError):
+        BlobsDataset(splitter=splitter, n_samples=2, n_classes=3)
+    with pytest.raises(ValueError):
+        MoonsDataset(splitter=splitter, n_classes=3)
+    with pytest.raises(ValueError):
+        SparseHighDimDataset(splitter=splitter, density=0)
+    with pytest.raises(ValueError):
+        ImbalancedDataset(splitter=splitter, imbalance=0.5)
+
+
+def test_synthetic_dataset_cache_key(splitter, tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    BlobsDataset(splitter=splitter, n_samples=500, cache=cache)
+    BlobsDataset(splitter=splitter, n_samples=500, cache=cache)
+    BlobsDataset(splitter=splitter, n_samples=600, cache=cache)
+    BlobsDataset(splitter=splitter, n_samples=500, cluster_std=2, cache=cache)
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_float32_dataset(tmp_path, data, splitter):
+    X, y = data
+    path = tmp_path / "data.csv"
+    labels = np.array(["no", "yes"])[y]
+    with open(path, "w") as file:
+        file.write("a,b,c,d,label\n")
+        for row, label in zip(X, labels):
+            file.write(",".join(map(str, row.tolist())) + f",{label}\n")
+
+    dataset = CSVDataset(splitter=splitter,
+                         path=str(path),
+                         target="label",
+                         dtype="float32")
+    reference = CSVDataset(splitter=splitter, path=str(path), target="label")
+    assert dataset.X_train.dtype == dataset.X_test.dtype == np.float32
+    assert dataset.y_train.dtype == np.uint8
+    np.testing.assert_allclose(dataset.X_train, reference.X_train, atol=1e-5)
+    np.testing.assert_array_equal(dataset.classes_, ["no", "yes"])
+    np.testing.assert_array_equal(dataset.decode_labels(dataset.y_test),
+                                  labels[42:])
+
+    report = dataset.memory_report()
+    assert report["X_train"]["nbytes"] == 42 * 4 * 4
+    assert report["total"]["saved_bytes"] == (60 * 4 * 4) + (60 * 7)
+    assert reference.memory_report()["total"]["saved_bytes"] <= 0
+
+
+def test_invalid_dtype(splitter):
+    with pytest.raises(ValueError):
+        IrisDataset(splitter=splitter, dtype="int32")
+
+
+def test_dtype_cache_key(splitter, tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    IrisDataset(splitter=splitter, cache=cache)
+    IrisDataset(splitter=splitter, cache=cache, dtype="float32")
+    cached = IrisDataset(splitter=splitter, cache=cache, dtype="float32")
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cached.X_train.dtype == np.float32
+    np.testing.assert_array_equal(cached.classes_, [0, 1, 2])
+
+
+def test_sparse_dataset(splitter, tmp_path):
+    options = dict(n_samples=1000, n_features=200, density=0.02)
+    dataset = SparseHighDimDataset(splitter=splitter, **options)
+    assert sparse.isspmatrix_csr(dataset.X_train)
+    assert sparse.isspmatrix_csr(dataset.X_test)
+    assert dataset.scaler.with_mean is False
+    np.testing.assert_allclose(
+        _dense(dataset.X_train).std(axis=0)[dataset.scaler.var_ > 0], 1)
+    report = dataset.memory_report()
+    assert report["X_train"]["sparse"]
+    assert report["X_train"]["nbytes"] * 10 < report["X_train"][
+        "baseline_nbytes"]
+
+    cache = DatasetCache(str(tmp_path))
+    SparseHighDimDataset(splitter=splitter, cache=cache, **options)
+    cached = SparseHighDimDataset(splitter=splitter, cache=cache, **options)
+    assert sparse.isspmatrix_csr(cached.X_train)
+    np.testing.assert_array_equal(_dense(cached.X_test),
+                                  _dense(dataset.X_test))
+    np.testing.assert_allclose(cached.scaler.scale_, dataset.scaler.scale_)
+
+
+def test_sparse_dataset_scaling(splitter):
+    dataset = SparseHighDimDataset(splitter=splitter,
+                                   n_samples=500,
+                                   n_features=50,
+                                   density=0.1,
+                                   scaling="maxabs")
+    assert sparse.isspmatrix_csr(dataset.X_train)
+    assert abs(dataset.X_train).max() == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        SparseHighDimDataset(splitter=splitter, scaling="standard")
+    with pytest.raises(ValueError):
+        IrisDataset(splitter=splitter, scaling="invalid")
+
+
+def test_contiguous_split_is_scaled_in_place(splitter):
+    X, y = make_classification(n_samples=200, n_features=5, random_state=0)
+    original = X.copy()
+
+    class ArrayDataset(SplitterDataset):
+        def load_data(self):
+            return X, y
+
+    dataset = ArrayDataset(splitter=splitter)
+    assert np.shares_memory(dataset.X_train, X)
+    assert np.shares_memory(dataset.X_test, X)
+    np.testing.assert_allclose(
+        dataset.scaler.inverse_transform(dataset.X_train), original[:140])
+
+    shuffled = ArrayDataset(splitter=PercentageShuffleSplitter(test_size=0.3),
+                            dtype="float32")
+    assert not np.shares_memory(shuffled.X_train, X)
+    assert shuffled.X_train.dtype == np.float32
+
+
+def test_read_only_source_is_not_modified(tmp_path, data, splitter):
+    X, y = data
+    np.save(tmp_path / "X.npy", X)
+    np.save(tmp_path / "y.npy", y)
+    dataset = NPYDataset(splitter=splitter,
+                         path=str(tmp_path / "X.npy"),
+                         target_path=str(tmp_path / "y.npy"))
+    np.testing.assert_array_equal(np.load(tmp_path / "X.npy"), X)
+    assert not isinstance(dataset.X_train, np.memmap)
@@ -0,0 +1,120 @@
+import sys
+
+import pytest
+
+from simpleclassifier.__main__ import main, make_config
+from simpleclassifier.sweep import dataset_key, expand_matrix, run_sweep
+
+SWEEP = """
+classifier_names: [nb, lr]
+profile_metrics: [accuracy]
+matrix:
+  dataset_name: [iris, wine]
+  splitting_strategy: [percentage, percentage_shuffle]
+"""
+
+
+def make_configs(*documents):
+    args = type("Args", (), {
+        "save_models": None,
+        "load_models": None,
+        "predict": None,
+        "output": None
+    })
+    return [
+        make_config(run, args) for data in documents
+        for run in expand_matrix(data)
+    ]
+
+
+def test_expand_matrix():
+    runs = expand_matrix({
+        "classifier_names": ["nb"],
+        "matrix": {
+            "dataset_name": ["iris", "wine"],
+            "test_size": [0.2, 0.3, 0.4]
+        }
+    })
+    assert len(runs) == 6
+    assert runs[1] == {
+        "classifier_names": ["nb"],
+        "dataset_name": "iris",
+        "test_size": 0.3
+    }
+    assert expand_matrix({"dataset_name": "iris"}) == [{
+        "dataset_name": "iris"
+    }]
+    with pytest.raises(ValueError):
+        expand_matrix({"matrix": {"dataset_name": []}})
+
+
+def test_dataset_key():
+    configs = make_configs({"dataset_name": "iris"}, {
+        "dataset_name": "iris",
+        "classifier_names": ["lr"],
+        "profile_metrics": ["f1"]
+    }, {
+        "dataset_name": "iris",
+        "test_size": 0.3
+    })
+    assert dataset_key(configs[0]) == dataset_key(configs[1])
+    assert dataset_key(configs[0]) != dataset_key(configs[2])
+
+
+def test_datasets_loaded_once(monkeypatch, capsys):
+    from simpleclassifier.splitter_datasets import IrisDataset
+    loads = []
+    load_data = IrisDataset.load_data
+    monkeypatch.setattr(IrisDataset, "load_data",
+                        lambda self: loads.append(1) or load_data(self))
+
+    configs = make_configs(
+        {
+            "dataset_name": "iris",
+            "classifier_names": ["nb"],
+            "profile_metrics": ["accuracy"]
+        }, {
+            "dataset_name": "iris",
+            "classifier_names": ["lr"],
+            "profile_metrics": ["fit_time"]
+        }, {
+            "dataset_name": "iris",
+            "classifier_names": ["nb"],
+            "test_size": 0.3
+        })
+    profiler = run_sweep(configs)
+    assert len(loads) == 2
+    assert list(profiler.results) == [
+        "iris/percentage/NaiveBayesClassifier",
+        "iris/percentage/LogisticRegressionClassifier",
+        "iris/percentage/NaiveBayesClassifier#2",
+    ]
+    assert all(
+        list(result) == ["accuracy", "fit_time"]
+        for result in profiler.results.values())
+    assert profiler.classifiers[0].dataset is profiler.classifiers[1].dataset
+
+
+def test_cli_sweep(tmp_path, monkeypatch, capsys):
+    sweep = tmp_path / "sweep.yml"
+    sweep.write_text(SWEEP)
+    other = tmp_path / "other.yml"
+    other.write_text("classifier_names: [nb]\ndataset_name: breast_cancer\n"
+                     "n_workers: 2\n")
+    monkeypatch.setattr(sys, "argv", ["prog", "-y", str(sweep), str(other)])
+    main()
+    out = capsys.readouterr().out
+    results = out.split("Displaying results...")[1]
+    for prefix in ("iris/percentage", "iris/percentage_shuffle",
+                   "wine/percentage", "wine/percentage_shuffle"):
+        for name in ("NaiveBayesClassifier", "LogisticRegressionClassifier"):
+            assert f"- {prefix}/{name}: " in results
+    assert "- breast_cancer/percentage/NaiveBayesClassifier: " in results
+
+    monkeypatch.setattr(
+        sys, "argv",
+        ["prog", "-y",
+         str(sweep), "--save-models",
+         str(tmp_path / "models")])
+    with pytest.raises(SystemExit):
+        main()